@@ -0,0 +1,66 @@
+import time
+import random
+import argparse
+
+# -----------------------------
+# Stylist throughput benchmark
+# -----------------------------
+# Synthetic users (random body type, skin tone and wardrobe drawn from the
+# demo wardrobes) are answered three ways: one engine.recommend() call per
+# user, engine.recommend_batch() over chunks, and POSTs to the
+# /recommend_outfit/batch route through Flask's test client.
+BODY_TYPES = ["hourglass","pear","apple","rectangle","inverted_triangle"]
+SKIN_TONES = ["fair","medium","dark","light"]  # "light" is unseen by the encoders
+
+
+def synthetic_requests(n, seed=0):
+    from stylist import DEMO_USERS
+
+    rng = random.Random(seed)
+    pools = {part: sorted({x for u in DEMO_USERS.values() for x in u["wardrobe"][part]})
+             for part in ("tops", "bottoms", "dresses", "accessories")}
+    items = []
+    for _ in range(n):
+        wardrobe = {part: rng.sample(pool, min(len(pool), rng.randint(2, 6))) for part, pool in pools.items()}
+        user = {"body_type": rng.choice(BODY_TYPES), "skin_tone": rng.choice(SKIN_TONES), "wardrobe": wardrobe}
+        pick = lambda part: rng.choice(wardrobe[part]) if rng.random() < 0.4 else None
+        items.append({"user": user, "top": pick("tops"), "bottom": pick("bottoms"), "dress": pick("dresses")})
+    return items
+
+
+def report(label, n, seconds):
+    print(f"{label:<28} {n:>7} recs {seconds:>8.2f} s {n / seconds:>10.0f} recs/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the stylist engine and its HTTP batch API.")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    import stylist_service as service
+
+    items = synthetic_requests(args.users)
+    parsed = [service.parse_item(item) for item in items]
+
+    t0 = time.perf_counter()
+    for item in parsed:
+        service.engine.recommend(*item)
+    report("engine.recommend (loop)", len(parsed), time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for i in range(0, len(parsed), args.batch_size):
+        service.engine.recommend_batch(parsed[i:i + args.batch_size])
+    report(f"engine.recommend_batch({args.batch_size})", len(parsed), time.perf_counter() - t0)
+
+    client = service.app.test_client()
+    t0 = time.perf_counter()
+    for i in range(0, len(items), args.batch_size):
+        response = client.post("/recommend_outfit/batch", json={"requests": items[i:i + args.batch_size]})
+        if response.status_code != 200:
+            raise SystemExit(f"batch failed: {response.get_json()}")
+    report(f"POST batch ({args.batch_size}/request)", len(items), time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    main()
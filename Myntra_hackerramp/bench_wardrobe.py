@@ -0,0 +1,87 @@
+import os
+import time
+import random
+import argparse
+import tempfile
+
+from wardrobe_store import COLOURS, PARTS, WardrobeStore
+
+# -----------------------------
+# Wardrobe store benchmark
+# -----------------------------
+# Loads --users synthetic users into a fresh SQLite store, then times the
+# availability check recommend_outfit makes (owns colour/type in part)
+# against the substring scan over in-memory lists it replaces.
+TYPES = {
+    "tops": ["top", "blouse", "shirt", "tank top", "crop top", "t-shirt"],
+    "bottoms": ["jeans", "trousers", "skirt", "pencil skirt"],
+    "dresses": ["a-line dress", "bodycon dress", "maxi dress", "shift dress", "wrap dress", "kurta"],
+    "accessories": ["necklace", "bracelet", "earrings", "belt", "scarf", "watch"],
+}
+
+
+def synthetic_wardrobe(rng, items_per_part):
+    return {
+        part: list({f"{rng.choice(COLOURS)} {rng.choice(TYPES[part])}" for _ in range(items_per_part)})
+        for part in PARTS
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load and query the wardrobe store at scale.")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--items-per-part", type=int, default=6)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--db", default=None, help="Database file (default: a temp file)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="wardrobe-bench-"), "wardrobe.db")
+    store = WardrobeStore(path)
+
+    in_memory = {f"user{n}": synthetic_wardrobe(rng, args.items_per_part) for n in range(args.users)}
+    t0 = time.perf_counter()
+    user_ids = list(in_memory)
+    for i in range(0, len(user_ids), 1000):
+        store.import_users({
+            user_id: {"name": user_id, "body_type": "hourglass", "skin_tone": "fair", "wardrobe": in_memory[user_id]}
+            for user_id in user_ids[i:i + 1000]
+        })
+    load_s = time.perf_counter() - t0
+    items = sum(len(v) for w in in_memory.values() for v in w.values())
+    print(f"loaded {args.users} users / {items} items in {load_s:.1f} s "
+          f"({items / load_s:.0f} items/s), db {os.path.getsize(path) / 1e6:.1f} MB")
+
+    queries = [(f"user{rng.randrange(args.users)}", part, rng.choice(COLOURS))
+               for part in ("tops", "bottoms", "dresses") for _ in range(args.queries // 3)]
+
+    timings = []
+    hits = 0
+    for user_id, part, colour in queries:
+        t0 = time.perf_counter()
+        hits += store.owns(user_id, part, colour)
+        timings.append(time.perf_counter() - t0)
+    print(f"indexed owns():  p50 {percentile(timings, 50) * 1e6:.0f} us  p99 {percentile(timings, 99) * 1e6:.0f} us "
+          f"({hits} hits / {len(queries)})")
+
+    timings = []
+    for user_id, part, colour in queries:
+        t0 = time.perf_counter()
+        any(colour in x.lower() for x in in_memory[user_id][part])
+        timings.append(time.perf_counter() - t0)
+    print(f"list scan:       p50 {percentile(timings, 50) * 1e6:.0f} us  p99 {percentile(timings, 99) * 1e6:.0f} us "
+          f"(in-memory, lost on restart)")
+
+    t0 = time.perf_counter()
+    for user_id, _, _ in queries[:1000]:
+        store.get_user(user_id)
+    print(f"get_user:        {(time.perf_counter() - t0) / 1000 * 1e6:.0f} us/user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import ast
+import sys
+import json
+import argparse
+import subprocess
+
+import pandas as pd
+
+# -----------------------------
+# Typed columnar copies of the CSV datasets
+# -----------------------------
+# custom_fashion_dataset.csv stores accessories as stringified Python
+# lists. myntra_products_catalog.csv carries long descriptions that the
+# stylist never reads. convert() writes Parquet next to each CSV, with:
+#   - low-cardinality text as dictionary-encoded (categorical) columns
+#   - accessories as a real list<string> column
+#   - prices and counts as integers
+# The loaders read only the requested columns from a memory-mapped file.
+# They reconvert when the CSV is newer, and fall back to pd.read_csv when
+# pyarrow is not installed.
+HERE = os.path.dirname(os.path.abspath(__file__))
+FASHION_CSV = os.path.join(HERE, "custom_fashion_dataset.csv")
+CATALOG_CSV = os.path.join(HERE, "myntra_products_catalog.csv")
+
+FASHION_CATEGORIES = ["top_color","bottom_color","dress_type","pattern",
+                      "skin_tone","body_type","fabric","occasion"]
+CATALOG_CATEGORIES = ["ProductBrand", "Gender", "PrimaryColor"]
+CATALOG_INTEGERS = {"ProductID": "int64", "Price (INR)": "int32", "NumImages": "int16"}
+
+# What the stylist engine reads from the catalog
+STYLIST_CATALOG_COLUMNS = ["ProductID", "ProductName", "ProductBrand", "Gender", "Price (INR)", "PrimaryColor"]
+
+
+def parquet_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def _have_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# -----------------------------
+# Conversion
+# -----------------------------
+def _typed_fashion(csv_path):
+    df = pd.read_csv(csv_path)
+    df["id"] = df["id"].astype("int32")
+    df["accessories"] = df["accessories"].map(ast.literal_eval)
+    for col in FASHION_CATEGORIES:
+        df[col] = df[col].astype("category")
+    return df
+
+
+def _typed_catalog(csv_path):
+    df = pd.read_csv(csv_path, dtype={col: "category" for col in CATALOG_CATEGORIES})
+    for col, dtype in CATALOG_INTEGERS.items():
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(dtype)
+    return df
+
+
+def _write(df, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, path)
+    return path
+
+
+def convert(fashion_csv=FASHION_CSV, catalog_csv=CATALOG_CSV):
+    return [
+        _write(_typed_fashion(fashion_csv), parquet_path(fashion_csv)),
+        _write(_typed_catalog(catalog_csv), parquet_path(catalog_csv)),
+    ]
+
+
+# -----------------------------
+# Loaders
+# -----------------------------
+def _select(df, columns):
+    return df[list(columns)] if columns else df
+
+
+def _load(csv_path, typed, columns):
+    # Every path returns the same dtypes (categoricals, integers, accessories as lists)
+    if not _have_pyarrow():
+        return _select(typed(csv_path), columns)
+    import pyarrow.parquet as pq
+
+    path = parquet_path(csv_path)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(csv_path):
+        df = typed(csv_path)
+        try:
+            _write(df, path)
+        except OSError as e:
+            print(f"[WARN] Could not write {path}: {e}")
+            return _select(df, columns)
+    return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def load_fashion(columns=None, csv_path=FASHION_CSV):
+    return _load(csv_path, _typed_fashion, columns)
+
+
+def load_catalog(columns=None, csv_path=CATALOG_CSV):
+    return _load(csv_path, _typed_catalog, columns)
+
+
+# -----------------------------
+# Load time and memory vs pd.read_csv
+# -----------------------------
+MEASURE = r"""
+import json, os, sys, time
+import pandas as pd
+import columnar
+try:
+    import pyarrow.parquet  # imported up front so no method pays for it inside the timed region
+except ImportError:
+    pass
+def rss_mb():
+    # ru_maxrss already holds the import peak, so read the current resident size
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:  # no /proc (macOS): fall back to the peak
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 20
+method, columns = sys.argv[1], json.loads(sys.argv[2])
+before = rss_mb()
+t0 = time.perf_counter()
+if method == "read_csv":
+    df = pd.read_csv(columnar.CATALOG_CSV)
+elif method == "read_csv_usecols":
+    df = pd.read_csv(columnar.CATALOG_CSV, usecols=columns)
+else:
+    df = columnar.load_catalog(columns)
+seconds = time.perf_counter() - t0
+print(json.dumps({"seconds": seconds, "rss_mb": rss_mb() - before,
+                  "frame_mb": df.memory_usage(deep=True).sum() / 2 ** 20, "shape": list(df.shape)}))
+"""
+
+
+def compare(columns=STYLIST_CATALOG_COLUMNS, repeats=3):
+    rows = {}
+    for method in ("read_csv", "read_csv_usecols", "parquet"):
+        runs = []
+        for _ in range(repeats):
+            out = subprocess.run([sys.executable, "-c", MEASURE, method, json.dumps(columns)],
+                                 cwd=HERE, capture_output=True, text=True, check=True)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        rows[method] = min(runs, key=lambda r: r["seconds"])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the stylist CSVs to Parquet and compare load cost.")
+    parser.add_argument("command", choices=["convert", "compare"])
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        for path in convert():
+            print(f"wrote {path} ({os.path.getsize(path) / 2 ** 20:.2f} MB)")
+        return
+
+    convert()
+    print(f"{'method':>17} {'load ms':>9} {'RSS +MB':>8} {'frame MB':>9}  shape")
+    for method, r in compare().items():
+        print(f"{method:>17} {r['seconds'] * 1000:>9.1f} {r['rss_mb']:>8.1f} {r['frame_mb']:>9.1f}  {tuple(r['shape'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,24 @@
-import pandas as pd
+import os
+import csv
 import json
+import random
+import argparse
+import textwrap
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+# -----------------------------
+# Synthetic data generator
+# -----------------------------
+# Without arguments this writes the deterministic stylist training set
+# (custom_fashion_dataset.csv/.json) as before. With a kind it streams
+# seeded synthetic products, users or Instagram posts shaped like the
+# Mongo collections the ML services and backend read, in parallel shards:
+#
+#   python data.py products --rows 1000000 --shards 16 --format parquet --out synthetic
+#
+# Shard k always covers the same rows with the same RNG stream, so output
+# depends only on --seed, --rows and --shards, not on --workers.
 
 # -----------------------------
 # Fashion-rule aware mappings
@@ -63,46 +82,278 @@ skin_tones = ["fair","medium","dark"]
 body_types = ["hourglass","pear","apple","rectangle","inverted_triangle"]
 
 # -----------------------------
-# Generate deterministic dataset
+# Deterministic stylist dataset
 # -----------------------------
-dataset = []
-entry_id = 1
-
-for skin in skin_tones:
-    for body in body_types:
-        tops = top_colors_map[skin]
-        dresses = dress_type_map[body]
-        patterns = pattern_map[body]
-        for top in tops:
-            for bottom in bottom_colors_map[top]:
-                for dress in dresses:
-                    for pattern in patterns:
-                        fabric = fabrics_map[dress][0]  # pick first fabric deterministically
-                        accessories = accessories_list[:2]  # first two accessories
-                        occasion = occasions_list[entry_id % len(occasions_list)]
-                        recommended_outfit = f"{top} top with {bottom} bottom, {dress} dress with {pattern} pattern"
-                        entry = {
-                            "id": entry_id,
-                            "top_color": top,
-                            "bottom_color": bottom,
-                            "dress_type": dress,
-                            "pattern": pattern,
-                            "skin_tone": skin,
-                            "body_type": body,
-                            "fabric": fabric,
-                            "accessories": accessories,
-                            "occasion": occasion,
-                            "recommended_outfit": recommended_outfit
-                        }
-                        dataset.append(entry)
-                        entry_id += 1
+def iter_fashion_rows():
+    entry_id = 1
+    for skin in skin_tones:
+        for body in body_types:
+            tops = top_colors_map[skin]
+            dresses = dress_type_map[body]
+            patterns = pattern_map[body]
+            for top in tops:
+                for bottom in bottom_colors_map[top]:
+                    for dress in dresses:
+                        for pattern in patterns:
+                            fabric = fabrics_map[dress][0]  # pick first fabric deterministically
+                            accessories = accessories_list[:2]  # first two accessories
+                            occasion = occasions_list[entry_id % len(occasions_list)]
+                            recommended_outfit = f"{top} top with {bottom} bottom, {dress} dress with {pattern} pattern"
+                            yield {
+                                "id": entry_id,
+                                "top_color": top,
+                                "bottom_color": bottom,
+                                "dress_type": dress,
+                                "pattern": pattern,
+                                "skin_tone": skin,
+                                "body_type": body,
+                                "fabric": fabric,
+                                "accessories": accessories,
+                                "occasion": occasion,
+                                "recommended_outfit": recommended_outfit
+                            }
+                            entry_id += 1
+
+
+def write_fashion_dataset(csv_path="custom_fashion_dataset.csv", json_path="custom_fashion_dataset.json"):
+    count = 0
+    with open(csv_path, "w", newline="") as csv_file, open(json_path, "w") as json_file:
+        writer = None
+        json_file.write("[")
+        for entry in iter_fashion_rows():
+            if writer is None:
+                writer = csv.writer(csv_file, lineterminator="\n")
+                writer.writerow(entry.keys())
+            writer.writerow(entry.values())
+            json_file.write(("," if count else "") + "\n" + textwrap.indent(json.dumps(entry, indent=4), "    "))
+            count += 1
+        json_file.write("\n]")
+    return count
+
 
 # -----------------------------
-# Save dataset
+# Synthetic collections
 # -----------------------------
-df = pd.DataFrame(dataset)
-df.to_csv("custom_fashion_dataset.csv", index=False)
-with open("custom_fashion_dataset.json","w") as f:
-    json.dump(dataset,f,indent=4)
+colours = sorted({c for cs in top_colors_map.values() for c in cs} | {c for cs in bottom_colors_map.values() for c in cs})
+brands = ["Roadster", "HERE&NOW", "Mango", "H&M", "W", "Biba", "Libas", "ONLY", "Vero Moda", "Sassafras"]
+garments = {
+    "Dresses": [d.lower() + " dress" for d in fabrics_map],
+    "Tops": ["top", "crop top", "tank top", "blouse", "shirt", "t-shirt"],
+    "Bottoms": ["jeans", "trousers", "skirt", "palazzos", "shorts"],
+    "Ethnic Wear": ["kurta", "kurta set", "tunic", "saree", "lehenga"],
+    "Accessories": ["handbag", "sling bag", "earrings", "necklace", "sunglasses", "belt"],
+    "Footwear": ["heels", "flats", "sneakers", "sandals"],
+}
+fabrics = sorted({f for fs in fabrics_map.values() for f in fs} | {"rayon", "denim", "georgette"})
+patterns = sorted({p for ps in pattern_map.values() for p in ps})
+sizes = ["XS", "S", "M", "L", "XL", "XXL"]
+first_names = ["Aanya", "Diya", "Isha", "Kavya", "Meera", "Nisha", "Riya", "Sara", "Tara", "Zoya",
+               "Arjun", "Kabir", "Rohan", "Vivaan", "Aditya"]
+cities = [("Mumbai", "Maharashtra"), ("Delhi", "Delhi"), ("Bengaluru", "Karnataka"),
+          ("Chennai", "Tamil Nadu"), ("Kolkata", "West Bengal"), ("Pune", "Maharashtra")]
+hashtags = ["#ootd", "#fashionista", "#style", "#outfit", "#festivewear", "#streetstyle", "#makeup", "#jewellery"]
+caption_terms = ["dress", "makeup", "jewellery", "shoes", "bag", "fashionista", "outfit", "style"]
+epoch = datetime(2024, 1, 1)
+
+
+def _rupees(value):
+    return f"₹{value:,}"
+
+
+def make_product(rng, n):
+    category = rng.choice(list(garments))
+    garment = rng.choice(garments[category])
+    colour, fabric, pattern, brand = rng.choice(colours), rng.choice(fabrics), rng.choice(patterns), rng.choice(brands)
+    mrp = rng.randrange(399, 9999, 10)
+    discount = rng.choice([0, 10, 20, 30, 40, 50, 60, 70])
+    price = int(mrp * (100 - discount) / 100)
+    title = f"{brand} Women {colour.title()} {pattern.title()} {fabric.title()} {garment.title()}"
+    created = epoch + timedelta(minutes=rng.randrange(0, 60 * 24 * 600))
+    product_sizes = sizes[rng.randrange(0, 3):rng.randrange(3, len(sizes) + 1)]
+    return {
+        "product_id": n,
+        "title": title,
+        "product_description": (
+            f"{colour.capitalize()} {pattern} {garment} made of {fabric}. "
+            f"{rng.choice(['Regular', 'Relaxed', 'Slim', 'Flared'])} fit, "
+            f"ideal for {rng.choice(occasions_list)} wear. Style it with {rng.choice(accessories_list)}."
+        ),
+        "rating": round(rng.uniform(2.5, 5.0), 1),
+        "ratings_count": rng.randrange(0, 20000),
+        "initial_price": _rupees(mrp),
+        "final_price": _rupees(price),
+        "currency": "INR",
+        "discount": discount,
+        "images": [f"https://assets.example.com/products/{n}/{i}.jpg" for i in range(rng.randint(1, 4))],
+        "delivery_options": ["standard"] + (["express"] if rng.random() < 0.3 else []),
+        "breadcrumbs": ["Women", category, garment.title()],
+        "product_specifications": [{"key": "Fabric", "value": fabric}, {"key": "Pattern", "value": pattern}],
+        "seller_name": f"{brand} Retail",
+        "sizes": product_sizes,
+        "variations": [{"size": s, "color": colour, "price": price, "stock": rng.randrange(0, 50)}
+                       for s in product_sizes],
+        "url": f"https://www.myntra.com/{garment.replace(' ', '-')}/{brand.lower().replace(' ', '-')}/{n}/buy",
+        "isActive": rng.random() > 0.02,
+        "views": rng.randrange(0, 100000),
+        "createdAt": created,
+        "updatedAt": created + timedelta(days=rng.randrange(0, 60)),
+    }
+
+
+def make_user(rng, n):
+    name = rng.choice(first_names)
+    city, state = rng.choice(cities)
+    phone = f"{rng.randint(6, 9)}{rng.randrange(10 ** 8, 10 ** 9)}"
+    created = epoch + timedelta(minutes=rng.randrange(0, 60 * 24 * 600))
+    return {
+        "name": f"{name} {n}",
+        "email": f"{name.lower()}.{n}@example.com",
+        # Placeholder: synthetic users are for load tests, not for logging in
+        "password": "synthetic-user-no-login",
+        "phone": phone,
+        "gender": rng.choice(["Female", "Female", "Female", "Male", "Other"]),
+        "dateOfBirth": datetime(rng.randint(1970, 2006), rng.randint(1, 12), rng.randint(1, 28)),
+        "addresses": [{"name": name, "phone": phone, "pincode": str(rng.randrange(110001, 855999)),
+                       "address": f"{rng.randint(1, 999)} Synthetic Street", "city": city, "state": state,
+                       "isDefault": True}],
+        "role": "user",
+        "isEmailVerified": rng.random() < 0.7,
+        # Stylist profile, as used by the wardrobe store
+        "body_type": rng.choice(body_types),
+        "skin_tone": rng.choice(skin_tones),
+        "createdAt": created,
+        "updatedAt": created,
+    }
+
+
+def make_instagram_post(rng, n):
+    user = f"{rng.choice(first_names).lower()}_{rng.choice(['styles', 'closet', 'looks', 'diaries'])}{n % 5000}"
+    caption = (f"Loving this {rng.choice(colours)} {rng.choice(caption_terms)} for {rng.choice(occasions_list)} "
+               f"{' '.join(rng.sample(hashtags, 3))}")
+    return {
+        "username": user,
+        "caption": caption,
+        "post_url": f"https://www.instagram.com/p/syn{n:010d}/",
+        "likes": int(rng.paretovariate(1.2) * 100),
+        "comments": rng.randrange(0, 2000),
+        "images": [f"https://assets.example.com/insta/{n}.jpg"],
+        "posted_at": epoch + timedelta(minutes=rng.randrange(0, 60 * 24 * 600)),
+    }
+
+
+makers = {"products": make_product, "users": make_user, "instagram_posts": make_instagram_post}
+
+
+# -----------------------------
+# Incremental writers
+# -----------------------------
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_plain, ensure_ascii=False)
+    return value
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = None
+
+    def write(self, rows):
+        for row in rows:
+            if self.writer is None:
+                self.writer = csv.DictWriter(self.file, fieldnames=list(row), lineterminator="\n")
+                self.writer.writeheader()
+            # Nested fields become JSON text; load_mongo.py decodes them again
+            self.writer.writerow({k: _plain(v) for k, v in row.items()})
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row, default=_plain, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+
+        self.pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, rows):
+        import pyarrow as pa
+
+        table = pa.Table.from_pylist(rows)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema, compression="zstd")
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+writers = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def write_shard(kind, shard, start, count, seed, fmt, out_dir, batch_size=10000):
+    """Generate rows [start, start + count) of kind into one shard file."""
+    rng = random.Random(f"{seed}-{kind}-{shard}")
+    make = makers[kind]
+    path = os.path.join(out_dir, kind, f"part-{shard:05d}.{fmt}")
+    writer = writers[fmt](path)
+    try:
+        for offset in range(0, count, batch_size):
+            writer.write([make(rng, start + i) for i in range(offset, min(count, offset + batch_size))])
+    finally:
+        writer.close()
+    return path, count
+
+
+def generate(kind, rows, shards=1, seed=42, fmt="jsonl", out_dir="synthetic", workers=None):
+    os.makedirs(os.path.join(out_dir, kind), exist_ok=True)
+    per_shard = -(-rows // shards)
+    jobs = [(kind, s, s * per_shard, min(per_shard, rows - s * per_shard), seed, fmt, out_dir)
+            for s in range(shards) if s * per_shard < rows]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [f.result() for f in [pool.submit(write_shard, *job) for job in jobs]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the stylist dataset or synthetic collections.")
+    parser.add_argument("kind", nargs="?", choices=["fashion"] + list(makers), default="fashion")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=list(writers), default="jsonl")
+    parser.add_argument("--out", default="synthetic")
+    args = parser.parse_args(argv)
+
+    if args.kind == "fashion":
+        count = write_fashion_dataset()
+        print(f"Custom deterministic fashion dataset created with {count} entries!")
+        return
+
+    started = datetime.now()
+    files = generate(args.kind, args.rows, args.shards, args.seed, args.format, args.out, args.workers)
+    seconds = (datetime.now() - started).total_seconds()
+    total = sum(count for _, count in files)
+    print(f"{total} {args.kind} in {len(files)} {args.format} shards under "
+          f"{os.path.join(args.out, args.kind)} ({seconds:.1f} s, {total / max(seconds, 1e-9):.0f} rows/s)")
+
 
-print(f"Custom deterministic fashion dataset created with {len(dataset)} entries!")
+if __name__ == "__main__":
+    main()
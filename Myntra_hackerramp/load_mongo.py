@@ -0,0 +1,143 @@
+import os
+import csv
+import json
+import glob
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import MongoClient
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+# -----------------------------
+# Bulk loader for synthetic collections
+# -----------------------------
+# Loads the shard files written by data.py into a local mongod, one thread
+# per shard, in unordered insert_many batches:
+#
+#   python load_mongo.py synthetic/products --collection products --drop
+#
+# Unique indexes are created before the load so a rerun without --drop
+# skips documents that are already there. The other secondary indexes are
+# built after the load, which is much faster than maintaining them during
+# the inserts.
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+DB_NAME = os.getenv("MONGO_DB", "myntra-clone")
+
+DATE_FIELDS = {"createdAt", "updatedAt", "dateOfBirth", "lastLogin", "posted_at"}
+INT_FIELDS = {"product_id", "ratings_count", "discount", "views", "likes", "comments"}
+FLOAT_FIELDS = {"rating"}
+BOOL_FIELDS = {"isActive", "isEmailVerified"}
+INDEXES = {
+    "products": [("product_id", True), ("title", False)],
+    "users": [("email", True)],
+    "instagram_posts": [("post_url", True), ("likes", False)],
+}
+
+
+def _restore(doc):
+    for key, value in doc.items():
+        if key in DATE_FIELDS and isinstance(value, str) and value:
+            doc[key] = datetime.fromisoformat(value)
+    return doc
+
+
+def _decode_csv_row(row):
+    # data.py writes nested fields as JSON text; everything else is plain text
+    doc = {}
+    for key, value in row.items():
+        if value == "":
+            value = None
+        elif key in INT_FIELDS:
+            value = int(value)
+        elif key in FLOAT_FIELDS:
+            value = float(value)
+        elif key in BOOL_FIELDS:
+            value = value == "True"
+        elif value[0] in "[{":
+            value = json.loads(value)
+        doc[key] = value
+    return doc
+
+
+def iter_batches(path, batch_size):
+    ext = os.path.splitext(path)[1]
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pylist()  # timestamps come back as datetimes
+        return
+
+    batch = []
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = (json.loads(line) for line in f) if ext == ".jsonl" else (
+            _decode_csv_row(row) for row in csv.DictReader(f)
+        )
+        for row in rows:
+            batch.append(_restore(row))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def load_file(collection, path, batch_size):
+    inserted = 0
+    for batch in iter_batches(path, batch_size):
+        try:
+            inserted += len(collection.insert_many(batch, ordered=False, bypass_document_validation=True).inserted_ids)
+        except BulkWriteError as e:
+            # Duplicates (on the unique indexes) from a previous partial load are skipped, not fatal
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+            inserted += e.details.get("nInserted", 0)
+    return inserted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load data.py shards into MongoDB.")
+    parser.add_argument("directory", help="Shard directory, e.g. synthetic/products")
+    parser.add_argument("--collection", default=None, help="Defaults to the directory name")
+    parser.add_argument("--drop", action="store_true", help="Drop the collection first")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    name = args.collection or os.path.basename(os.path.normpath(args.directory))
+    files = sorted(glob.glob(os.path.join(args.directory, "part-*")))
+    if not files:
+        raise SystemExit(f"No part-* files in {args.directory}")
+
+    client = MongoClient(MONGO_URI)
+    collection = client[DB_NAME][name]
+    if args.drop:
+        collection.drop()
+
+    indexes = INDEXES.get(name, [])
+    for field, unique in indexes:
+        if unique:
+            try:
+                collection.create_index(field, unique=True)
+            except DuplicateKeyError:
+                raise SystemExit(f"{DB_NAME}.{name} already has duplicate {field} values; reload it with --drop")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        inserted = sum(pool.map(lambda path: load_file(collection, path, args.batch_size), files))
+    load_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for field, unique in indexes:
+        if not unique:
+            collection.create_index(field)
+    index_s = time.perf_counter() - started
+
+    print(f"{inserted} documents into {DB_NAME}.{name} from {len(files)} files in {load_s:.1f} s "
+          f"({inserted / max(load_s, 1e-9):.0f} docs/s), indexes {index_s:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import os
+import glob
+import hashlib
+
+import joblib
+import sklearn
+from sklearn.preprocessing import LabelEncoder
+from sklearn.ensemble import RandomForestClassifier
+
+from columnar import load_fashion
+
+# -----------------------------
+# Stylist model artifacts
+# -----------------------------
+# The fitted models and label encoders are saved under MODEL_DIR with a
+# fingerprint of the training CSV. They are retrained only when the data,
+# the training setup or the sklearn version changes.
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.getenv("STYLIST_MODEL_DIR", os.path.join(HERE, "models"))
+DATASET_PATH = os.path.join(HERE, "custom_fashion_dataset.csv")
+
+categorical_cols = ["top_color","bottom_color","dress_type","pattern",
+                    "skin_tone","body_type","fabric","occasion"]
+feature_cols = ["top_color_enc","body_type_enc","skin_tone_enc"]
+
+# model name -> target column
+targets = {
+    "bottom": "bottom_color",
+    "dress": "dress_type",
+    "pattern": "pattern",
+    "fabric": "fabric",
+    "occasion": "occasion",
+    "top": "top_color",
+}
+
+# Bump when the training code changes so old artifacts are not reused
+TRAINING_VERSION = 3
+N_ESTIMATORS = 100
+
+
+def fingerprint(csv_path=DATASET_PATH):
+    h = hashlib.sha256()
+    h.update(f"v{TRAINING_VERSION}|sklearn {sklearn.__version__}|trees {N_ESTIMATORS}|".encode())
+    with open(csv_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class StylistModels:
+    def __init__(self, label_encoders, models, fingerprint):
+        self.label_encoders = label_encoders
+        self.models = models
+        self.fingerprint = fingerprint
+
+
+def load_dataset(csv_path=DATASET_PATH):
+    """The training columns, from the typed Parquet copy when pyarrow is available."""
+    return load_fashion(categorical_cols, csv_path)
+
+
+def train(fashion_df, fp=None):
+    fashion_df = fashion_df.copy()
+    label_encoders = {}
+    for col in categorical_cols:
+        le = LabelEncoder()
+        fashion_df[col+"_enc"] = le.fit_transform(fashion_df[col].astype(str))
+        label_encoders[col] = le
+
+    X = fashion_df[feature_cols]
+    models = {
+        name: RandomForestClassifier(n_estimators=N_ESTIMATORS, random_state=42).fit(X, fashion_df[col+"_enc"])
+        for name, col in targets.items()
+    }
+    return StylistModels(label_encoders, models, fp)
+
+
+def artifact_path(fp, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, f"stylist-{fp[:16]}.joblib")
+
+
+def save(stylist_models, model_dir=MODEL_DIR):
+    os.makedirs(model_dir, exist_ok=True)
+    path = artifact_path(stylist_models.fingerprint, model_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    joblib.dump({
+        "fingerprint": stylist_models.fingerprint,
+        "label_encoders": stylist_models.label_encoders,
+        "models": stylist_models.models,
+    }, tmp)
+    os.replace(tmp, path)
+
+    # Artifacts for older versions of the data are never read again
+    for old in glob.glob(os.path.join(model_dir, "stylist-*.joblib")):
+        if old != path:
+            os.remove(old)
+    return path
+
+
+def load(fp, model_dir=MODEL_DIR):
+    path = artifact_path(fp, model_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        data = joblib.load(path)
+    except Exception as e:
+        print(f"[WARN] Could not load stylist models from {path}: {e}")
+        return None
+    if data.get("fingerprint") != fp:
+        return None
+    return StylistModels(data["label_encoders"], data["models"], fp)
+
+
+def load_or_train(csv_path=DATASET_PATH, model_dir=MODEL_DIR, fp=None):
+    fp = fp or fingerprint(csv_path)
+    stylist_models = load(fp, model_dir)
+    if stylist_models is not None:
+        return stylist_models
+
+    print(f"[INFO] Training stylist models for {os.path.basename(csv_path)} ({fp[:16]})")
+    stylist_models = train(load_dataset(csv_path), fp)
+    try:
+        save(stylist_models, model_dir)
+    except OSError as e:
+        # A read-only checkout still works, it just retrains per process
+        print(f"[WARN] Could not save stylist models to {model_dir}: {e}")
+    return stylist_models
@@ -0,0 +1,80 @@
+import numpy as np
+
+from model_store import targets
+
+# -----------------------------
+# Lookup-table stylist predictor
+# -----------------------------
+# The features (top colour, body type, skin tone) are label-encoded
+# categoricals, with -1 for "unknown", so the whole input space is small.
+# Every model is evaluated once over that grid and the predictions are
+# kept as a dense int array of shape (tops + 1, bodies + 1, skins + 1, outputs),
+# offset by one so that -1 lands in row 0. A prediction is then an array
+# index. encode() only returns codes inside the grid, so any other code is
+# a caller error.
+outputs = list(targets)
+
+
+class StylistPredictor:
+    def __init__(self, stylist_models):
+        self.label_encoders = stylist_models.label_encoders
+        self.codes = {
+            col: {label: i for i, label in enumerate(le.classes_)}
+            for col, le in self.label_encoders.items()
+        }
+        self.labels = [self.label_encoders[targets[name]].classes_ for name in outputs]
+
+        self.shape = tuple(len(self.label_encoders[col].classes_) + 1
+                           for col in ("top_color", "body_type", "skin_tone"))
+        grid = np.stack(np.meshgrid(*[np.arange(-1, n - 1) for n in self.shape], indexing="ij"), axis=-1)
+        grid = grid.reshape(-1, 3)
+        table = np.column_stack([stylist_models.models[name].predict(grid) for name in outputs])
+        self.table = table.reshape(self.shape + (len(outputs),)).astype(np.int32)
+
+    def encode(self, col, value):
+        """Label code for value, or -1 when the encoder has never seen it."""
+        return self.codes[col].get(value, -1) if value is not None else -1
+
+    def predict_codes(self, features):
+        """Encoded predictions for an (n, 3) array of feature codes, shape (n, outputs)."""
+        features = np.asarray(features, dtype=np.int64).reshape(-1, 3)
+        idx = features + 1
+        inside = ((idx >= 0) & (idx < np.array(self.shape))).all(axis=1)
+        if not inside.all():
+            raise ValueError(f"Feature codes outside the lookup table: {features[~inside][:3].tolist()}")
+        return self.table[idx[:, 0], idx[:, 1], idx[:, 2]]
+
+    def predict(self, top_enc, body_enc, skin_enc):
+        """Labels for every output for one feature triple, e.g. {"bottom": "white", ...}."""
+        row = self.predict_codes([[top_enc, body_enc, skin_enc]])[0]
+        return {name: self.labels[i][row[i]] for i, name in enumerate(outputs)}
+
+    def predict_labels(self, features):
+        """Label arrays per output for an (n, 3) array of feature codes."""
+        codes = self.predict_codes(features)
+        return {name: self.labels[i][codes[:, i]] for i, name in enumerate(outputs)}
+
+
+if __name__ == "__main__":
+    # Parity with the per-model predict calls, and per-recommendation cost
+    import time
+    from model_store import load_or_train
+
+    stylist_models = load_or_train()
+    predictor = StylistPredictor(stylist_models)
+    grid = np.stack(np.meshgrid(*[np.arange(-1, n - 1) for n in predictor.shape], indexing="ij"), axis=-1).reshape(-1, 3)
+
+    mismatches = 0
+    t0 = time.perf_counter()
+    for row in grid:
+        for i, name in enumerate(outputs):
+            mismatches += int(stylist_models.models[name].predict([row])[0] != predictor.table[tuple(row + 1)][i])
+    per_model = (time.perf_counter() - t0) / len(grid)
+
+    t0 = time.perf_counter()
+    for row in grid:
+        predictor.predict(*row)
+    lookup = (time.perf_counter() - t0) / len(grid)
+
+    print(f"{len(grid)} feature combinations, {mismatches} mismatches")
+    print(f"per-model predict: {per_model * 1000:.2f} ms/recommendation, lookup: {lookup * 1e6:.1f} us/recommendation")
@@ -0,0 +1,96 @@
+import re
+
+import numpy as np
+
+# -----------------------------
+# Token inverted index over the product catalog
+# -----------------------------
+# Text in the indexed columns is lowercased and split on anything that is
+# not a letter or digit. Each token maps to a sorted array of row
+# positions. A keyword ("light yellow", "a-line") matches rows containing
+# all of its tokens. A search ranks rows by how many keywords they
+# match, then by catalog order.
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+EMPTY = np.empty(0, dtype=np.int32)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+class ProductIndex:
+    def __init__(self, df, columns):
+        self.columns = [col for col in columns if col in df.columns]
+        self.size = len(df)
+        postings = {}
+        for col in self.columns:
+            for row, text in enumerate(df[col].astype(object).fillna("").to_numpy()):
+                for token in set(tokenize(text)):
+                    postings.setdefault(token, []).append(row)
+        # Rows are visited in order per column; merging columns needs a sort
+        self.postings = {token: np.unique(np.asarray(rows, dtype=np.int32)) for token, rows in postings.items()}
+
+    def lookup(self, keyword):
+        """Rows containing every token of keyword."""
+        tokens = tokenize(keyword)
+        if not tokens:
+            return EMPTY
+        lists = sorted((self.postings.get(t, EMPTY) for t in set(tokens)), key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def search(self, keywords, limit=None, match="any"):
+        """Row positions matching any (or all) keywords, most keywords matched first."""
+        keywords = [k for k in dict.fromkeys(keywords) if k]
+        if not keywords:
+            return EMPTY
+        hits = [self.lookup(k) for k in keywords]
+        if match == "all":
+            rows = hits[0]
+            for other in hits[1:]:
+                rows = np.intersect1d(rows, other, assume_unique=True)
+            return rows[:limit]
+
+        rows, counts = np.unique(np.concatenate(hits), return_counts=True)
+        if len(keywords) > 1:
+            # Stable sort keeps catalog order within the same match count
+            rows = rows[np.argsort(-counts, kind="stable")]
+        return rows[:limit]
+
+
+if __name__ == "__main__":
+    # Index build time and lookup latency against the str.contains scan
+    import sys
+    import time
+    import pandas as pd
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "myntra_products_catalog.csv"
+    df = pd.read_csv(path)
+    columns = ["ProductName", "ProductBrand", "Category"]
+    keywords = [["white", "a-line"], ["light yellow", "denim", "maxi"], ["navy", "bodycon"], ["any top", "black", "sheath"]]
+
+    t0 = time.perf_counter()
+    index = ProductIndex(df, columns)
+    print(f"{len(df)} products, {len(index.postings)} tokens, built in {time.perf_counter() - t0:.2f} s")
+
+    lowered = {col: df[col].astype(str).str.lower() for col in index.columns}
+    t0 = time.perf_counter()
+    for ks in keywords:
+        mask = pd.Series(False, index=df.index)
+        for k in ks:
+            for col in index.columns:
+                mask |= lowered[col].str.contains(k, na=False, regex=False)
+        df[mask].head(5)
+    scan = (time.perf_counter() - t0) / len(keywords)
+
+    rounds = 200
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for ks in keywords:
+            df.iloc[index.search(ks, limit=5)]
+    lookup = (time.perf_counter() - t0) / (rounds * len(keywords))
+    print(f"str.contains scan: {scan * 1000:.2f} ms/query, index: {lookup * 1000:.3f} ms/query (incl. iloc)")
@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+
+from product_index import ProductIndex
+from wardrobe_store import normalise, terms
+
+# -----------------------------
+# Stylist engine
+# -----------------------------
+# The outfit logic behind the Streamlit demo, free of any UI, so the app
+# and the HTTP service share it. A StylistEngine holds the lookup-table
+# predictor and the product catalog. recommend() answers one request;
+# recommend_batch() encodes and predicts many requests as arrays. Missing
+# items are matched against a token index over the whole catalog.
+PRODUCT_COLUMNS = ["ProductName","ProductBrand","PrimaryColor","Price (INR)","ProductLink"]
+MATCH_COLUMNS = ["ProductName", "ProductBrand", "Category"]
+MAX_PRODUCTS = 5
+
+# -----------------------------
+# Multiple female users
+# -----------------------------
+DEMO_USERS = {
+    "alice": {
+        "name": "Alice", "body_type": "hourglass", "skin_tone": "fair",
+        "wardrobe": {
+            "tops":["red top","mint top","white blouse","blue tank top","pink crop top"],
+            "bottoms":["white skirt","denim jeans","black trousers","red pencil skirt"],
+            "dresses":["floral maxi dress","a-line red dress","wrap dress","shift dress","bodycon dress",
+                      "off-shoulder dress","shirt dress","sundress","evening gown"],
+            "accessories":["necklace","bracelet","earrings","scarf","belt"]
+        }
+    },
+    "sophia": {
+        "name": "Sophia", "body_type": "pear", "skin_tone": "medium",
+        "wardrobe": {
+            "tops":["blue top","white linen shirt","yellow blouse","green tank top","striped shirt"],
+            "bottoms":["black trousers","denim jeans","floral skirt","beige skirt"],
+            "dresses":["bodycon dress","kurta","tunic","maxi dress","fit-and-flare dress",
+                      "sheath dress","a-line dress","evening gown"],
+            "accessories":["hat","sunglasses","belt","bracelet","necklace"]
+        }
+    },
+    "emma": {
+        "name": "Emma", "body_type": "apple", "skin_tone": "light",
+        "wardrobe": {
+            "tops":["purple blouse","white t-shirt","black crop top","red shirt","blue tank top"],
+            "bottoms":["black jeans","denim skirt","white trousers","red skirt"],
+            "dresses":["bodycon dress","shift dress","wrap dress","maxi dress","evening gown"],
+            "accessories":["bracelet","necklace","watch","earrings"]
+        }
+    }
+}
+
+
+# -----------------------------
+# Helper to add products
+# -----------------------------
+def wardrobe_part(product_name):
+    product_name = product_name.lower()
+    if "dress" in product_name or "kurta" in product_name or "tunic" in product_name:
+        return "dresses"
+    elif "shirt" in product_name or "top" in product_name:
+        return "tops"
+    elif "jeans" in product_name or "trouser" in product_name or "skirt" in product_name:
+        return "bottoms"
+    return "accessories"
+
+
+def add_to_wardrobe(user, product_name, store=None):
+    """Add to the user's in-memory wardrobe lists, or to their items in store."""
+    product_name = product_name.lower()
+    part = wardrobe_part(product_name)
+    if store is not None:
+        store.add_item(user["user_id"], part, product_name)
+    elif product_name not in user["wardrobe"][part]:
+        user["wardrobe"][part].append(product_name)
+
+
+class StylistEngine:
+    def __init__(self, predictor, myntra_df, wardrobe=None):
+        self.predictor = predictor
+        self.wardrobe = wardrobe
+        self.myntra_df = myntra_df.copy()
+        if "ProductLink" not in self.myntra_df.columns:
+            self.myntra_df["ProductLink"] = self.myntra_df["ProductName"].apply(
+                lambda x: f"https://www.myntra.com/{x.replace(' ', '-')}"
+            )
+        self.index = ProductIndex(self.myntra_df, MATCH_COLUMNS)
+
+    # -----------------------------
+    # Recommend outfit
+    # -----------------------------
+    def recommend(self, user, selected_top=None, selected_bottom=None, selected_dress=None):
+        return self.recommend_batch([(user, selected_top, selected_bottom, selected_dress)])[0]
+
+    def recommend_batch(self, requests):
+        """requests: (user, selected_top, selected_bottom, selected_dress) tuples.
+
+        Returns one (outfit, available, missing, top_products) tuple per request.
+        """
+        if not requests:
+            return []
+        encode = self.predictor.encode
+        features = np.empty((len(requests), 3), dtype=np.int64)
+        for i, (user, selected_top, _, _) in enumerate(requests):
+            top_enc = encode("top_color", selected_top)
+            body_enc = encode("body_type", user["body_type"])
+            skin_enc = encode("skin_tone", user["skin_tone"])
+            if body_enc == -1 or skin_enc == -1:
+                body_enc = skin_enc = -1
+            features[i] = (top_enc if top_enc != -1 else 0, body_enc, skin_enc)
+
+        predicted = self.predictor.predict_labels(features)
+        # Top is predicted without a top colour (used when only a bottom is picked)
+        top_features = features.copy()
+        top_features[:, 0] = -1
+        predicted_top = self.predictor.predict_labels(top_features)["top"]
+
+        rows = []
+        for i, (user, selected_top, selected_bottom, selected_dress) in enumerate(requests):
+            if not selected_top and selected_bottom:
+                top = predicted_top[i]
+            else:
+                top = selected_top if selected_top else "any top"
+            bottom = selected_bottom if selected_bottom else predicted["bottom"][i]
+            dress = selected_dress if selected_dress else predicted["dress"][i]
+            rows.append((user, top, bottom, dress,
+                         predicted["pattern"][i], predicted["fabric"][i], predicted["occasion"][i]))
+
+        results = []
+        for user, top, bottom, dress, pattern, fabric, occasion in rows:
+            available, missing = self._wardrobe_check(user, top, bottom, dress)
+            top_products = self._match_products(missing)
+            outfit = f"Top: {top}, Bottom: {bottom}, Dress: {dress}, Pattern: {pattern}, Fabric: {fabric}, Occasion: {occasion}, Accessories: {', '.join(available['accessories'])}"
+            results.append((outfit, available, missing, top_products))
+        return results
+
+    # -----------------------------
+    # Wardrobe check
+    # -----------------------------
+    # Users either carry their wardrobe ("wardrobe" lists, as in the demo)
+    # or are profiles whose items live in the WardrobeStore ("user_id" only).
+    # Both match whole words the same way, via wardrobe_store.terms().
+    def _owns(self, user, part, item):
+        if "wardrobe" in user:
+            phrase = normalise(item)
+            return any(phrase in terms(normalise(x)) for x in user["wardrobe"][part])
+        return self.wardrobe.owns(user["user_id"], part, item)
+
+    def _accessories(self, user, limit):
+        if "wardrobe" in user:
+            return user["wardrobe"]["accessories"][:limit]
+        return self.wardrobe.items(user["user_id"], "accessories", limit)
+
+    def _wardrobe_check(self, user, top, bottom, dress):
+        available = {"tops": [], "bottoms": [], "dresses": [], "accessories": []}
+        missing = []
+
+        if top != "any top" and self._owns(user, "tops", top):
+            available["tops"].append(top)
+        else:
+            missing.append(top)
+        if bottom and self._owns(user, "bottoms", bottom):
+            available["bottoms"].append(bottom)
+        else:
+            missing.append(bottom)
+        if dress and self._owns(user, "dresses", dress):
+            available["dresses"].append(dress)
+        else:
+            missing.append(dress)
+
+        available["accessories"] = self._accessories(user, 3)
+        return available, missing
+
+    # -----------------------------
+    # Myntra suggestions with proper matching
+    # -----------------------------
+    def _match_products(self, missing):
+        rows = self.index.search([k.lower() for k in missing], limit=MAX_PRODUCTS)
+        return self.myntra_df.iloc[rows][PRODUCT_COLUMNS]
+
+
+def records(top_products):
+    """JSON-safe product dicts (NaN becomes None)."""
+    return top_products.astype(object).where(pd.notnull(top_products), None).to_dict(orient="records")
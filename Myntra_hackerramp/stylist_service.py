@@ -0,0 +1,143 @@
+import os
+
+from flask import Flask, request, jsonify
+
+from columnar import STYLIST_CATALOG_COLUMNS, load_catalog
+from model_store import HERE, load_or_train
+from predictor import StylistPredictor
+from stylist import DEMO_USERS, StylistEngine, records, wardrobe_part
+from wardrobe_store import WardrobeStore
+
+# -----------------------------
+# Stylist HTTP service
+# -----------------------------
+# A request either carries the user profile (body type, skin tone,
+# wardrobe) or names a user_id from the SQLite wardrobe store (seeded
+# with the demo users). /recommend_outfit/batch evaluates many requests
+# in a single vectorised pass.
+CATALOG_PATH = os.getenv("STYLIST_CATALOG", os.path.join(HERE, "myntra_products_catalog.csv"))
+MAX_BATCH = int(os.getenv("STYLIST_MAX_BATCH", "1000"))
+
+app = Flask(__name__)
+
+wardrobe = WardrobeStore()
+if wardrobe.is_empty():
+    wardrobe.import_users(DEMO_USERS)
+
+engine = StylistEngine(StylistPredictor(load_or_train()), load_catalog(STYLIST_CATALOG_COLUMNS, CATALOG_PATH), wardrobe)
+
+
+class InvalidRequest(ValueError):
+    pass
+
+
+def _optional_lower(item, field):
+    value = item.get(field)
+    if value is not None and not isinstance(value, str):
+        raise InvalidRequest(f"'{field}' must be a string")
+    return value.lower() if value else None
+
+
+def _wardrobe_lists(items):
+    """Inline wardrobe -> {part: [str, ...]}; each part must be a list of strings."""
+    if items is None:
+        items = {}
+    if not isinstance(items, dict):
+        raise InvalidRequest("'wardrobe' must be an object of lists, e.g. {\"tops\": [\"blue top\"]}")
+    wardrobe_lists = {}
+    for part in ("tops", "bottoms", "dresses", "accessories"):
+        values = items.get(part) or []
+        if not isinstance(values, list) or not all(isinstance(x, str) for x in values):
+            raise InvalidRequest(f"'wardrobe.{part}' must be a list of strings")
+        wardrobe_lists[part] = values
+    return wardrobe_lists
+
+
+def parse_item(item):
+    """One request object -> (user, selected_top, selected_bottom, selected_dress)."""
+    if not isinstance(item, dict):
+        raise InvalidRequest("Each request must be an object")
+    if "user_id" in item:
+        user = wardrobe.profile(item["user_id"])
+        if user is None:
+            raise InvalidRequest(f"Unknown user_id '{item['user_id']}'")
+    else:
+        user = item.get("user")
+        if not isinstance(user, dict):
+            raise InvalidRequest("Provide 'user' (profile with body_type, skin_tone, wardrobe) or 'user_id'")
+        user = {
+            "body_type": str(user.get("body_type", "")).lower(),
+            "skin_tone": str(user.get("skin_tone", "")).lower(),
+            "wardrobe": _wardrobe_lists(user.get("wardrobe")),
+        }
+    return (user, _optional_lower(item, "top"), _optional_lower(item, "bottom"), _optional_lower(item, "dress"))
+
+
+def to_response(result):
+    outfit, available, missing, top_products = result
+    return {
+        "outfit": outfit,
+        "available": available,
+        "missing": [str(m) for m in missing],
+        "products": records(top_products),
+    }
+
+
+@app.route("/recommend_outfit", methods=["POST"])
+def recommend_outfit_route():
+    try:
+        item = parse_item(request.get_json(silent=True) or {})
+    except InvalidRequest as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(to_response(engine.recommend(*item)))
+
+
+@app.route("/recommend_outfit/batch", methods=["POST"])
+def recommend_outfit_batch_route():
+    data = request.get_json(silent=True) or {}
+    items = data.get("requests")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "'requests' must be a non-empty list"}), 400
+    if len(items) > MAX_BATCH:
+        return jsonify({"error": f"At most {MAX_BATCH} requests per batch"}), 400
+    parsed = []
+    for i, item in enumerate(items):
+        try:
+            parsed.append(parse_item(item))
+        except InvalidRequest as e:
+            return jsonify({"error": f"requests[{i}]: {e}"}), 400
+    return jsonify({"results": [to_response(r) for r in engine.recommend_batch(parsed)]})
+
+
+# -----------------------------
+# Wardrobe store
+# -----------------------------
+@app.route("/wardrobe/<user_id>", methods=["GET"])
+def get_wardrobe(user_id):
+    user = wardrobe.get_user(user_id)
+    if user is None:
+        return jsonify({"error": "Unknown user"}), 404
+    return jsonify(user)
+
+
+@app.route("/wardrobe/<user_id>", methods=["PUT"])
+def put_profile(user_id):
+    data = request.get_json(silent=True) or {}
+    wardrobe.upsert_user(user_id, data.get("name"),
+                         str(data.get("body_type", "")).lower(), str(data.get("skin_tone", "")).lower())
+    return jsonify(wardrobe.profile(user_id))
+
+
+@app.route("/wardrobe/<user_id>/items", methods=["POST"])
+def add_wardrobe_items(user_id):
+    if wardrobe.profile(user_id) is None:
+        return jsonify({"error": "Unknown user"}), 404
+    items = (request.get_json(silent=True) or {}).get("items")
+    if not isinstance(items, list) or not all(isinstance(x, str) and x.strip() for x in items):
+        return jsonify({"error": "'items' must be a list of product names"}), 400
+    added = wardrobe.add_items(user_id, [(wardrobe_part(x), x) for x in items])
+    return jsonify({"added": added})
+
+
+if __name__ == "__main__":
+    app.run(port=6020, debug=True)
@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import threading
+
+# -----------------------------
+# Persistent wardrobe store (SQLite)
+# -----------------------------
+# Items are stored per user and per wardrobe part (tops, bottoms, dresses,
+# accessories). On insert each item is normalised once:
+#   - colour and garment type, matched against the vocabularies below
+#   - every run of up to MAX_TERM_WORDS consecutive words, so "light yellow"
+#     and "a-line" are terms of "light yellow a-line dress"
+# Terms go in wardrobe_terms, whose primary key is (user, part, term). That
+# makes "does this user own a <colour/type/item> <part>" a single index
+# probe instead of a substring scan over the whole wardrobe.
+HERE = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.getenv("STYLIST_WARDROBE_DB", os.path.join(HERE, "wardrobe.db"))
+PARTS = ("tops", "bottoms", "dresses", "accessories")
+MAX_TERM_WORDS = 4
+
+COLOURS = ["pink", "mint", "light yellow", "yellow", "white", "off-white", "peach", "blue", "beige",
+           "purple", "lavender", "coral", "red", "green", "navy", "black", "orange", "denim",
+           "brown", "grey", "gray", "maroon", "olive", "gold", "silver", "cream", "mustard"]
+GARMENTS = ["a-line", "bodycon", "fit-and-flare", "shift", "maxi", "ballgown", "sheath", "mermaid",
+            "empire", "wrap", "off-shoulder", "shirt dress", "sundress", "evening gown", "gown",
+            "kurta", "tunic", "dress", "jeans", "trousers", "pencil skirt", "skirt", "t-shirt",
+            "tank top", "crop top", "blouse", "shirt", "top"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id   TEXT PRIMARY KEY,
+    name      TEXT,
+    body_type TEXT,
+    skin_tone TEXT
+);
+CREATE TABLE IF NOT EXISTS wardrobe_items (
+    id      INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    part    TEXT NOT NULL,
+    item    TEXT NOT NULL,
+    colour  TEXT,
+    garment TEXT,
+    UNIQUE (user_id, part, item)
+);
+CREATE INDEX IF NOT EXISTS idx_items_colour ON wardrobe_items (user_id, colour);
+CREATE INDEX IF NOT EXISTS idx_items_garment ON wardrobe_items (user_id, garment);
+CREATE TABLE IF NOT EXISTS wardrobe_terms (
+    user_id TEXT NOT NULL,
+    part    TEXT NOT NULL,
+    term    TEXT NOT NULL,
+    PRIMARY KEY (user_id, part, term)
+) WITHOUT ROWID;
+"""
+
+
+def normalise(text):
+    return " ".join(str(text).lower().split())
+
+
+def terms(item):
+    words = item.split()
+    return {
+        " ".join(words[i:j])
+        for i in range(len(words))
+        for j in range(i + 1, min(len(words), i + MAX_TERM_WORDS) + 1)
+    } | {item}
+
+
+def _first_match(item_terms, vocabulary):
+    # Vocabularies list more specific entries first ("light yellow" before "yellow")
+    return next((v for v in vocabulary if v in item_terms), None)
+
+
+def attributes(item):
+    """(colour, garment) for a normalised item name, None where nothing matches."""
+    item_terms = terms(item)
+    return _first_match(item_terms, COLOURS), _first_match(item_terms, GARMENTS)
+
+
+class WardrobeStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -----------------------------
+    # Users
+    # -----------------------------
+    def upsert_user(self, user_id, name=None, body_type=None, skin_tone=None):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO users (user_id, name, body_type, skin_tone) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET name=excluded.name, "
+                "body_type=excluded.body_type, skin_tone=excluded.skin_tone",
+                (user_id, name, body_type, skin_tone),
+            )
+
+    def profile(self, user_id):
+        """{"user_id", "name", "body_type", "skin_tone"} without the wardrobe, or None."""
+        row = self._conn().execute(
+            "SELECT user_id, name, body_type, skin_tone FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return dict(zip(("user_id", "name", "body_type", "skin_tone"), row)) if row else None
+
+    def is_empty(self):
+        return self._conn().execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+
+    def user_ids(self):
+        return [r[0] for r in self._conn().execute("SELECT user_id FROM users ORDER BY rowid")]
+
+    def get_user(self, user_id):
+        """The user in the demo dict format, wardrobe items in insertion order."""
+        user = self.profile(user_id)
+        if user is None:
+            return None
+        user["wardrobe"] = {part: [] for part in PARTS}
+        for part, item in self._conn().execute(
+            "SELECT part, item FROM wardrobe_items WHERE user_id = ? ORDER BY id", (user_id,)
+        ):
+            user["wardrobe"][part].append(item)
+        return user
+
+    # -----------------------------
+    # Wardrobe items
+    # -----------------------------
+    def add_items(self, user_id, items):
+        """Insert (part, item) pairs; returns how many were new."""
+        with self._conn() as conn:
+            return self._insert_items(conn, user_id, items)
+
+    def add_item(self, user_id, part, item):
+        return self.add_items(user_id, [(part, item)]) > 0
+
+    def import_users(self, users):
+        """Load users in the demo dict format ({user_id: {name, body_type, skin_tone, wardrobe}}) in one transaction."""
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO users (user_id, name, body_type, skin_tone) VALUES (?, ?, ?, ?)",
+                [(user_id, u.get("name"), u.get("body_type"), u.get("skin_tone")) for user_id, u in users.items()],
+            )
+            for user_id, user in users.items():
+                self._insert_items(conn, user_id, [(part, item) for part in PARTS
+                                                   for item in user["wardrobe"].get(part, [])])
+
+    @staticmethod
+    def _insert_items(conn, user_id, items):
+        rows, term_rows = [], []
+        for part, item in items:
+            item = normalise(item)
+            colour, garment = attributes(item)
+            rows.append((user_id, part, item, colour, garment))
+            term_rows.extend((user_id, part, term) for term in terms(item))
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO wardrobe_items (user_id, part, item, colour, garment) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        added = conn.total_changes - before
+        conn.executemany("INSERT OR IGNORE INTO wardrobe_terms (user_id, part, term) VALUES (?, ?, ?)", term_rows)
+        return added
+
+    def owns(self, user_id, part, phrase):
+        """True if some item in the part contains phrase as whole words (e.g. a colour or type)."""
+        return self._conn().execute(
+            "SELECT 1 FROM wardrobe_terms WHERE user_id = ? AND part = ? AND term = ?",
+            (user_id, part, normalise(phrase)),
+        ).fetchone() is not None
+
+    def items(self, user_id, part, limit=None):
+        return [r[0] for r in self._conn().execute(
+            "SELECT item FROM wardrobe_items WHERE user_id = ? AND part = ? ORDER BY id LIMIT ?",
+            (user_id, part, -1 if limit is None else limit),
+        )]
+
+    def find(self, user_id, part=None, colour=None, garment=None):
+        """Items filtered by the normalised attributes."""
+        query = "SELECT part, item FROM wardrobe_items WHERE user_id = ?"
+        params = [user_id]
+        for column, value in (("part", part), ("colour", colour), ("garment", garment)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(normalise(value))
+        return self._conn().execute(query + " ORDER BY id", params).fetchall()
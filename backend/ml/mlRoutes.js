@@ -3,6 +3,7 @@ const express = require('express');
 const router = express.Router();
 const multer = require('multer');
 const fs = require('fs');
+const crypto = require('crypto');
 const path = require('path');
 const axios = require('axios');
 const FormData = require('form-data');
@@ -23,46 +24,129 @@ const storage = multer.diskStorage({
   },
 });
 
-const upload = multer({ storage });
+// Janitor: TTL + LRU (by last access/modification) eviction under a total size cap
+const UPLOAD_MAX_BYTES = Number(process.env.ML_UPLOAD_MAX_MB || 512) * 1024 * 1024;
+const UPLOAD_TTL_MS = Number(process.env.ML_UPLOAD_TTL_HOURS || 24) * 3600 * 1000;
+const storageStats = { bytes: 0, files: 0, maxBytes: UPLOAD_MAX_BYTES, evictedTtl: 0, evictedLru: 0, lastSweep: null };
+
+const sweepUploads = () => {
+  const now = Date.now();
+  const files = [];
+  for (const name of fs.readdirSync(UPLOAD_DIR)) {
+    try {
+      const filePath = path.join(UPLOAD_DIR, name);
+      const st = fs.statSync(filePath);
+      if (st.isFile()) files.push({ filePath, size: st.size, used: Math.max(st.atimeMs, st.mtimeMs) });
+    } catch (err) {
+      // removed concurrently
+    }
+  }
+
+  let bytes = 0;
+  const live = [];
+  for (const f of files) {
+    if (now - f.used > UPLOAD_TTL_MS) {
+      fs.rmSync(f.filePath, { force: true });
+      storageStats.evictedTtl += 1;
+    } else {
+      live.push(f);
+      bytes += f.size;
+    }
+  }
+  live.sort((a, b) => a.used - b.used);
+  while (bytes > UPLOAD_MAX_BYTES && live.length) {
+    const f = live.shift();
+    fs.rmSync(f.filePath, { force: true });
+    bytes -= f.size;
+    storageStats.evictedLru += 1;
+  }
+
+  Object.assign(storageStats, { bytes, files: live.length, lastSweep: new Date(now).toISOString() });
+};
+
+const sweepSafely = () => {
+  try {
+    sweepUploads();
+  } catch (err) {
+    console.error('Upload janitor failed:', err.message);
+  }
+};
+sweepSafely();
+setInterval(sweepSafely, Number(process.env.ML_JANITOR_INTERVAL_SEC || 60) * 1000).unref();
+
+// Uploads stay in memory and are forwarded as buffers unless persistence is enabled
+const PERSIST_UPLOADS = process.env.ML_PERSIST_UPLOADS === 'true';
+const upload = multer({ storage: PERSIST_UPLOADS ? storage : multer.memoryStorage() });
+
+// Forward an uploaded file from either disk or memory storage
+const appendUpload = (form, field, file) => {
+  if (file.buffer) {
+    form.append(field, file.buffer, { filename: file.originalname, contentType: file.mimetype });
+  } else {
+    form.append(field, fs.createReadStream(file.path));
+  }
+};
+
+const TRYON_URL = 'http://localhost:6090';
+
+// Build the multipart form Flask expects; returns { error } when inputs are missing
+const buildTryOnForm = (req) => {
+  const { body_type, body_weight, body_height, angle, angles, product_id } = req.body;
+
+  // Check person image exists
+  const personFile = req.files.find(f => f.fieldname === 'person_image');
+  if (!personFile) return { error: 'Person image is required' };
+
+  // All other files are outfits/products (one image per dress)
+  const outfitFiles = req.files.filter(f => f.fieldname !== 'person_image');
+  if (!outfitFiles.length) return { error: 'At least one outfit image is required' };
+
+  // Create FormData to send to Flask
+  const form = new FormData();
+  form.append('body_type', body_type);
+  form.append('body_weight', body_weight);
+  form.append('body_height', body_height);
+  form.append('angle', angle);
+  form.append('product_id', product_id);
+  if (angles) form.append('angles', angles);
+
+  // Append person image
+  appendUpload(form, 'person_image', personFile);
+
+  // Append outfit images with field names like outfit_image_0, outfit_image_1, ...
+  outfitFiles.forEach((file, i) => {
+    appendUpload(form, `outfit_image_${i}`, file);
+  });
+  return { form };
+};
 
 // Route: handle person + outfit images
 router.post('/virtual-try', upload.any(), async (req, res) => {
   try {
-    const { body_type, body_weight, body_height, angle, product_id } = req.body;
-
-    // Check person image exists
-    const personFile = req.files.find(f => f.fieldname === 'person_image');
-    if (!personFile) return res.status(400).json({ error: 'Person image is required' });
-
-    // All other files are outfits/products (one image per dress)
-    const outfitFiles = req.files.filter(f => f.fieldname !== 'person_image');
-    if (!outfitFiles.length) return res.status(400).json({ error: 'At least one outfit image is required' });
-
-    // Create FormData to send to Flask
-    const form = new FormData();
-    form.append('body_type', body_type);
-    form.append('body_weight', body_weight);
-    form.append('body_height', body_height);
-    form.append('angle', angle);
-    form.append('product_id', product_id);
-
-    // Append person image
-    form.append('person_image', fs.createReadStream(personFile.path));
-
-    // Append outfit images with field names like outfit_image_0, outfit_image_1, ...
-    outfitFiles.forEach((file, i) => {
-      form.append(`outfit_image_${i}`, fs.createReadStream(file.path));
-    });
+    const { form, error } = buildTryOnForm(req);
+    if (error) return res.status(400).json({ error });
+
+    // ?stream=1 pipes the generated image straight back instead of storing it
+    if (req.query.stream === '1') {
+      const flaskRes = await axios.post(`${TRYON_URL}/generate`, form, {
+        headers: form.getHeaders(),
+        responseType: 'stream',
+      });
+      res.set('Content-Type', flaskRes.headers['content-type'] || 'image/png');
+      if (flaskRes.headers['x-cache']) res.set('X-Cache', flaskRes.headers['x-cache']);
+      return flaskRes.data.pipe(res);
+    }
 
     // Send to Flask backend
-    const flaskRes = await axios.post('http://localhost:6090/generate', form, {
+    const flaskRes = await axios.post(`${TRYON_URL}/generate`, form, {
       headers: form.getHeaders(),
       responseType: 'arraybuffer', // to handle image buffer
     });
 
-    // Save the generated image locally
-    const outputPath = path.join(UPLOAD_DIR, `generated_${Date.now()}.png`);
-    fs.writeFileSync(outputPath, flaskRes.data);
+    // Save the generated image locally under its content hash, so users never collide
+    const digest = crypto.createHash('sha256').update(flaskRes.data).digest('hex');
+    const outputPath = path.join(UPLOAD_DIR, `generated_${digest}.png`);
+    if (!fs.existsSync(outputPath)) fs.writeFileSync(outputPath, flaskRes.data);
 
     res.json({
       message: 'Images stored and sent to Flask successfully',
@@ -77,6 +161,79 @@ router.post('/virtual-try', upload.any(), async (req, res) => {
 
 
 
+router.get('/virtual-try/storage', (req, res) => {
+  res.json(storageStats);
+});
+
+// Batch: every outfit x angle in one call; ?mode=jobs returns per-item jobs instead of a zip
+router.post('/virtual-try/batch', upload.any(), async (req, res) => {
+  try {
+    const { form, error } = buildTryOnForm(req);
+    if (error) return res.status(400).json({ error });
+
+    const mode = req.query.mode === 'jobs' ? '?mode=jobs' : '';
+    const flaskRes = await axios.post(`${TRYON_URL}/generate_batch${mode}`, form, {
+      headers: form.getHeaders(),
+      responseType: 'stream',
+      validateStatus: () => true,
+    });
+    res.status(flaskRes.status);
+    ['content-type', 'content-disposition', 'retry-after'].forEach((h) => {
+      if (flaskRes.headers[h]) res.set(h, flaskRes.headers[h]);
+    });
+    flaskRes.data.pipe(res);
+  } catch (err) {
+    console.error(err.message);
+    res.status(500).json({ error: 'Something went wrong' });
+  }
+});
+
+// Job API: submit returns a job id right away, then poll status and fetch the result
+router.post('/virtual-try/jobs', upload.any(), async (req, res) => {
+  try {
+    const { form, error } = buildTryOnForm(req);
+    if (error) return res.status(400).json({ error });
+
+    const flaskRes = await axios.post(`${TRYON_URL}/jobs`, form, {
+      headers: form.getHeaders(),
+      validateStatus: () => true,
+    });
+    if (flaskRes.headers['retry-after']) res.set('Retry-After', flaskRes.headers['retry-after']);
+    res.status(flaskRes.status).json(flaskRes.data);
+  } catch (err) {
+    console.error(err.message);
+    res.status(500).json({ error: 'Something went wrong' });
+  }
+});
+
+router.get('/virtual-try/jobs/:id', async (req, res) => {
+  try {
+    const flaskRes = await axios.get(`${TRYON_URL}/jobs/${encodeURIComponent(req.params.id)}`, {
+      validateStatus: () => true,
+    });
+    res.status(flaskRes.status).json(flaskRes.data);
+  } catch (err) {
+    console.error(err.message);
+    res.status(500).json({ error: 'Something went wrong' });
+  }
+});
+
+router.get('/virtual-try/jobs/:id/result', async (req, res) => {
+  try {
+    const flaskRes = await axios.get(`${TRYON_URL}/jobs/${encodeURIComponent(req.params.id)}/result`, {
+      responseType: 'stream',
+      validateStatus: () => true,
+    });
+    res.status(flaskRes.status);
+    res.set('Content-Type', flaskRes.headers['content-type'] || 'application/json');
+    flaskRes.data.pipe(res);
+  } catch (err) {
+    console.error(err.message);
+    res.status(500).json({ error: 'Something went wrong' });
+  }
+});
+
+
 router.post("/", async (req, res) => {
   try {
     const { city } = req.body;
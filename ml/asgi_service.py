@@ -0,0 +1,94 @@
+# asgi_service.py
+"""
+Asyncio (ASGI) serving mode for the LLM-bound colour and recommendation routes.
+
+Gemini calls are awaited instead of blocking a worker, and the CPU-bound
+keyword search / MiniLM encoding in /recommendations runs on a thread pool,
+so one process keeps many slow LLM requests in flight at once.
+
+Run:
+    uvicorn asgi_service:app --port 6011
+
+ASGI_ROUTES picks what is mounted ("colors,recommendations" by default);
+leave out "recommendations" to skip loading main.py (MongoDB + embeddings).
+"""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import colour_mapper
+
+ENABLED_ROUTES = {r.strip() for r in os.getenv("ASGI_ROUTES", "colors,recommendations").split(",")}
+CPU_WORKERS = int(os.getenv("ASGI_CPU_WORKERS", str(os.cpu_count() or 4)))
+
+_cpu_pool = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="asgi-cpu")
+
+
+# ==========================
+# Colour routes
+# ==========================
+async def map_colors_route(request: Request):
+    """Map a list of colors to standardized family and hex code."""
+    data = await request.json()
+    colors = data.get("colors", [])
+    if not isinstance(colors, list):
+        return JSONResponse({"error": "Colors must be a list"}, status_code=400)
+
+    mapped = await asyncio.gather(*(colour_mapper.amap_color(c) for c in colors))
+    results = {c: {"family": family, "hex": hex_code} for c, (family, hex_code) in zip(colors, mapped)}
+    return JSONResponse(results)
+
+
+async def map_tags_route(request: Request):
+    """Map a clothing description to color, style, and season tags."""
+    data = await request.json()
+    description = data.get("description", "")
+    if not isinstance(description, str):
+        return JSONResponse({"error": "Description must be a string"}, status_code=400)
+
+    return JSONResponse(await colour_mapper.amap_all_tags(description))
+
+
+# ==========================
+# Recommendation route
+# ==========================
+async def recommendations_route(request: Request):
+    import main  # loaded at startup when enabled, see below
+
+    data = await request.json()
+    city = data.get("city", "Delhi")
+    gemini_text = await main.get_gemini_fashion_weather_async(city)
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_cpu_pool, main.build_recommendations, city, gemini_text)
+    return JSONResponse(main.clean_json(result))
+
+
+routes = []
+if "colors" in ENABLED_ROUTES:
+    routes += [
+        Route("/map_colors", map_colors_route, methods=["POST"]),
+        Route("/map_tags", map_tags_route, methods=["POST"]),
+    ]
+if "recommendations" in ENABLED_ROUTES:
+    import main  # noqa: F401  (starts the MongoDB + embeddings warmup, see lifecycle.py)
+    routes.append(Route("/recommendations", recommendations_route, methods=["POST"]))
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+    on_shutdown=[lambda: _cpu_pool.shutdown(wait=False)],
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=6011)
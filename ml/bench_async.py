@@ -0,0 +1,145 @@
+# bench_async.py
+"""
+Concurrent-request capacity of one sync Flask process vs one ASGI process.
+
+Both servers run the colour routes against the fake Gemini backend with a
+fixed model latency and no LRU cache, so every request waits on the "LLM".
+A closed-loop client steps through concurrency levels and reports
+throughput and latency; capacity is the highest level whose p99 stays
+within --slo-factor times the model latency.
+
+Usage:
+    python bench_async.py --latency-ms 300 --levels 1,8,32,128,256 --duration 10
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import itertools
+import threading
+import subprocess
+import urllib.request
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# ==========================
+# Servers
+# ==========================
+def start_server(kind: str, port: int, latency_ms: float) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "GENAI_BACKEND": "fake",
+        "FAKE_GENAI_LATENCY": f"constant:mean={latency_ms}",
+        "COLOR_MAPPER_CACHE_SIZE": "0",
+        "ASGI_ROUTES": "colors",
+    })
+    if kind == "sync":
+        # A single-threaded Flask process, like one sync gunicorn worker
+        cmd = [sys.executable, "-c",
+               f"import colour_mapper; colour_mapper.app.run(port={port}, threaded=False)"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "asgi_service:app",
+               "--port", str(port), "--workers", "1", "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=HERE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+# ==========================
+# Closed-loop client
+# ==========================
+def run_level(port: int, concurrency: int, duration: float) -> Dict[str, float]:
+    url = f"http://127.0.0.1:{port}/map_colors"
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        nonlocal errors
+        while time.perf_counter() < stop_at:
+            # A fresh name per request so no layer can serve it from cache
+            body = json.dumps({"colors": [f"shade-{next(counter)}"]}).encode()
+            req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+            t0 = time.perf_counter()
+            try:
+                urllib.request.urlopen(req, timeout=120).read()
+                ok = True
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - t0
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    pick = lambda p: latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else 0.0
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(pick(50), 1),
+        "p99_ms": round(pick(99), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-process capacity of the sync and ASGI colour services.")
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--levels", default="1,8,32,128,256")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument("--slo-factor", type=float, default=2.0)
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args(argv)
+
+    levels = [int(x) for x in args.levels.split(",")]
+    slo_ms = args.latency_ms * args.slo_factor
+    report = {}
+    for kind, port in (("sync", 6110), ("asgi", 6111)):
+        proc = start_server(kind, port, args.latency_ms)
+        try:
+            rows = [run_level(port, c, args.duration) for c in levels]
+        finally:
+            proc.terminate()
+            proc.wait()
+        capacity = max((r["concurrency"] for r in rows if r["errors"] == 0 and r["p99_ms"] <= slo_ms), default=0)
+        report[kind] = {"levels": rows, "capacity": capacity}
+
+        print(f"\n== {kind} (one process, model latency {args.latency_ms:.0f} ms) ==")
+        print(f"{'conc':>6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for r in rows:
+            print(f"{r['concurrency']:>6} {r['throughput_rps']:>9} {r['p50_ms']:>9} {r['p99_ms']:>9} {r['errors']:>7}")
+        print(f"capacity at p99 <= {slo_ms:.0f} ms: {capacity} concurrent requests")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# bench_colour_services.py
+"""
+Offline latency benchmark for the /map_colors and /map_tags routes.
+
+Drives the Flask app in-process with colour names and descriptions sampled
+from the catalog CSV, using the fake Gemini backend, and reports latency
+percentiles, throughput and LRU hit rates for each cache size.
+
+Usage:
+    python bench_colour_services.py --latency "lognormal:mean=400,sigma=0.5" \\
+        --cache-sizes 0,256,4096 --requests 2000 --concurrency 16
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import random
+import argparse
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+DEFAULT_CATALOG = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "Myntra_hackerramp", "myntra_products_catalog.csv"
+))
+
+csv.field_size_limit(sys.maxsize)
+
+
+# ==========================
+# Workload
+# ==========================
+def load_workload(path: str, limit: int) -> Tuple[List[str], List[str]]:
+    """Colour names (with their catalog frequency) and descriptions from the catalog."""
+    colors, descriptions = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            if i >= limit:
+                break
+            if (row.get("PrimaryColor") or "").strip():
+                colors.append(row["PrimaryColor"].strip())
+            if (row.get("Description") or "").strip():
+                descriptions.append(row["Description"].strip())
+    return colors, descriptions
+
+
+def build_requests(colors: List[str], descriptions: List[str], count: int,
+                   tags_ratio: float, colors_per_request: int, seed: int):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        if rng.random() < tags_ratio:
+            requests.append(("/map_tags", {"description": rng.choice(descriptions)}))
+        else:
+            requests.append(("/map_colors", {"colors": rng.choices(colors, k=colors_per_request)}))
+    return requests
+
+
+# ==========================
+# Runner
+# ==========================
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def run_config(service: str, cache_size: int, requests, concurrency: int) -> Dict[str, object]:
+    os.environ["COLOR_MAPPER_CACHE_SIZE"] = str(cache_size)
+    module = importlib.import_module(service)
+    module = importlib.reload(module)  # re-applies lru_cache sizes and resets the singleton
+
+    local = threading.local()
+    latencies: Dict[str, List[float]] = {}
+    errors = 0
+    lock = threading.Lock()
+
+    def send(item):
+        nonlocal errors
+        route, payload = item
+        if not hasattr(local, "client"):
+            local.client = module.app.test_client()
+        t0 = time.perf_counter()
+        response = local.client.post(route, json=payload)
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.setdefault(route, []).append(elapsed)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, requests))
+    wall = time.perf_counter() - start
+
+    result = {
+        "service": service,
+        "cache_size": cache_size,
+        "requests": len(requests),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(requests) / wall, 1),
+        "model_calls": getattr(module._color_mapper.model, "calls", None),
+        "routes": {},
+        "cache": {},
+    }
+    for route, values in latencies.items():
+        result["routes"][route] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+    for name in ("map_color", "map_all_tags"):
+        info = getattr(module.ColorMapper, name).cache_info()
+        lookups = info.hits + info.misses
+        result["cache"][name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 3) if lookups else 0.0,
+        }
+    return result
+
+
+def print_result(result: Dict[str, object]) -> None:
+    print(f"\n== {result['service']} cache_size={result['cache_size']} ==")
+    print(f"{result['requests']} requests, {result['errors']} errors, {result['wall_s']}s, "
+          f"{result['throughput_rps']} req/s, {result['model_calls']} model calls")
+    for route, stats in result["routes"].items():
+        print(f"  {route:<12} n={stats['count']:<6} p50 {stats['p50_ms']:>8} ms  "
+              f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms")
+    for name, stats in result["cache"].items():
+        print(f"  cache {name:<13} hit rate {stats['hit_rate']:.1%} "
+              f"({stats['hits']} hits / {stats['misses']} misses)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the colour services against a fake Gemini backend.")
+    parser.add_argument("--service", default="colour_mapper", choices=["colour_mapper", "colour_service"])
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG)
+    parser.add_argument("--catalog-rows", type=int, default=5000)
+    parser.add_argument("--latency", default="lognormal:mean=400,sigma=0.5",
+                        help="Fake model latency spec in ms, see fake_genai.LatencyModel.parse")
+    parser.add_argument("--cache-sizes", default="0,256,4096")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--tags-ratio", type=float, default=0.5)
+    parser.add_argument("--colors-per-request", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    os.environ["GENAI_BACKEND"] = "fake"
+    os.environ["FAKE_GENAI_LATENCY"] = args.latency
+
+    colors, descriptions = load_workload(args.catalog, args.catalog_rows)
+    requests = build_requests(colors, descriptions, args.requests, args.tags_ratio,
+                              args.colors_per_request, args.seed)
+
+    results = []
+    for size in (int(s) for s in args.cache_sizes.split(",")):
+        result = run_config(args.service, size, requests, args.concurrency)
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# bench_startup.py
+"""
+Import-time breakdown and time-to-ready for the Flask ML services.
+
+Each service is imported in a fresh interpreter under `python -X importtime`,
+once per WARMUP_MODE:
+
+    eager       models, Mongo and SDKs load during import (the old behaviour)
+    background  import returns once Flask routes exist; warmup runs in a thread
+
+For every run it reports how long the import took, how long until the
+service's warmup finished (what /readyz waits for), and which of the
+service's own imports were slowest according to the importtime log.
+
+    GENAI_BACKEND=fake python bench_startup.py main check trends
+    python bench_startup.py --json startup.json
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SERVICES = ["main", "check", "trends", "colour_mapper", "colour_service", "virtualTryOn"]
+MODES = ["eager", "background"]
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+module = __import__(sys.argv[1])
+t1 = time.perf_counter()
+warmup = getattr(module, "warmup", None)
+state = None
+if warmup is not None:
+    try:
+        warmup.ensure()
+    except Exception:
+        pass
+    state = warmup.state
+t2 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "ready_s": t2 - t0, "state": state}))
+"""
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+# ==========================
+# Measurement
+# ==========================
+def top_packages(stderr: str, service: str, limit: int) -> List[Dict[str, object]]:
+    """Cumulative import time of the service's direct imports, grouped by top-level package."""
+    rows = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            rows.append((len(m.group(3)), m.group(4), int(m.group(2))))
+    if not rows:
+        return []
+    # importtime prints children before their parent, indented two more spaces
+    outermost = min(depth for depth, _, _ in rows)
+    children: List[tuple] = []
+    for depth, name, cumulative_us in rows:
+        if depth == outermost:
+            if name == service:
+                break
+            children = []
+        elif depth == outermost + 2:
+            children.append((name, cumulative_us))
+    totals: Dict[str, int] = defaultdict(int)
+    for name, cumulative_us in children:
+        totals[name.split(".")[0]] += cumulative_us
+    ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+    return [{"package": name, "ms": round(us / 1000, 1)} for name, us in ranked]
+
+
+def measure(service: str, mode: str, limit: int) -> Dict[str, object]:
+    env = dict(os.environ, WARMUP_MODE=mode)
+    env.setdefault("GENAI_BACKEND", "fake")
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE, service],
+                         cwd=HERE, env=env, capture_output=True, text=True)
+    result: Dict[str, object] = {"service": service, "mode": mode}
+    lines = out.stdout.strip().splitlines()
+    if out.returncode != 0 or not lines:
+        errors = [l for l in out.stderr.splitlines() if not l.startswith("import time:")]
+        result["error"] = errors[-1] if errors else f"exit code {out.returncode}"
+        return result
+    result.update(json.loads(lines[-1]))
+    result["packages"] = top_packages(out.stderr, service, limit)
+    return result
+
+
+# ==========================
+# Entry point
+# ==========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time and time-to-ready per ML service.")
+    parser.add_argument("services", nargs="*", default=SERVICES)
+    parser.add_argument("--top", type=int, default=6, help="slowest packages to list per run")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'service':>15} {'mode':>10} {'import s':>9} {'ready s':>8}  state / slowest imports")
+    for service in args.services:
+        for mode in MODES:
+            r = measure(service, mode, args.top)
+            results.append(r)
+            if "error" in r:
+                print(f"{service:>15} {mode:>10} {'-':>9} {'-':>8}  {r['error']}")
+                continue
+            slowest = ", ".join(f"{p['package']} {p['ms']:.0f}ms" for p in r["packages"])
+            print(f"{service:>15} {mode:>10} {r['import_s']:>9.2f} {r['ready_s']:>8.2f}  {r['state']}: {slowest}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+# bench_suite.py
+"""
+End-to-end benchmark suite for the ML hot paths, fully offline.
+
+For each catalog size a fresh interpreter seeds synthetic products and
+Instagram posts (from Myntra_hackerramp/data.py) into mongomock, or into a
+scratch database on a local mongod. It then imports the services with the
+fake Gemini backend and the fake encoder, and times every hot function and
+route:
+
+    python bench_suite.py --sizes 10000,100000 --out results.json
+    python bench_suite.py --sizes 1000000 --mongo mongodb://localhost:27017
+    python bench_suite.py --baseline baseline.json       # flag regressions
+    python bench_suite.py --out baseline.json            # record a new baseline
+
+Per case it records latency percentiles, throughput and peak traced
+allocation; per size, seeding time and peak RSS. With --baseline, a p50 or
+p95 slower than baseline by more than --threshold (and --min-delta-ms) is
+reported as a regression and the exit status is 1. So is a baseline case
+that errored or is missing. A case group whose setup fails (the check
+group needs spaCy's en_core_web_sm) also exits 1 unless --allow-skipped.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import importlib.util
+import subprocess
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STYLIST_DIR = os.path.join(os.path.dirname(HERE), "Myntra_hackerramp")
+INSTAGRAM_POSTS = 5000
+
+
+# ==========================
+# Measurement
+# ==========================
+def measure(fn: Callable[[], object], min_iters: int, max_iters: int, max_seconds: float) -> Dict[str, float]:
+    fn()  # warm caches and lazy initialisation
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    while len(latencies) < max_iters and (len(latencies) < min_iters or time.perf_counter() - started < max_seconds):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+
+    ordered = sorted(latencies)
+    pick = lambda p: ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+    return {
+        "iterations": len(ordered),
+        "p50_ms": round(pick(50), 3),
+        "p95_ms": round(pick(95), 3),
+        "p99_ms": round(pick(99), 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "throughput_per_s": round(len(ordered) / sum(ordered), 2),
+        "peak_alloc_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+# ==========================
+# Worker: one catalog size per process
+# ==========================
+def _load_generator():
+    spec = importlib.util.spec_from_file_location("synthetic_data", os.path.join(STYLIST_DIR, "data.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed_database(db, size: int, seed: int, batch_size: int = 10000) -> None:
+    generator = _load_generator()
+    for name, count, make in (("products", size, generator.make_product),
+                              ("instagram_posts", INSTAGRAM_POSTS, generator.make_instagram_post)):
+        rng = random.Random(f"{seed}-{name}")
+        db[name].drop()
+        for start in range(0, count, batch_size):
+            db[name].insert_many([make(rng, n) for n in range(start, min(count, start + batch_size))])
+
+
+def _ok(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+def build_cases() -> Tuple[List[Tuple[str, str, str, Callable]], Dict[str, str]]:
+    """(group, name, kind, fn) per hot path; setup failures are recorded per group, not raised."""
+    cases, errors = [], {}
+    counter = iter(range(10 ** 9))
+
+    def group(label, setup):
+        start = len(cases)
+        try:
+            setup()
+        except Exception as e:
+            errors[label] = f"{type(e).__name__}: {e}"
+        finally:
+            cases[start:] = [(label, *case) for case in cases[start:]]
+
+    def main_cases():
+        import main
+        client = main.app.test_client()
+        cases.append(("main.recommend_products_from_keywords", "function",
+                      lambda: main.recommend_products_from_keywords(["red", "kurta", "silk", "dress"], top_n=50)))
+        cases.append(("POST /recommendations", "route",
+                      lambda: _ok(client.post("/recommendations", json={"city": "Delhi"}))))
+
+    def check_cases():
+        import check
+        client = check.app.test_client()
+        captions = [p["caption"] for p in check.db["instagram_posts"].find({}, {"caption": 1}).limit(500)]
+        cases.append(("check.get_trending_products", "function", lambda: check.get_trending_products(10)))
+        cases.append(("check.extract_keywords", "function", lambda: check.extract_keywords(captions)))
+        cases.append(("check.semantic_search_products", "function",
+                      lambda: check.semantic_search_products(["dress", "style", "outfit"], top_n=10)))
+        cases.append(("GET /trending_fashion", "route", lambda: _ok(client.get("/trending_fashion?n=10"))))
+
+    def trends_cases():
+        import trends
+        client = trends.app.test_client()
+        cases.append(("trends.get_trending_products", "function", lambda: trends.get_trending_products(40)))
+        cases.append(("GET /trending (trends)", "route", lambda: _ok(client.get("/trending?n=40"))))
+
+    def colour_cases():
+        import colour_mapper
+        client = colour_mapper.app.test_client()
+        # A fresh name per call so the LRU cache does not hide the mapping cost
+        cases.append(("colour_mapper.map_color", "function",
+                      lambda: colour_mapper.map_color(f"dusty shade {next(counter)}")))
+        cases.append(("POST /map_colors", "route",
+                      lambda: _ok(client.post("/map_colors", json={"colors": [f"shade {next(counter)}" for _ in range(8)]}))))
+
+    def stylist_cases():
+        sys.path.insert(0, STYLIST_DIR)
+        import stylist_service
+        profile = {"body_type": "pear", "skin_tone": "medium",
+                   "wardrobe": {"tops": ["blue top"], "bottoms": ["denim jeans"], "dresses": ["maxi dress"],
+                                "accessories": ["belt"]}}
+        item = stylist_service.parse_item({"user": profile, "top": "blue top"})
+        client = stylist_service.app.test_client()
+        batch = {"requests": [{"user": profile, "bottom": "denim jeans"}] * 100}
+        cases.append(("stylist.recommend_outfit", "function", lambda: stylist_service.engine.recommend(*item)))
+        cases.append(("POST /recommend_outfit/batch (100)", "route",
+                      lambda: _ok(client.post("/recommend_outfit/batch", json=batch))))
+
+    for label, setup in (("main", main_cases), ("check", check_cases), ("trends", trends_cases),
+                         ("colour_mapper", colour_cases), ("stylist", stylist_cases)):
+        group(label, setup)
+    return cases, errors
+
+
+def run_worker(args) -> Dict[str, object]:
+    # Load at import, so a broken case fails there and warmup stays out of the timings
+    os.environ.setdefault("WARMUP_MODE", "eager")
+    os.environ.setdefault("GENAI_BACKEND", "fake")
+    os.environ.setdefault("FAKE_GENAI_LATENCY", "constant:mean=0")
+    os.environ.setdefault("COLOR_MAPPER_CACHE_SIZE", "0")
+    os.environ.setdefault("STYLIST_WARDROBE_DB", os.path.join(tempfile.mkdtemp(prefix="bench-suite-"), "wardrobe.db"))
+    if not args.real_encoder:
+        os.environ["EMBEDDING_BACKEND"] = "fake"
+    sys.path.insert(0, HERE)
+
+    import pymongo
+    if args.mongo == "mongomock":
+        import mongomock
+        shared = mongomock.MongoClient()
+        pymongo.MongoClient = lambda *a, **k: shared  # every service sees the same in-memory server
+        db_name = "myntra-clone"
+        db = shared[db_name]
+    else:
+        db_name = f"bench_suite_{args.worker_size}"
+        os.environ["MONGO_URI"] = args.mongo
+        db = pymongo.MongoClient(args.mongo)[db_name]
+    os.environ["MONGO_DB"] = db_name
+
+    t0 = time.perf_counter()
+    seed_database(db, args.worker_size, args.seed)
+    seed_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cases, errors = build_cases()
+    import_s = time.perf_counter() - t0
+
+    results = {}
+    for group, name, kind, fn in cases:
+        try:
+            results[name] = {"group": group, "kind": kind,
+                             **measure(fn, args.min_iters, args.max_iters, args.max_seconds)}
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+        print(f"[INFO] {args.worker_size}: {name} done", file=sys.stderr)
+
+    if args.mongo != "mongomock":
+        db.client.drop_database(db_name)
+    return {
+        "seed_s": round(seed_s, 2),
+        "import_s": round(import_s, 2),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "cases": results,
+        "errors": errors,
+    }
+
+
+# ==========================
+# Driver
+# ==========================
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Slowdowns, plus baseline cases that errored or disappeared, for every size run this time."""
+    flagged = []
+    for size, run in results.items():
+        base_run = baseline.get("results", {}).get(size)
+        if not base_run:
+            continue
+        errors = run.get("errors", {})
+        for name, base in base_run["cases"].items():
+            if name not in run["cases"]:
+                # Setup failures are recorded per group ("check"), case failures per case name
+                error = errors.get(name) or errors.get(base.get("group"))
+                flagged.append(f"{size:>8} {name}: in the baseline but {'failed: ' + error if error else 'missing'}")
+        for name, stats in run["cases"].items():
+            base = base_run["cases"].get(name)
+            if not base:
+                continue
+            for metric in ("p50_ms", "p95_ms"):
+                now, before = stats[metric], base[metric]
+                if now > before * (1 + threshold) and now - before > min_delta_ms:
+                    flagged.append(f"{size:>8} {name}: {metric} {before:.2f} -> {now:.2f} ms "
+                                   f"(+{(now / before - 1) * 100 if before else float('inf'):.0f}%)")
+    return flagged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for the ML hot paths.")
+    parser.add_argument("--sizes", default="10000,100000", help="Catalog sizes; add 1000000 with a real mongod")
+    parser.add_argument("--mongo", default="mongomock", help="'mongomock' or a mongodb:// URI for a scratch database")
+    parser.add_argument("--real-encoder", action="store_true", help="Use the configured embedding backend")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-iters", type=int, default=5)
+    parser.add_argument("--max-iters", type=int, default=200)
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="Time budget per case after min-iters")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.20, help="Relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--allow-skipped", action="store_true",
+                        help="Exit 0 even if a case group or case could not run (e.g. en_core_web_sm missing)")
+    parser.add_argument("--worker-size", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker_size is not None:
+        print(json.dumps(run_worker(args)))
+        return
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(",")]:
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker-size", str(size), "--mongo", args.mongo,
+               "--seed", str(args.seed), "--min-iters", str(args.min_iters), "--max-iters", str(args.max_iters),
+               "--max-seconds", str(args.max_seconds)] + (["--real-encoder"] if args.real_encoder else [])
+        out = subprocess.run(cmd, cwd=HERE, stdout=subprocess.PIPE, text=True)
+        if out.returncode != 0:
+            raise SystemExit(f"Benchmark worker for {size} products failed (exit {out.returncode})")
+        run = json.loads(out.stdout.strip().splitlines()[-1])
+        results[str(size)] = run
+
+        print(f"\n== {size} products (seed {run['seed_s']} s, imports {run['import_s']} s, "
+              f"peak RSS {run['peak_rss_mb']} MB) ==")
+        print(f"{'case':<42} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'alloc MB':>9}")
+        for name, s in run["cases"].items():
+            print(f"{name:<42} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} "
+                  f"{s['throughput_per_s']:>9.1f} {s['peak_alloc_mb']:>9.2f}")
+        for name, error in run["errors"].items():
+            print(f"[ERROR] {name} did not run: {error}")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mongo": "mongomock" if args.mongo == "mongomock" else "mongod",
+            "encoder": os.getenv("EMBEDDING_BACKEND", "torch") if args.real_encoder else "fake",
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            flagged = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+        if flagged:
+            print(f"\n{len(flagged)} regression(s) against {args.baseline}:")
+            for line in flagged:
+                print("  " + line)
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+    skipped = sorted({name for run in results.values() for name in run["errors"]})
+    if skipped:
+        print(f"\nNOT RUN: {', '.join(skipped)}. These results are incomplete; "
+              f"fix the setup or pass --allow-skipped.")
+        if not args.allow_skipped:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# bench_tryon.py
+"""
+Offline benchmark for the virtual try-on service with a stubbed image model.
+
+    python bench_tryon.py preprocess --samples path/to/photos
+
+reports bytes saved by the preprocessing stage per image and the
+end-to-end /generate latency with preprocessing off and on. The fake model
+charges payload size against FAKE_GENAI_UPLOAD_MBPS, so upload time shows up.
+
+    python bench_tryon.py jobs --jobs 200 --clients 32
+
+load-tests the /jobs API: accepted vs rejected (503) submissions,
+submit-to-done latency and job throughput for the configured worker pool.
+
+    python bench_tryon.py cache
+
+checks the result cache end to end: a repeated /generate is a HIT that
+skips the model, and concurrent identical requests share one model call.
+Exits non-zero if either does not hold.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def load_samples(directory: str) -> List[bytes]:
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+    )
+    if len(paths) < 2:
+        raise SystemExit("Need at least two sample images (person + outfit)")
+    samples = []
+    for path in paths:
+        with open(path, "rb") as f:
+            samples.append(f.read())
+    return samples
+
+
+def synthetic_samples(count: int = 4, size: int = 512) -> List[bytes]:
+    """Random-noise JPEGs for load tests that do not care about image content."""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    samples = []
+    for _ in range(count):
+        out = BytesIO()
+        Image.fromarray(rng.integers(0, 256, (size, size, 3), dtype=np.uint8)).save(out, format="JPEG")
+        samples.append(out.getvalue())
+    return samples
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def import_service(latency: str, upload_mbps: float):
+    os.environ.setdefault("GENAI_BACKEND", "fake")
+    os.environ.setdefault("FAKE_GENAI_LATENCY", latency)
+    os.environ.setdefault("FAKE_GENAI_UPLOAD_MBPS", str(upload_mbps))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import virtualTryOn
+    return virtualTryOn
+
+
+def post_generate(client, person: bytes, outfit: bytes, angle: str = "FRONT", route: str = "/generate", **form):
+    data = {
+        "body_type": "hourglass", "body_weight": "60kg", "body_height": "165cm", "angle": angle,
+        "person_image": (BytesIO(person), "person.jpg"),
+        "outfit_image_0": (BytesIO(outfit), "outfit.jpg"),
+        **form,
+    }
+    return client.post(route, data=data, content_type="multipart/form-data")
+
+
+# ==========================
+# Preprocessing benchmark
+# ==========================
+def bench_preprocess(args):
+    service = import_service(args.latency, args.upload_mbps)
+    samples = load_samples(args.samples)
+
+    print(f"{'image':>5} {'raw KB':>9} {'prep KB':>9} {'saved':>7} {'prep ms':>8}")
+    raw_total = prep_total = 0
+    for i, data in enumerate(samples):
+        t0 = time.perf_counter()
+        processed = service.preprocess_image(data)
+        ms = (time.perf_counter() - t0) * 1000
+        raw_total += len(data)
+        prep_total += len(processed)
+        print(f"{i:>5} {len(data) / 1024:>9.1f} {len(processed) / 1024:>9.1f} "
+              f"{1 - len(processed) / len(data):>7.1%} {ms:>8.1f}")
+    print(f"total {raw_total / 1024:.1f} KB -> {prep_total / 1024:.1f} KB "
+          f"({1 - prep_total / raw_total:.1%} saved, format {service.ENCODE_FORMAT}, max edge {service.MAX_EDGE})")
+
+    pairs = [(samples[i], samples[(i + 1) % len(samples)]) for i in range(len(samples))]
+    for enabled in (False, True):
+        service.PREPROCESS = enabled
+        service.tryon_cache = service.TryOnCache(service.BlobStore(tempfile.mkdtemp(prefix="tryon-bench-")))
+        client = service.app.test_client()
+        timings = []
+        for _ in range(args.rounds):
+            for person, outfit in pairs:
+                t0 = time.perf_counter()
+                # A distinct body weight per request keeps the result cache out of the way
+                response = post_generate(client, person, outfit, body_weight=f"{50 + len(timings)}kg")
+                timings.append(time.perf_counter() - t0)
+                if response.status_code != 200:
+                    raise SystemExit(f"/generate failed: {response.get_json()}")
+        print(f"preprocess={'on ' if enabled else 'off'} n={len(timings)} "
+              f"p50 {percentile(timings, 50) * 1000:.1f} ms  p95 {percentile(timings, 95) * 1000:.1f} ms")
+
+
+# ==========================
+# Job queue load test
+# ==========================
+def bench_jobs(args):
+    service = import_service(args.latency, args.upload_mbps)
+    service.tryon_cache = service.TryOnCache(service.BlobStore(tempfile.mkdtemp(prefix="tryon-bench-")))
+    samples = load_samples(args.samples) if args.samples else synthetic_samples()
+
+    counter = iter(range(args.jobs))
+    lock = threading.Lock()
+    completions, rejected, failed, submit_errors, job_errors, max_depth = [], 0, 0, [], [], 0
+
+    def client_loop():
+        nonlocal rejected, failed, max_depth
+        client = service.app.test_client()
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                return
+            person, outfit = samples[n % len(samples)], samples[(n + 1) % len(samples)]
+            t0 = time.perf_counter()
+            while True:
+                response = post_generate(client, person, outfit, route="/jobs", body_weight=f"{n}kg")
+                if response.status_code != 503:
+                    break
+                with lock:
+                    rejected += 1
+                time.sleep(args.backoff)
+            if response.status_code != 202:
+                with lock:
+                    submit_errors.append(f"{response.status_code} {response.get_data(as_text=True)[:200]}")
+                continue
+            job_id = response.get_json()["job_id"]
+            depth = service.job_queue.stats()["queued"]
+            with lock:
+                max_depth = max(max_depth, depth)
+            while True:
+                job = client.get(f"/jobs/{job_id}").get_json()
+                status = job["status"]
+                if status in ("done", "failed"):
+                    break
+                time.sleep(args.poll)
+            with lock:
+                if status == "done":
+                    completions.append(time.perf_counter() - t0)
+                else:
+                    failed += 1
+                    job_errors.append(str(job.get("error")))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        futures = [pool.submit(client_loop) for _ in range(args.clients)]
+    wall = time.perf_counter() - start
+    for fut in futures:
+        fut.result()  # re-raise anything a client thread hit
+
+    stats = service.job_queue.stats()
+    print(f"{args.jobs} jobs from {args.clients} clients, {stats['workers']} workers, "
+          f"queue capacity {stats['capacity']}")
+    print(f"done {len(completions)}, failed {failed}, submit errors {len(submit_errors)}, "
+          f"503 rejections {rejected}, max queue depth {max_depth}")
+    for error in submit_errors[:5]:
+        print(f"[WARN] /jobs submit failed: {error}")
+    for error in sorted(set(job_errors))[:5]:
+        print(f"[WARN] job failed: {error}")
+    submitted = len(completions) + failed
+    if submitted and failed == submitted:
+        raise SystemExit(f"All {submitted} accepted jobs failed; no latency or throughput to report")
+    if completions:
+        print(f"throughput {len(completions) / wall:.1f} jobs/s, submit-to-done "
+              f"p50 {percentile(completions, 50) * 1000:.0f} ms  p95 {percentile(completions, 95) * 1000:.0f} ms")
+    if submit_errors:
+        raise SystemExit(f"{len(submit_errors)} of {args.jobs} jobs were not accepted by /jobs")
+
+
+# ==========================
+# Result cache check
+# ==========================
+def cache_hits(client) -> float:
+    """tryon_output hits so far, read from /metrics."""
+    for line in client.get("/metrics").get_data(as_text=True).splitlines():
+        if line.startswith("ml_cache_events_total") and 'cache="tryon_output"' in line and 'result="hit"' in line:
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def bench_cache(args):
+    service = import_service(args.latency, args.upload_mbps)
+    service.tryon_cache = service.TryOnCache(service.BlobStore(tempfile.mkdtemp(prefix="tryon-bench-")))
+    person, outfit = synthetic_samples(count=2)
+    client = service.app.test_client()
+    problems = []
+
+    calls = service.client.calls if service.client else 0
+    hits = cache_hits(client)
+    timings = []
+    for expected in ("MISS", "HIT"):
+        t0 = time.perf_counter()
+        response = post_generate(client, person, outfit)
+        timings.append(time.perf_counter() - t0)
+        if response.status_code != 200:
+            raise SystemExit(f"/generate failed: {response.get_json()}")
+        if response.headers.get("X-Cache") != expected:
+            problems.append(f"repeat request: expected X-Cache {expected}, got {response.headers.get('X-Cache')}")
+    repeat_calls = service.client.calls - calls
+    if repeat_calls != 1:
+        problems.append(f"repeat request: {repeat_calls} model calls, expected 1")
+    if cache_hits(client) - hits != 1:
+        problems.append(f"ml_cache_events_total hit count went up by {cache_hits(client) - hits:.0f}, expected 1")
+    print(f"repeat /generate: MISS {timings[0] * 1000:.1f} ms, HIT {timings[1] * 1000:.1f} ms, "
+          f"{repeat_calls} model call(s)")
+
+    # Identical requests in flight together: one leader calls the model, the rest wait for it
+    calls = service.client.calls
+    with ThreadPoolExecutor(max_workers=args.concurrent) as pool:
+        responses = list(pool.map(lambda _: post_generate(service.app.test_client(), person, outfit,
+                                                          body_weight="61kg"), range(args.concurrent)))
+    statuses = [r.status_code for r in responses]
+    flight_calls = service.client.calls - calls
+    misses = sum(r.headers.get("X-Cache") == "MISS" for r in responses)
+    if set(statuses) != {200}:
+        problems.append(f"concurrent requests: statuses {statuses}")
+    if flight_calls != 1 or misses != 1:
+        problems.append(f"concurrent requests: {flight_calls} model calls and {misses} MISS, expected 1 and 1")
+    print(f"{args.concurrent} concurrent identical /generate: {flight_calls} model call(s), "
+          f"{misses} MISS, {len(responses) - misses} HIT")
+
+    if problems:
+        raise SystemExit("\n".join(problems))
+    print("result cache OK")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the try-on service against a stubbed image model.")
+    parser.add_argument("--latency", default="constant:mean=200", help="Fake model latency spec (ms)")
+    parser.add_argument("--upload-mbps", type=float, default=20.0, help="Simulated upload bandwidth")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    prep = sub.add_parser("preprocess", help="Bytes saved and latency with/without preprocessing")
+    prep.add_argument("--samples", required=True, help="Directory of sample photos")
+    prep.add_argument("--rounds", type=int, default=3)
+    prep.set_defaults(func=bench_preprocess)
+
+    jobs = sub.add_parser("jobs", help="Load-test the /jobs queue")
+    jobs.add_argument("--samples", default=None, help="Directory of sample photos (default: synthetic)")
+    jobs.add_argument("--jobs", type=int, default=200)
+    jobs.add_argument("--clients", type=int, default=32)
+    jobs.add_argument("--poll", type=float, default=0.05, help="Seconds between status polls")
+    jobs.add_argument("--backoff", type=float, default=0.2, help="Seconds to wait after a 503")
+    jobs.set_defaults(func=bench_jobs)
+
+    cache = sub.add_parser("cache", help="Check that repeated /generate requests hit the result cache")
+    cache.add_argument("--concurrent", type=int, default=8, help="Identical requests sent at once")
+    cache.set_defaults(func=bench_cache)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# blob_store.py
+"""
+Size-bounded blob directory with content-hash names, TTL and LRU eviction.
+
+Blobs live under <directory>/<key[:2]>/<key><ext>. An in-memory index
+(rebuilt from disk at startup, using mtime as last access) tracks sizes
+and access times. A background janitor drops expired blobs and, while
+the directory is over max_bytes, the least recently used ones.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from typing import Dict, Optional
+
+
+class _Entry:
+    __slots__ = ("path", "size", "atime")
+
+    def __init__(self, path: str, size: int, atime: float):
+        self.path = path
+        self.size = size
+        self.atime = atime
+
+
+class BlobStore:
+    def __init__(self, directory: str, max_bytes: int = 2 * 1024 ** 3,
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600, janitor_interval: float = 60.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.janitor_interval = janitor_interval
+        self._lock = threading.Lock()
+        self._index: Dict[str, _Entry] = {}
+        self._bytes = 0
+        self._stop = threading.Event()
+        self._janitor: Optional[threading.Thread] = None
+        self.counters = {"puts": 0, "hits": 0, "misses": 0, "evicted_lru": 0, "evicted_ttl": 0}
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    # ----------------------
+    # Blob access
+    # ----------------------
+    def put(self, data: bytes, key: Optional[str] = None, ext: str = "") -> str:
+        """Store data under key (default: its SHA-256) and return the key."""
+        key = key or hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.directory, key[:2], key + ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            old = self._index.get(key)
+            if old is not None:
+                self._bytes -= old.size
+                if old.path != path:
+                    self._unlink(old.path)
+            self._index[key] = _Entry(path, len(data), time.time())
+            self._bytes += len(data)
+            self.counters["puts"] += 1
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # Removed behind our back (e.g. by hand); forget it
+            with self._lock:
+                entry = self._index.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry.size
+            return None
+
+    def path(self, key: str) -> Optional[str]:
+        """Path of a live blob, marking it as recently used; None if absent or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or self._expired(entry, now):
+                self.counters["misses"] += 1
+                return None
+            entry.atime = now
+            self.counters["hits"] += 1
+            path = entry.path
+        try:
+            os.utime(path, (now, now))  # persist recency across restarts
+        except OSError:
+            pass
+        return path
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            entry = self._index.get(key)
+            return entry is not None and not self._expired(entry, time.time())
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+                self._unlink(entry.path)
+
+    # ----------------------
+    # Eviction
+    # ----------------------
+    def evict(self) -> int:
+        """Drop expired blobs, then LRU blobs until under max_bytes; returns how many went."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for key in [k for k, e in self._index.items() if self._expired(e, now)]:
+                self._remove(key)
+                self.counters["evicted_ttl"] += 1
+                removed += 1
+            if self._bytes > self.max_bytes:
+                for key in sorted(self._index, key=lambda k: self._index[k].atime):
+                    if self._bytes <= self.max_bytes:
+                        break
+                    self._remove(key)
+                    self.counters["evicted_lru"] += 1
+                    removed += 1
+        return removed
+
+    def start_janitor(self) -> "BlobStore":
+        if self._janitor is None:
+            self._janitor = threading.Thread(target=self._janitor_loop, daemon=True,
+                                             name=f"blob-janitor-{os.path.basename(self.directory)}")
+            self._janitor.start()
+        return self
+
+    def stop_janitor(self) -> None:
+        self._stop.set()
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "usage": round(self._bytes / self.max_bytes, 4) if self.max_bytes else None,
+                "files": len(self._index),
+                "ttl_seconds": self.ttl_seconds,
+                **self.counters,
+            }
+
+    # ----------------------
+    # Internals
+    # ----------------------
+    def _janitor_loop(self):
+        while not self._stop.wait(self.janitor_interval):
+            try:
+                self.evict()
+            except Exception as e:
+                print(f"[WARN] Blob janitor failed for {self.directory}: {e}")
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry.atime > self.ttl_seconds
+
+    def _remove(self, key: str) -> None:
+        # Caller holds the lock
+        entry = self._index.pop(key)
+        self._bytes -= entry.size
+        self._unlink(entry.path)
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _scan(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    self._unlink(path)  # left over from a crash mid-write
+                    continue
+                st = os.stat(path)
+                key = os.path.splitext(name)[0]
+                self._index[key] = _Entry(path, st.st_size, st.st_mtime)
+                self._bytes += st.st_size
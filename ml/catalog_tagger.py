@@ -0,0 +1,231 @@
+# catalog_tagger.py
+"""
+Bulk color/style/season tagging for the product catalog CSV.
+
+Streams the catalog, deduplicates identical descriptions, packs several
+descriptions into each Gemini call and runs the calls concurrently. Finished
+batches are appended to a checkpoint file so an interrupted run resumes where
+it stopped. Descriptions that still fail after retries are not checkpointed,
+so the next run tries them again.
+
+Usage:
+    python catalog_tagger.py --input ../Myntra_hackerramp/myntra_products_catalog.csv \\
+        --output catalog_tags.jsonl --batch-size 20 --workers 8
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from colour_mapper import ColorMapper
+
+DEFAULT_INPUT = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "Myntra_hackerramp", "myntra_products_catalog.csv"
+))
+
+# USD per 1M tokens for gemini-1.5-flash
+DEFAULT_PRICE_IN = 0.075
+DEFAULT_PRICE_OUT = 0.30
+
+csv.field_size_limit(sys.maxsize)
+
+
+# ==========================
+# CSV streaming
+# ==========================
+def normalize_description(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip())
+
+
+def description_key(text: str) -> str:
+    return hashlib.sha1(normalize_description(text).lower().encode("utf-8")).hexdigest()
+
+
+def iter_catalog(path: str, id_col: str, text_col: str) -> Iterator[Tuple[str, str]]:
+    """Yield (product_id, description) rows without loading the whole file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row.get(id_col, ""), row.get(text_col, "") or ""
+
+
+# ==========================
+# Checkpoint
+# ==========================
+def load_checkpoint(path: str) -> Dict[str, Dict[str, str]]:
+    """Read finished description tags; a torn last line from a crash is skipped."""
+    done: Dict[str, Dict[str, str]] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            done[entry["key"]] = entry["tags"]
+    return done
+
+
+def append_checkpoint(f, keys: List[str], tags: List[Dict[str, str]]) -> None:
+    for key, tag in zip(keys, tags):
+        f.write(json.dumps({"key": key, "tags": tag}) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# ==========================
+# Tagging
+# ==========================
+def tag_batch(mapper: ColorMapper, texts: List[str], retries: int) -> List[Optional[Dict[str, str]]]:
+    """Tag one batch, retrying with backoff and falling back to single calls; None where tagging failed."""
+    for attempt in range(retries):
+        try:
+            return mapper.map_all_tags_batch(texts)
+        except Exception as e:
+            print(f"[WARN] Batch of {len(texts)} failed (attempt {attempt + 1}): {e}")
+            time.sleep(2 ** attempt)
+
+    # map_all_tags() would hide errors behind default tags, so go through the batch call
+    tags: List[Optional[Dict[str, str]]] = []
+    for text in texts:
+        try:
+            tags.append(mapper.map_all_tags_batch([text])[0])
+        except Exception as e:
+            print(f"[WARN] Description failed, left for the next run: {e}")
+            tags.append(None)
+    return tags
+
+
+def run_tagging(mapper: ColorMapper, pending: Dict[str, str], checkpoint_path: str,
+                batch_size: int, workers: int, retries: int) -> Tuple[Set[str], Set[str]]:
+    """Tag pending descriptions; returns (tagged, failed) description keys."""
+    keys = list(pending)
+    tagged: Set[str] = set()
+    failed: Set[str] = set()
+    batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+    total = len(batches)
+    finished = 0
+
+    with open(checkpoint_path, "a", encoding="utf-8") as ckpt, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+        batch_iter = iter(batches)
+        while True:
+            # Keep at most 2x workers batches queued so memory stays bounded
+            while len(in_flight) < workers * 2:
+                batch = next(batch_iter, None)
+                if batch is None:
+                    break
+                texts = [pending[k] for k in batch]
+                in_flight[pool.submit(tag_batch, mapper, texts, retries)] = batch
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                batch = in_flight.pop(fut)
+                results = list(zip(batch, fut.result()))
+                ok = [(k, t) for k, t in results if t is not None]
+                append_checkpoint(ckpt, [k for k, _ in ok], [t for _, t in ok])
+                tagged.update(k for k, _ in ok)
+                failed.update(k for k, t in results if t is None)
+                finished += 1
+                if finished % 10 == 0 or finished == total:
+                    print(f"[INFO] {finished}/{total} batches tagged")
+    return tagged, failed
+
+
+# ==========================
+# Output
+# ==========================
+def write_results(input_path: str, output_path: str, id_col: str, text_col: str,
+                  tags_by_key: Dict[str, Dict[str, str]]) -> int:
+    fallback = {"color": "Unknown", "style": "Casual", "season": "All-season"}
+
+    def rows():
+        for product_id, text in iter_catalog(input_path, id_col, text_col):
+            tags = tags_by_key.get(description_key(text), fallback) if text.strip() else fallback
+            yield {"product_id": product_id, **tags}
+
+    count = 0
+    if output_path.endswith(".parquet"):
+        import pandas as pd
+        records = list(rows())
+        pd.DataFrame(records).to_parquet(output_path, index=False)
+        return len(records)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        for record in rows():
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-tag the product catalog with Gemini.")
+    parser.add_argument("--input", default=DEFAULT_INPUT)
+    parser.add_argument("--output", default="catalog_tags.jsonl",
+                        help="Output file, .jsonl or .parquet")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file (default: <output>.ckpt.jsonl)")
+    parser.add_argument("--id-column", default="ProductID")
+    parser.add_argument("--text-column", default="Description")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--price-in", type=float, default=DEFAULT_PRICE_IN,
+                        help="USD per 1M prompt tokens")
+    parser.add_argument("--price-out", type=float, default=DEFAULT_PRICE_OUT,
+                        help="USD per 1M output tokens")
+    args = parser.parse_args(argv)
+
+    checkpoint_path = args.checkpoint or args.output + ".ckpt.jsonl"
+    mapper = ColorMapper()
+    if not mapper.model:
+        raise SystemExit("GEMINI_API_KEY is required for bulk tagging")
+
+    start = time.perf_counter()
+    done = load_checkpoint(checkpoint_path)
+    pending: Dict[str, str] = {}
+    pending_rows: Dict[str, int] = {}
+    total_rows = 0
+    for _, text in iter_catalog(args.input, args.id_column, args.text_column):
+        total_rows += 1
+        if not text.strip():
+            continue
+        key = description_key(text)
+        if key not in done:
+            pending.setdefault(key, normalize_description(text))
+            pending_rows[key] = pending_rows.get(key, 0) + 1
+
+    print(f"[INFO] {total_rows} rows, {len(done)} descriptions already tagged, "
+          f"{len(pending)} to tag")
+
+    tagged, failed = run_tagging(mapper, pending, checkpoint_path, args.batch_size, args.workers, args.retries)
+    # Rows resumed from earlier runs cost nothing now, so rates use this run's rows only
+    rows_tagged = sum(pending_rows[k] for k in tagged)
+    written = write_results(args.input, args.output, args.id_column, args.text_column,
+                            load_checkpoint(checkpoint_path))
+
+    elapsed = time.perf_counter() - start
+    usage = mapper.usage
+    cost = (usage["prompt_tokens"] * args.price_in
+            + usage["output_tokens"] * args.price_out) / 1_000_000
+    print(f"[INFO] Wrote {written} rows to {args.output}")
+    if failed:
+        print(f"[WARN] {len(failed)} descriptions failed and have default tags; rerun to retry them")
+    print(f"[INFO] {rows_tagged} rows tagged this run in {elapsed:.1f}s, {rows_tagged / elapsed:.1f} rows/s, "
+          f"{usage['calls']} model calls")
+    print(f"[INFO] Tokens: {usage['prompt_tokens']} in / {usage['output_tokens']} out, "
+          f"${cost:.4f} total, ${cost / max(rows_tagged, 1) * 1000:.4f} per 1k rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,54 @@
+import os
+import hashlib
+import threading
 from flask import Flask, jsonify, request
 import pandas as pd
-from pymongo import MongoClient
-from sentence_transformers import SentenceTransformer, util
-import spacy
 
+from embeddings import load_encoder, top_k
+from instrumentation import instrument_app, span, set_service, CATALOG_SIZE
+from lifecycle import Warmup, add_health_routes
+from serialization import json_response, project, requested_fields
+from near_duplicates import NearDuplicateIndex, first_per_cluster
+
+SERVICE = "trending"
+set_service(SERVICE)
 app = Flask(__name__)  # fix: __name__
+instrument_app(app, SERVICE)
+
+# Filled in by _load() during warmup (see lifecycle.py)
+db = None
+nlp = None
+model = None
+
+
+def _load():
+    global db, nlp, model
+    from pymongo import MongoClient
+    import spacy
+
+    # ================== Step 1: Connect to MongoDB ==================
+    client = MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017/"))  # Update if using Atlas
+    db = client[os.getenv("MONGO_DB", "myntra-clone")]  # database name
+
+    # ================== Step 2: Load Models ==================
+    nlp = spacy.load("en_core_web_sm")  # for keyword extraction
+    model = load_encoder('all-MiniLM-L6-v2', service=SERVICE)  # for semantic search
 
-# ================== Step 1: Connect to MongoDB ==================
-client = MongoClient("mongodb://localhost:27017/")  # Update if using Atlas
-db = client["myntra-clone"]  # database name
 
-# ================== Step 2: Load Models ==================
-nlp = spacy.load("en_core_web_sm")  # for keyword extraction
-model = SentenceTransformer('all-MiniLM-L6-v2')  # for semantic search
+warmup = Warmup(SERVICE, _load)
+
+# One index per catalog snapshot: reused while the fetched products are unchanged,
+# rebuilt when any is added, edited or deleted, so no stale ids or clusters linger
+near_duplicates = NearDuplicateIndex()
+near_duplicates_snapshot = None
+near_duplicates_lock = threading.Lock()
+add_health_routes(app, warmup)
 
 # ================== Step 3: Helper Functions ==================
 def get_trending_products(top_n=10):
-    cursor = db["products"].find({})
-    df = pd.DataFrame(list(cursor))
+    warmup.ensure()
+    with span("mongo_fetch"):
+        df = pd.DataFrame(list(db["products"].find({})))
     if df.empty:
         return []
 
@@ -29,7 +60,8 @@ def get_trending_products(top_n=10):
     df['mrp'] = pd.to_numeric(df['initial_price'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
     df['discount'] = pd.to_numeric(df['discount'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
 
-    df_ranked = df.sort_values(by=['discount', 'price'], ascending=[False, True])
+    with span("ranking"):
+        df_ranked = df.sort_values(by=['discount', 'price'], ascending=[False, True])
     top_products = df_ranked.head(top_n).copy()
     top_products['score'] = 1.0
 
@@ -41,8 +73,9 @@ def get_trending_products(top_n=10):
 
 
 def get_trending_insta(top_n=10):
-    cursor = db["instagram_posts"].find({})
-    df = pd.DataFrame(list(cursor))
+    warmup.ensure()
+    with span("mongo_fetch"):
+        df = pd.DataFrame(list(db["instagram_posts"].find({})))
     if df.empty:
         return []
 
@@ -51,7 +84,8 @@ def get_trending_insta(top_n=10):
     df = df.dropna(subset=['username', 'post_url', 'caption', 'likes'])
     df['likes'] = pd.to_numeric(df['likes'], errors='coerce')
 
-    df_ranked = df.sort_values(by='likes', ascending=False)
+    with span("ranking"):
+        df_ranked = df.sort_values(by='likes', ascending=False)
     top_posts = df_ranked.head(top_n).copy()
     top_posts['score'] = 1.0
 
@@ -65,41 +99,68 @@ def extract_keywords(captions):
     """
     Extract fashion-related keywords from captions using spaCy.
     """
+    warmup.ensure()
     fashion_keywords = []
     fashion_terms = ["dress", "makeup", "jewellery", "shoes", "bag", "fashionista", "outfit", "style"]
 
-    for caption in captions:
-        doc = nlp(caption.lower())
-        for token in doc:
-            if token.lemma_ in fashion_terms:
-                fashion_keywords.append(token.lemma_)
+    with span("keyword_extract"):
+        for caption in captions:
+            doc = nlp(caption.lower())
+            for token in doc:
+                if token.lemma_ in fashion_terms:
+                    fashion_keywords.append(token.lemma_)
     return list(set(fashion_keywords))
 
 
+def near_duplicate_index(keys, texts):
+    """Near-duplicate index for exactly this catalog snapshot."""
+    global near_duplicates, near_duplicates_snapshot
+    digest = hashlib.blake2b(digest_size=16)
+    for key, text in zip(keys, texts):
+        digest.update(f"{key}\0{text}\0".encode())
+    snapshot = digest.digest()
+    with near_duplicates_lock:
+        if snapshot != near_duplicates_snapshot:
+            near_duplicates = NearDuplicateIndex().add_many(zip(keys, texts))
+            near_duplicates_snapshot = snapshot
+        return near_duplicates
+
+
 def semantic_search_products(keywords, top_n=10):
     """
     Perform semantic search on Myntra products based on keywords.
     """
     if not keywords:
         return []
+    warmup.ensure()
 
     keyword_text = " ".join(keywords)
-    query_embedding = model.encode(keyword_text, convert_to_tensor=True)
+    with span("encode_query"):
+        query_embedding = model.encode(keyword_text, normalize_embeddings=True)
 
-    cursor = db["products"].find({})
-    products = list(cursor)
+    with span("mongo_fetch"):
+        products = list(db["products"].find({}))
     if not products:
         return []
+    CATALOG_SIZE.set(len(products), service=SERVICE)
 
     product_texts = [p['title'] + " " + p.get('product_description', '') for p in products]
-    embeddings = model.encode(product_texts, convert_to_tensor=True)
-
-    cos_scores = util.cos_sim(query_embedding, embeddings)[0]
-    top_results = cos_scores.topk(top_n)
-    results = [products[idx] for idx in top_results[1]]
+    keys = [str(p["_id"]) for p in products]
+    with span("near_duplicates"):
+        index = near_duplicate_index(keys, product_texts)
+        # Only one product per near-duplicate cluster is encoded and ranked
+        distinct = first_per_cluster(index, keys)
+
+    with span("encode_catalog"):
+        embeddings = model.encode([product_texts[i] for i in distinct], normalize_embeddings=True)
+
+    with span("similarity_scan"):
+        top_results = top_k(query_embedding, embeddings, top_n)
+    results = [products[distinct[idx]] for idx in top_results.tolist()]
     # Convert ObjectId to string
     for r in results:
         r["_id"] = str(r["_id"])
+        r["variant_count"] = index.cluster_size(r["_id"]) - 1
     return results
 
 
@@ -122,8 +183,9 @@ def trending_insta():
 @app.route("/trending_fashion", methods=["GET"])
 def trending_fashion():
     top_n = int(request.args.get("n", 10))
-    cursor = db["instagram_posts"].find({})
-    df_insta = pd.DataFrame(list(cursor))
+    warmup.ensure()
+    with span("mongo_fetch"):
+        df_insta = pd.DataFrame(list(db["instagram_posts"].find({})))
     if df_insta.empty:
         return jsonify({"count": 0, "keywords": [], "results": []})
 
@@ -132,9 +194,11 @@ def trending_fashion():
     if not keywords:
         return jsonify({"count": 0, "keywords": [], "results": []})
 
-    results = semantic_search_products(keywords, top_n=top_n)
-    return jsonify({"count": len(results), "keywords": keywords, "results": results})
+    results = project(semantic_search_products(keywords, top_n=top_n), requested_fields(request))
+    return json_response({"count": len(results), "keywords": keywords, "results": results})
+
 
+warmup.start_from_env()
 
 # ================== Step 5: Run Flask ==================
 if __name__ == "__main__":  # fix: __name__ and "__main__"
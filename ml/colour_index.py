@@ -0,0 +1,196 @@
+# colour_index.py
+"""
+Perceptual colour-similarity index over the product catalog.
+
+Every product gets a CIELAB vector from its PrimaryColor (through map_color).
+Products sharing a colour are grouped, and the distinct colours are bucketed
+in a uniform 3-D grid so "within ΔE of #800000" only looks at nearby cells.
+
+Usage (synthetic latency check):
+    python colour_index.py --bench 100000
+"""
+
+import os
+import time
+import argparse
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from colour_space import hex_to_rgb, rgb_to_hex, rgb_to_lab
+
+DEFAULT_CATALOG = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "Myntra_hackerramp", "myntra_products_catalog.csv"
+))
+
+# Families map_color returns when it could not resolve a colour
+UNRESOLVED_FAMILIES = {"Other", "Unknown"}
+
+
+class ColourIndex:
+    """Grid index of distinct CIELAB colours with per-colour product postings."""
+
+    def __init__(self, lab: np.ndarray, products: List[Dict[str, object]], cell_size: float = 8.0):
+        lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+        if len(lab) != len(products):
+            raise ValueError("lab and products must have the same length")
+        self.products = products
+        self.cell_size = cell_size
+
+        self.colours, inverse = np.unique(np.round(lab, 2), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        self._postings = np.argsort(inverse, kind="stable")
+        self._bounds = np.searchsorted(inverse[self._postings], np.arange(len(self.colours) + 1))
+
+        cells = np.floor(self.colours / cell_size).astype(np.int64)
+        grid: Dict[Tuple[int, int, int], List[int]] = {}
+        for colour_id, cell in enumerate(map(tuple, cells)):
+            grid.setdefault(cell, []).append(colour_id)
+        self._grid = {cell: np.array(ids) for cell, ids in grid.items()}
+
+    def __len__(self):
+        return len(self.products)
+
+    # ----------------------
+    # Candidate selection
+    # ----------------------
+    def _candidate_colours(self, lab: np.ndarray, radius: float) -> np.ndarray:
+        reach = int(np.ceil(radius / self.cell_size))
+        # Probing more cells than are occupied is slower than a full scan
+        if (2 * reach + 1) ** 3 >= len(self._grid):
+            return np.arange(len(self.colours))
+
+        cx, cy, cz = np.floor(lab / self.cell_size).astype(np.int64)
+        found = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                for dz in range(-reach, reach + 1):
+                    ids = self._grid.get((cx + dx, cy + dy, cz + dz))
+                    if ids is not None:
+                        found.append(ids)
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def _colour_hits(self, lab: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = self._candidate_colours(lab, radius)
+        dist = np.linalg.norm(self.colours[candidates] - lab, axis=1)
+        keep = dist <= radius
+        candidates, dist = candidates[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return candidates[order], dist[order]
+
+    def _expand(self, colour_ids: np.ndarray, dist: np.ndarray, limit: Optional[int]) -> List[Dict[str, object]]:
+        results = []
+        for colour_id, delta_e in zip(colour_ids, dist):
+            start, end = self._bounds[colour_id], self._bounds[colour_id + 1]
+            for idx in self._postings[start:end]:
+                results.append({**self.products[idx], "delta_e": round(float(delta_e), 3)})
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+    # ----------------------
+    # Queries
+    # ----------------------
+    def within(self, hex_code: str, max_delta_e: float, limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """Products whose colour is within max_delta_e (ΔE76) of hex_code, closest first."""
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        lab = rgb_to_lab(np.array(hex_to_rgb(hex_code)))
+        return self._expand(*self._colour_hits(lab, max_delta_e), limit)
+
+    def nearest(self, hex_code: str, k: int = 20) -> List[Dict[str, object]]:
+        """The k products closest in colour to hex_code."""
+        if k < 1:
+            raise ValueError(f"top_k must be at least 1, got {k}")
+        lab = rgb_to_lab(np.array(hex_to_rgb(hex_code)))
+        radius = self.cell_size
+        while True:
+            colour_ids, dist = self._colour_hits(lab, radius)
+            total = int(np.sum(self._bounds[colour_ids + 1] - self._bounds[colour_ids]))
+            # ΔE never exceeds ~375 in CIELAB, so the loop always terminates
+            if total >= k or radius > 400:
+                return self._expand(colour_ids, dist, k)
+            radius *= 2
+
+    def complementary(self, hex_code: str, k: int = 20) -> List[Dict[str, object]]:
+        """Nearest products to the complementary colour (hue rotated 180° in CIELAB)."""
+        l, a, b = rgb_to_lab(np.array(hex_to_rgb(hex_code)))
+        return self.nearest(lab_to_hex(np.array([l, -a, -b])), k)
+
+
+def lab_to_hex(lab: np.ndarray) -> str:
+    """Inverse of rgb_to_lab for a single colour, clipped to the sRGB gamut."""
+    l, a, b = lab
+    fy = (l + 16) / 116
+    f = np.array([fy + a / 500, fy, fy - b / 200])
+    xyz = np.where(f ** 3 > 216 / 24389, f ** 3, (116 * f - 16) / (24389 / 27))
+    xyz = xyz * np.array([0.95047, 1.0, 1.08883])
+    linear = np.array([
+        [3.2404542, -1.5371385, -0.4985314],
+        [-0.9692660, 1.8760108, 0.0415560],
+        [0.0556434, -0.2040259, 1.0572252],
+    ]) @ xyz
+    linear = np.clip(linear, 0, 1)
+    srgb = np.where(linear > 0.0031308, 1.055 * linear ** (1 / 2.4) - 0.055, 12.92 * linear)
+    return rgb_to_hex(srgb * 255)
+
+
+# ==========================
+# Building from the catalog
+# ==========================
+def build_catalog_index(map_color: Callable[[str], Tuple[str, str]],
+                        csv_path: str = DEFAULT_CATALOG) -> ColourIndex:
+    """Index every catalog product whose PrimaryColor map_color can resolve."""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, usecols=["ProductID", "ProductName", "PrimaryColor"])
+    df["PrimaryColor"] = df["PrimaryColor"].fillna("").astype(str).str.strip()
+
+    # map_color is cached, but resolving each distinct name once keeps the LLM out of the loop
+    resolved = {name: map_color(name) for name in df["PrimaryColor"].unique()}
+    df["family"] = df["PrimaryColor"].map(lambda n: resolved[n][0])
+    df["hex"] = df["PrimaryColor"].map(lambda n: resolved[n][1])
+    df = df[~df["family"].isin(UNRESOLVED_FAMILIES)]
+
+    lab = rgb_to_lab(np.array([hex_to_rgb(h) for h in df["hex"]]).reshape(-1, 3))
+    products = [
+        {"product_id": str(pid), "name": name, "primary_color": color, "family": family, "hex": hex_code}
+        for pid, name, color, family, hex_code in zip(
+            df["ProductID"], df["ProductName"], df["PrimaryColor"], df["family"], df["hex"]
+        )
+    ]
+    return ColourIndex(lab, products)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark colour index queries on a synthetic catalog.")
+    parser.add_argument("--bench", type=int, default=100_000, help="Number of synthetic products")
+    parser.add_argument("--colours", type=int, default=5_000, help="Distinct colours in the catalog")
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, size=(args.colours, 3))
+    rgb = palette[rng.integers(0, args.colours, size=args.bench)]
+    products = [{"product_id": str(i)} for i in range(args.bench)]
+
+    start = time.perf_counter()
+    index = ColourIndex(rgb_to_lab(rgb), products)
+    print(f"[INFO] Built index over {len(index)} products in {time.perf_counter() - start:.2f}s")
+
+    queries = [rgb_to_hex(c) for c in rng.integers(0, 256, size=(args.queries, 3))]
+    for name, fn in [("within dE<=10", lambda h: index.within(h, 10, limit=50)),
+                     ("nearest k=20", lambda h: index.nearest(h, 20)),
+                     ("complementary k=20", lambda h: index.complementary(h, 20))]:
+        timings = []
+        for h in queries:
+            t0 = time.perf_counter()
+            fn(h)
+            timings.append(time.perf_counter() - t0)
+        timings = np.array(timings) * 1000
+        print(f"[INFO] {name}: p50 {np.percentile(timings, 50):.3f} ms, "
+              f"p99 {np.percentile(timings, 99):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,29 +6,52 @@ Flask API service for color and clothing tag mapping using ColorMapper.
 import os
 import re
 import json
-from typing import Dict, Tuple, Optional
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
 from functools import lru_cache
 from flask import Flask, request, jsonify
 
+from colour_space import COLOR_DICT
+from fake_genai import use_fake_backend, fake_model_from_env
+from instrumentation import instrument_app, span, cache_event, watch_lru
+from lifecycle import Warmup, add_health_routes
+
+# Per-method LRU size; benchmarks vary it through the environment
+CACHE_SIZE = int(os.getenv("COLOR_MAPPER_CACHE_SIZE", "256"))
+
 # ==========================
 # ColorMapper implementation
 # ==========================
-try:
-    import google.generativeai as genai
-    from google.generativeai.types import HarmCategory, HarmBlockThreshold
-except ImportError:
-    genai = None
+def _import_genai():
+    """The Gemini SDK takes about a second to import; only pay for it when a key is set."""
+    try:
+        import google.generativeai as genai
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+    except ImportError:
+        return None, None, None
+    return genai, HarmCategory, HarmBlockThreshold
 
 
 class ColorMapper:
     """Color mapper using Gemini API for intelligent color standardization."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, model=None):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.model_name = "gemini-1.5-flash"
-        self.model = None
-
-        if genai and self.api_key:
+        self.model = model
+        self.usage = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+        self._usage_lock = threading.Lock()
+        self._async_cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._inflight: Dict[tuple, "asyncio.Future"] = {}
+
+        genai = None
+        if self.model is None and self.api_key:
+            genai, HarmCategory, HarmBlockThreshold = _import_genai()
+        if self.model is not None:
+            print(f"[INFO] Using injected model {type(self.model).__name__}.")
+        elif genai and self.api_key:
             try:
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel(
@@ -52,52 +75,26 @@ class ColorMapper:
             print("[INFO] Gemini not available. Using fallback mapping.")
 
         # Fallback dictionary
-        self.color_dict: Dict[str, Tuple[str, str]] = {
-            "red": ("Red", "#FF0000"),
-            "blue": ("Blue", "#0000FF"),
-            "green": ("Green", "#008000"),
-            "yellow": ("Yellow", "#FFFF00"),
-            "orange": ("Orange", "#FFA500"),
-            "purple": ("Purple", "#800080"),
-            "pink": ("Pink", "#FFC0CB"),
-            "brown": ("Brown", "#A52A2A"),
-            "black": ("Black", "#000000"),
-            "white": ("White", "#FFFFFF"),
-            "grey": ("Grey", "#808080"),
-            "gray": ("Grey", "#808080"),
-        }
-
-    @lru_cache(maxsize=256)
+        self.color_dict: Dict[str, Tuple[str, str]] = dict(COLOR_DICT)
+
+    @lru_cache(maxsize=CACHE_SIZE)
     def map_color(self, color_name: str) -> Tuple[str, str]:
         """Map a subjective color name to (family, hex)."""
         color_name = color_name.strip().lower()
-        if not color_name:
-            return ("Unknown", "#808080")
-
-        for key, val in self.color_dict.items():
-            if key in color_name:
-                return val
-
-        if not self.model:
-            return ("Other", "#808080")
+        local = self._local_color(color_name)
+        if local is not None:
+            return local
 
         try:
-            prompt = f"""
-            Standardize this color name into a JSON object:
-            - family: one of {list(set(v[0] for v in self.color_dict.values()))}
-            - hex: approximate HEX code
-            Color name: "{color_name}"
-            Example: {{"family": "Blue", "hex": "#0000FF"}}
-            """
-            response = self.model.generate_content(prompt)
-            text = self._clean_response(response.text)
-            data = json.loads(text)
-            return (data.get("family", "Other"), data.get("hex", "#808080"))
+            with span("llm_call"):
+                response = self.model.generate_content(self._color_prompt(color_name))
+            self._record_usage(response)
+            return self._parse_color(response.text)
         except Exception as e:
             print(f"[WARN] Gemini error: {e}")
             return ("Other", "#808080")
 
-    @lru_cache(maxsize=256)
+    @lru_cache(maxsize=CACHE_SIZE)
     def map_season(self, description: str) -> str:
         """Classify into season."""
         if not description.strip():
@@ -111,34 +108,181 @@ class ColorMapper:
             Respond with one word.
             Description: "{description}"
             """
-            response = self.model.generate_content(prompt)
+            with span("llm_call"):
+                response = self.model.generate_content(prompt)
+            self._record_usage(response)
             text = self._clean_response(response.text)
             return text.strip().capitalize()
         except Exception as e:
             print(f"[WARN] Gemini error: {e}")
             return "All-season"
 
-    @lru_cache(maxsize=256)
+    @lru_cache(maxsize=CACHE_SIZE)
     def map_all_tags(self, description: str) -> Dict[str, str]:
         """Extract color, style, and season tags."""
+        local = self._local_tags(description)
+        if local is not None:
+            return local
+
+        try:
+            with span("llm_call"):
+                response = self.model.generate_content(self._tags_prompt(description))
+            self._record_usage(response)
+            return json.loads(self._clean_response(response.text))
+        except Exception as e:
+            print(f"[WARN] Gemini error: {e}")
+            return {"color": "Other", "style": "Casual", "season": "All-season"}
+
+    # ----------------------
+    # Async variants (ASGI service)
+    # ----------------------
+    async def amap_color(self, color_name: str) -> Tuple[str, str]:
+        """Non-blocking map_color; concurrent requests for one name share a call."""
+        color_name = color_name.strip().lower()
+        local = self._local_color(color_name)
+        if local is not None:
+            return local
+        return await self._cached_async(("color", color_name), self._agenerate_color, color_name)
+
+    async def amap_all_tags(self, description: str) -> Dict[str, str]:
+        """Non-blocking map_all_tags."""
+        local = self._local_tags(description)
+        if local is not None:
+            return local
+        return await self._cached_async(("tags", description), self._agenerate_tags, description)
+
+    async def _agenerate_color(self, color_name: str) -> Tuple[str, str]:
+        try:
+            with span("llm_call"):
+                response = await self.model.generate_content_async(self._color_prompt(color_name))
+            self._record_usage(response)
+            return self._parse_color(response.text)
+        except Exception as e:
+            print(f"[WARN] Gemini error: {e}")
+            return ("Other", "#808080")
+
+    async def _agenerate_tags(self, description: str) -> Dict[str, str]:
+        try:
+            with span("llm_call"):
+                response = await self.model.generate_content_async(self._tags_prompt(description))
+            self._record_usage(response)
+            return json.loads(self._clean_response(response.text))
+        except Exception as e:
+            print(f"[WARN] Gemini error: {e}")
+            return {"color": "Other", "style": "Casual", "season": "All-season"}
+
+    async def _cached_async(self, key, fn, *args):
+        """LRU of CACHE_SIZE entries plus single-flight for in-progress keys."""
+        if key in self._async_cache:
+            self._async_cache.move_to_end(key)
+            cache_event("async_" + key[0], True)
+            return self._async_cache[key]
+        cache_event("async_" + key[0], False)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await pending
+
+        pending = asyncio.ensure_future(fn(*args))
+        self._inflight[key] = pending
+        try:
+            result = await pending
+        finally:
+            self._inflight.pop(key, None)
+        if CACHE_SIZE > 0:
+            self._async_cache[key] = result
+            if len(self._async_cache) > CACHE_SIZE:
+                self._async_cache.popitem(last=False)
+        return result
+
+    # ----------------------
+    # Prompts and local fallbacks
+    # ----------------------
+    def _local_color(self, color_name: str) -> Optional[Tuple[str, str]]:
+        """Answer from the dictionary when possible; None means ask the model."""
+        if not color_name:
+            return ("Unknown", "#808080")
+        for key, val in self.color_dict.items():
+            if key in color_name:
+                return val
+        if not self.model:
+            return ("Other", "#808080")
+        return None
+
+    def _local_tags(self, description: str) -> Optional[Dict[str, str]]:
         if not description.strip():
             return {"color": "Unknown", "style": "Casual", "season": "All-season"}
         if not self.model:
             return {"color": "Other", "style": "Casual", "season": "All-season"}
+        return None
 
-        try:
-            prompt = f"""
+    def _color_prompt(self, color_name: str) -> str:
+        return f"""
+            Standardize this color name into a JSON object:
+            - family: one of {list(set(v[0] for v in self.color_dict.values()))}
+            - hex: approximate HEX code
+            Color name: "{color_name}"
+            Example: {{"family": "Blue", "hex": "#0000FF"}}
+            """
+
+    def _tags_prompt(self, description: str) -> str:
+        return f"""
             Extract tags from this clothing description.
             Respond JSON: color, style, season
             Example: {{"color": "Blue", "style": "Casual", "season": "Summer"}}
             Description: "{description}"
             """
+
+    def _parse_color(self, text: str) -> Tuple[str, str]:
+        data = json.loads(self._clean_response(text))
+        return (data.get("family", "Other"), data.get("hex", "#808080"))
+
+    def map_all_tags_batch(self, descriptions: List[str]) -> List[Dict[str, str]]:
+        """Extract color, style, and season tags for several descriptions in one call."""
+        if not descriptions:
+            return []
+        if not self.model:
+            return [self.map_all_tags(d) for d in descriptions]
+
+        items = "\n".join(
+            f'{i}. "{d.strip()}"' for i, d in enumerate(descriptions)
+        )
+        prompt = f"""
+        Extract tags from each numbered clothing description.
+        Respond with a JSON array with one object per description, in the same order.
+        Each object has keys: id, color, style, season
+        Example: [{{"id": 0, "color": "Blue", "style": "Casual", "season": "Summer"}}]
+        Descriptions:
+        {items}
+        """
+        with span("llm_call"):
             response = self.model.generate_content(prompt)
-            text = self._clean_response(response.text)
-            return json.loads(text)
-        except Exception as e:
-            print(f"[WARN] Gemini error: {e}")
-            return {"color": "Other", "style": "Casual", "season": "All-season"}
+        self._record_usage(response)
+        data = json.loads(self._clean_response(response.text))
+        if not isinstance(data, list):
+            raise ValueError("Gemini batch response is not a JSON array")
+
+        by_id = {}
+        for entry in data:
+            if isinstance(entry, dict) and "id" in entry:
+                by_id[int(entry["id"])] = {
+                    "color": entry.get("color", "Other"),
+                    "style": entry.get("style", "Casual"),
+                    "season": entry.get("season", "All-season"),
+                }
+        if len(by_id) != len(descriptions):
+            raise ValueError(
+                f"Gemini batch response has {len(by_id)} tags for {len(descriptions)} descriptions"
+            )
+        return [by_id[i] for i in range(len(descriptions))]
+
+    def _record_usage(self, response) -> None:
+        """Accumulate call and token counts from a Gemini response."""
+        meta = getattr(response, "usage_metadata", None)
+        with self._usage_lock:
+            self.usage["calls"] += 1
+            if meta is not None:
+                self.usage["prompt_tokens"] += getattr(meta, "prompt_token_count", 0) or 0
+                self.usage["output_tokens"] += getattr(meta, "candidates_token_count", 0) or 0
 
     def _clean_response(self, text: str) -> str:
         """Remove markdown fences."""
@@ -153,12 +297,16 @@ class ColorMapper:
 
 # Singleton
 _color_mapper: Optional[ColorMapper] = None
+_color_mapper_lock = threading.Lock()
 
 
-def initialize_color_mapper(api_key: Optional[str] = None):
+def initialize_color_mapper(api_key: Optional[str] = None, model=None):
     global _color_mapper
-    if _color_mapper is None:
-        _color_mapper = ColorMapper(api_key=api_key)
+    with _color_mapper_lock:
+        if _color_mapper is None:
+            if model is None and use_fake_backend():
+                model = fake_model_from_env()
+            _color_mapper = ColorMapper(api_key=api_key, model=model)
 
 
 def map_color(color_name: str) -> Tuple[str, str]:
@@ -179,11 +327,44 @@ def map_all_tags(description: str) -> Dict[str, str]:
     return _color_mapper.map_all_tags(description)
 
 
+async def amap_color(color_name: str) -> Tuple[str, str]:
+    if _color_mapper is None:
+        initialize_color_mapper()
+    return await _color_mapper.amap_color(color_name)
+
+
+async def amap_all_tags(description: str) -> Dict[str, str]:
+    if _color_mapper is None:
+        initialize_color_mapper()
+    return await _color_mapper.amap_all_tags(description)
+
+
+_colour_index = None
+_colour_index_lock = threading.Lock()
+
+
+def get_colour_index():
+    """Build the catalog colour index on first use."""
+    global _colour_index
+    if _colour_index is None:
+        with _colour_index_lock:
+            if _colour_index is None:
+                from colour_index import build_catalog_index
+                _colour_index = build_catalog_index(map_color)
+    return _colour_index
+
+
 # ==========================
 # Flask API Service
 # ==========================
 app = Flask(__name__)
-initialize_color_mapper()  # Initialize on startup
+instrument_app(app, "colour_mapper")
+warmup = Warmup("colour_mapper", initialize_color_mapper)
+add_health_routes(app, warmup)
+warmup.start_from_env()  # Initialize on startup
+watch_lru("map_color", ColorMapper.map_color)
+watch_lru("map_season", ColorMapper.map_season)
+watch_lru("map_all_tags", ColorMapper.map_all_tags)
 
 @app.route("/map_colors", methods=["POST"])
 def map_colors_route():
@@ -201,6 +382,62 @@ def map_colors_route():
     return jsonify(results)
 
 
+@app.route("/match_colors", methods=["POST"])
+def match_colors_route():
+    """Find catalog products near (or complementary to) a colour."""
+    data = request.get_json()
+    hex_code = data.get("hex")
+    if not hex_code and data.get("color"):
+        hex_code = map_color(data["color"])[1]
+    if not hex_code:
+        return jsonify({"error": "Provide a hex code or a color name"}), 400
+
+    mode = data.get("mode", "nearest")
+    try:
+        top_k = int(data.get("top_k", 20))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k must be an integer"}), 400
+    if top_k < 1:
+        return jsonify({"error": "top_k must be at least 1"}), 400
+    index = get_colour_index()
+    try:
+        if mode == "nearest":
+            max_delta_e = data.get("max_delta_e")
+            if max_delta_e is not None:
+                products = index.within(hex_code, float(max_delta_e), limit=top_k)
+            else:
+                products = index.nearest(hex_code, top_k)
+        elif mode == "complementary":
+            products = index.complementary(hex_code, top_k)
+        else:
+            return jsonify({"error": "Mode must be 'nearest' or 'complementary'"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"hex": hex_code, "mode": mode, "count": len(products), "results": products})
+
+
+@app.route("/map_image_colors", methods=["POST"])
+def map_image_colors_route():
+    """Extract dominant colour families from an uploaded image, locally."""
+    if "image" not in request.files:
+        return jsonify({"error": "Image file is required"}), 400
+    try:
+        k = int(request.form.get("clusters", 4))
+    except ValueError:
+        return jsonify({"error": "clusters must be an integer"}), 400
+    if k < 1:
+        return jsonify({"error": "clusters must be at least 1"}), 400
+
+    from image_colour import extract_colors
+    try:
+        colors = extract_colors(request.files["image"].read(), k=k)
+    except Exception as e:
+        return jsonify({"error": f"Could not read image: {e}"}), 400
+    family, hex_code = (colors[0]["family"], colors[0]["hex"]) if colors else ("Unknown", "#808080")
+    return jsonify({"family": family, "hex": hex_code, "colors": colors})
+
+
 @app.route("/map_tags", methods=["POST"])
 def map_tags_route():
     """Map a clothing description to color, style, and season tags."""
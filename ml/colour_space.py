@@ -0,0 +1,66 @@
+# colour_space.py
+"""
+Shared colour tables and vectorized colour-space conversions.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Color name -> (family, hex); shared by the text and image colour engines
+COLOR_DICT: Dict[str, Tuple[str, str]] = {
+    "red": ("Red", "#FF0000"),
+    "blue": ("Blue", "#0000FF"),
+    "green": ("Green", "#008000"),
+    "yellow": ("Yellow", "#FFFF00"),
+    "orange": ("Orange", "#FFA500"),
+    "purple": ("Purple", "#800080"),
+    "pink": ("Pink", "#FFC0CB"),
+    "brown": ("Brown", "#A52A2A"),
+    "black": ("Black", "#000000"),
+    "white": ("White", "#FFFFFF"),
+    "grey": ("Grey", "#808080"),
+    "gray": ("Grey", "#808080"),
+}
+
+# D65 reference white
+_WHITE = np.array([0.95047, 1.0, 1.08883])
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+
+
+def hex_to_rgb(hex_code: str) -> Tuple[int, int, int]:
+    h = hex_code.strip().lstrip("#")
+    if len(h) == 3:
+        h = "".join(c * 2 for c in h)
+    if len(h) != 6:
+        raise ValueError(f"Invalid hex colour: {hex_code!r}")
+    return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+
+
+def rgb_to_hex(rgb) -> str:
+    r, g, b = (int(round(min(max(float(c), 0.0), 255.0))) for c in rgb)
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert an (..., 3) array of sRGB values in 0-255 to CIELAB."""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = c @ _RGB_TO_XYZ.T / _WHITE
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def family_palette() -> Tuple[List[Tuple[str, str]], np.ndarray]:
+    """Unique (family, hex) entries of COLOR_DICT and their CIELAB vectors."""
+    entries = list(dict.fromkeys(COLOR_DICT.values()))
+    lab = rgb_to_lab(np.array([hex_to_rgb(h) for _, h in entries]))
+    return entries, lab
@@ -0,0 +1,338 @@
+# embeddings.py
+"""
+Sentence-embedding backends behind the SentenceTransformer encode() interface.
+
+Services call load_encoder(name) instead of constructing SentenceTransformer
+directly, so the backend can be swapped per process with EMBEDDING_BACKEND,
+or per service with EMBEDDING_BACKEND_<SERVICE> (e.g.
+EMBEDDING_BACKEND_RECOMMENDATIONS=onnx-int8):
+
+    torch      SentenceTransformer on PyTorch (default)
+    onnx       the same transformer exported to ONNX, run by onnxruntime;
+               mean pooling and L2 normalisation are done in NumPy
+    onnx-int8  as onnx, with dynamically int8-quantized weights
+    fake       deterministic hashed bag-of-words vectors, no model download;
+               for offline benchmarks where the encoder is not under test
+
+Every backend returns NumPy arrays from encode(..., normalize_embeddings=True),
+so callers rank with top_k() (a matrix product and argpartition) instead of
+sentence_transformers.util.cos_sim and torch.topk. With that, the ONNX
+backends only import onnxruntime and tokenizers at serving time.
+The export itself needs torch and transformers. It runs once, on first
+use or ahead of time with
+
+    python embeddings.py export --quantize
+    python embeddings.py compare --catalog ../Myntra_hackerramp/myntra_products_catalog.csv
+
+and is cached under ONNX_MODEL_DIR.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import inspect
+import argparse
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join(HERE, "onnx_models"))
+# One inference runs on all cores; requests are not parallelised inside the session
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", str(os.cpu_count() or 1)))
+ONNX_INTER_OP_THREADS = int(os.getenv("ONNX_INTER_OP_THREADS", "1"))
+BACKENDS = ("torch", "onnx", "onnx-int8", "fake")
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class FakeEncoder:
+    """Hashes each token into a fixed-size vector and L2-normalises the sum."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for token in TOKEN_RE.findall(str(text).lower()):
+            h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, sentences: Union[str, List[str]], convert_to_tensor: bool = False,
+               convert_to_numpy: bool = True, **kwargs):
+        if isinstance(sentences, str):
+            out = self._vector(sentences)
+        else:
+            out = np.zeros((len(sentences), self.dim), dtype=np.float32)
+            for i, s in enumerate(sentences):
+                out[i] = self._vector(s)
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(out)
+        return out
+
+
+# ==========================
+# ONNX Runtime backend
+# ==========================
+def _hub_name(name: str) -> str:
+    return name if "/" in name else f"sentence-transformers/{name}"
+
+
+def onnx_model_dir(name: str) -> str:
+    return os.path.join(ONNX_MODEL_DIR, _hub_name(name).replace("/", "__"))
+
+
+def export_onnx(name: str = "all-MiniLM-L6-v2", quantize: bool = False, out_dir: Optional[str] = None) -> str:
+    """Export the transformer (without pooling) and its tokenizer; optionally add an int8 copy."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    out_dir = out_dir or onnx_model_dir(name)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, "model.onnx")
+
+    if not os.path.exists(path):
+        tokenizer = AutoTokenizer.from_pretrained(_hub_name(name))
+        model = AutoModel.from_pretrained(_hub_name(name)).eval()
+        tokenizer.save_pretrained(out_dir)
+
+        class LastHiddenState(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask, token_type_ids):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask,
+                                  token_type_ids=token_type_ids).last_hidden_state
+
+        sample = tokenizer(["a red silk saree", "cotton kurta"], padding=True, return_tensors="pt")
+        inputs = ("input_ids", "attention_mask", "token_type_ids")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        # The TorchScript exporter: dynamic_axes and opset 14 are its options, and the
+        # dynamo exporter (default in newer torch) would also need onnxscript
+        legacy = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+        with torch.no_grad():
+            torch.onnx.export(
+                LastHiddenState(model), tuple(sample[k] for k in inputs), tmp,
+                input_names=list(inputs), output_names=["last_hidden_state"],
+                dynamic_axes={k: {0: "batch", 1: "sequence"} for k in inputs + ("last_hidden_state",)},
+                opset_version=14, **legacy,
+            )
+        os.replace(tmp, path)
+        print(f"[INFO] Exported {name} to {path}")
+
+    int8_path = os.path.join(out_dir, "model_int8.onnx")
+    if quantize and not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        tmp = f"{int8_path}.{os.getpid()}.tmp"
+        quantize_dynamic(path, tmp, weight_type=QuantType.QInt8)
+        os.replace(tmp, int8_path)
+        print(f"[INFO] Quantized {name} to {int8_path}")
+    return out_dir
+
+
+class OnnxEncoder:
+    """MiniLM through onnxruntime: tokenize, run, mean-pool over the mask, L2-normalise."""
+
+    def __init__(self, name: str = "all-MiniLM-L6-v2", quantized: bool = False, model_dir: Optional[str] = None,
+                 max_seq_length: int = 256, batch_size: int = 64,
+                 intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = model_dir or onnx_model_dir(name)
+        path = os.path.join(model_dir, "model_int8.onnx" if quantized else "model.onnx")
+        if not os.path.exists(path):
+            export_onnx(name, quantize=quantized, out_dir=model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads or ONNX_INTRA_OP_THREADS
+        options.inter_op_num_threads = inter_op_threads or ONNX_INTER_OP_THREADS
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dim = self.session.get_outputs()[0].shape[-1]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+        self.batch_size = batch_size
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def _embed(self, batch: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(batch)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": np.array([e.ids for e in encodings], dtype=np.int64), "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        hidden = self.session.run(None, feeds)[0]
+
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: Optional[int] = None,
+               convert_to_tensor: bool = False, convert_to_numpy: bool = True, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else [str(s) for s in sentences]
+        batch_size = batch_size or self.batch_size
+
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        # Batches of similar length pad less
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            rows = order[start:start + batch_size]
+            out[rows] = self._embed([texts[i] for i in rows])
+
+        if single:
+            out = out[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(out)
+        return out
+
+
+# ==========================
+# Scoring
+# ==========================
+def top_k(query: np.ndarray, matrix: np.ndarray, k: int) -> np.ndarray:
+    """Rows of matrix with the highest dot product with query, best first.
+
+    For L2-normalised embeddings the dot product is the cosine similarity.
+    """
+    scores = np.asarray(matrix, dtype=np.float32) @ np.asarray(query, dtype=np.float32).reshape(-1)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    rows = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return rows[np.argsort(-scores[rows], kind="stable")]
+
+
+# ==========================
+# Backend selection
+# ==========================
+def backend_for(service: Optional[str] = None) -> str:
+    """EMBEDDING_BACKEND_<SERVICE>, then EMBEDDING_BACKEND, then torch."""
+    if service:
+        override = os.getenv(f"EMBEDDING_BACKEND_{service.upper()}")
+        if override:
+            return override.lower()
+    return os.getenv("EMBEDDING_BACKEND", "torch").lower()
+
+
+def load_encoder(name: str = "all-MiniLM-L6-v2", backend: Optional[str] = None, service: Optional[str] = None):
+    backend = (backend or backend_for(service)).lower()
+    if backend == "fake":
+        return FakeEncoder()
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(name)
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxEncoder(name, quantized=backend == "onnx-int8")
+    raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+
+# ==========================
+# Parity and speed against PyTorch
+# ==========================
+QUERIES = ["red silk saree", "cotton kurta for summer", "gold jhumkas", "black leather handbag",
+           "breathable linen shirt", "maroon lehenga with embroidery", "running shoes", "woollen winter jacket"]
+
+
+def read_texts(csv_path: str, limit: int) -> List[str]:
+    import csv
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        column = next(c for c in ("product_description", "Description", "ProductName") if c in reader.fieldnames)
+        texts = [row[column] for row in reader if row.get(column)]
+    return texts[:limit] if limit else texts
+
+
+def compare(texts: List[str], backends=("torch", "onnx", "onnx-int8"), name: str = "all-MiniLM-L6-v2",
+            top_k: int = 10, repeats: int = 50) -> Dict[str, Dict[str, float]]:
+    """Catalog throughput, single-query latency and cosine-score parity with the first backend.
+
+    Embeddings are L2-normalised, as the services request them, so the parity
+    numbers do not depend on the model having a Normalize layer.
+    """
+    results, reference = {}, None
+    for backend in backends:
+        encoder = load_encoder(name, backend=backend)
+        encoder.encode(texts[:32], normalize_embeddings=True)  # first call allocates
+
+        t0 = time.perf_counter()
+        catalog = np.asarray(encoder.encode(texts, batch_size=64, normalize_embeddings=True), dtype=np.float32)
+        catalog_s = time.perf_counter() - t0
+
+        latencies = []
+        for i in range(repeats):
+            t0 = time.perf_counter()
+            encoder.encode(QUERIES[i % len(QUERIES)], normalize_embeddings=True)
+            latencies.append(time.perf_counter() - t0)
+        latencies.sort()
+
+        queries = np.asarray(encoder.encode(QUERIES, normalize_embeddings=True), dtype=np.float32)
+        scores = queries @ catalog.T
+        row = {
+            "catalog_texts_per_s": round(len(texts) / catalog_s, 1),
+            "query_p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+            "query_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+        }
+        if reference is None:
+            reference = (catalog, scores)
+        else:
+            ref_catalog, ref_scores = reference
+            top, ref_top = np.argsort(-scores, axis=1)[:, :top_k], np.argsort(-ref_scores, axis=1)[:, :top_k]
+            overlap = [len(set(a) & set(b)) / top_k for a, b in zip(top, ref_top)]
+            row.update({
+                "embedding_cosine_min": round(float(np.min(np.sum(catalog * ref_catalog, axis=1))), 5),
+                "score_max_abs_diff": round(float(np.max(np.abs(scores - ref_scores))), 5),
+                f"top{top_k}_overlap": round(float(np.mean(overlap)), 3),
+            })
+        results[backend] = row
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export MiniLM to ONNX and compare it with PyTorch.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export")
+    export.add_argument("--name", default="all-MiniLM-L6-v2")
+    export.add_argument("--quantize", action="store_true", help="also write an int8 model")
+    bench = sub.add_parser("compare")
+    bench.add_argument("--name", default="all-MiniLM-L6-v2")
+    bench.add_argument("--catalog", default=os.path.join(HERE, "..", "Myntra_hackerramp", "myntra_products_catalog.csv"))
+    bench.add_argument("--limit", type=int, default=5000, help="catalog rows to encode (0 = all)")
+    bench.add_argument("--backends", default="torch,onnx,onnx-int8")
+    bench.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        print(export_onnx(args.name, quantize=args.quantize))
+        return
+
+    texts = read_texts(args.catalog, args.limit)
+    print(f"{len(texts)} catalog texts, {ONNX_INTRA_OP_THREADS} intra-op threads")
+    results = compare(texts, [b.strip() for b in args.backends.split(",")], args.name)
+    for backend, row in results.items():
+        print(f"{backend:>10}  " + "  ".join(f"{k}={v}" for k, v in row.items()))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# fake_genai.py
+"""
+Offline stand-in for the Gemini generative model, for load tests and benchmarks.
+
+Answers the prompts used by the ML services with plausible, deterministic
+output after sleeping for a latency drawn from a configurable distribution.
+Select it with GENAI_BACKEND=fake and shape latency with FAKE_GENAI_LATENCY,
+e.g. "lognormal:mean=400,sigma=0.5" (milliseconds).
+"""
+
+import os
+import re
+import json
+import math
+import time
+import asyncio
+import random
+import hashlib
+import threading
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+FAMILIES = {
+    "Red": "#FF0000", "Blue": "#0000FF", "Green": "#008000", "Yellow": "#FFFF00",
+    "Orange": "#FFA500", "Purple": "#800080", "Pink": "#FFC0CB", "Brown": "#A52A2A",
+    "Black": "#000000", "White": "#FFFFFF", "Grey": "#808080",
+}
+STYLES = ["Casual", "Formal", "Ethnic", "Party", "Sports"]
+SEASONS = ["Summer", "Winter", "Spring", "Autumn"]
+
+
+# ==========================
+# Latency distributions
+# ==========================
+class LatencyModel:
+    """Samples call latency in seconds from constant/uniform/lognormal/exponential."""
+
+    KINDS = ("constant", "uniform", "lognormal", "exponential")
+
+    def __init__(self, kind: str = "constant", mean: float = 0.0, spread: float = 0.0,
+                 sigma: float = 0.5, seed: Optional[int] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution {kind!r}, expected one of {self.KINDS}")
+        self.kind = kind
+        self.mean = mean
+        self.spread = spread
+        self.sigma = sigma
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: str, seed: Optional[int] = None) -> "LatencyModel":
+        """Build from "kind:key=value,..." with times in milliseconds, e.g. "uniform:mean=300,spread=100"."""
+        kind, _, params = spec.partition(":")
+        values: Dict[str, float] = {}
+        for item in filter(None, params.split(",")):
+            key, _, value = item.partition("=")
+            values[key.strip()] = float(value)
+        return cls(
+            kind=kind.strip() or "constant",
+            mean=values.get("mean", 0.0) / 1000,
+            spread=values.get("spread", 0.0) / 1000,
+            sigma=values.get("sigma", 0.5),
+            seed=seed,
+        )
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == "constant":
+                return self.mean
+            if self.kind == "uniform":
+                return max(0.0, self._rng.uniform(self.mean - self.spread, self.mean + self.spread))
+            if self.kind == "exponential":
+                return self._rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+            # lognormal with the requested mean
+            if self.mean <= 0:
+                return 0.0
+            mu = math.log(self.mean) - self.sigma ** 2 / 2
+            return self._rng.lognormvariate(mu, self.sigma)
+
+
+# ==========================
+# Fake model
+# ==========================
+class FakeUsage:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        # Roughly four characters per token
+        self.usage_metadata = FakeUsage(len(prompt) // 4, len(text) // 4)
+
+
+def _pick(options, *keys):
+    digest = hashlib.md5("|".join(keys).encode("utf-8")).digest()
+    return options[digest[0] % len(options)]
+
+
+class FakeGenerativeModel:
+    """Drop-in for genai.GenerativeModel.generate_content in the colour and recommendation services."""
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency.sample())
+        return FakeResponse(self._answer(prompt), prompt)
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self.latency.sample())
+        return FakeResponse(self._answer(prompt), prompt)
+
+    def _answer(self, prompt: str) -> str:
+        if "JSON array" in prompt:
+            items = re.findall(r'^\s*(\d+)\. "(.*)"\s*$', prompt, flags=re.MULTILINE)
+            return json.dumps([{"id": int(i), **self._tags(text)} for i, text in items])
+        match = re.search(r'Color name: "(.*)"', prompt)
+        if match:
+            family = self._family(match.group(1))
+            return json.dumps({"family": family, "hex": FAMILIES[family]})
+        match = re.search(r'Description: "(.*)"', prompt, flags=re.DOTALL)
+        if match and "Determine the season" in prompt:
+            return _pick(SEASONS, match.group(1))
+        if match:
+            return json.dumps(self._tags(match.group(1)))
+        if "Festive Fashion" in prompt:
+            return ("Festive Fashion:\nRed and gold sarees, lehenga sets and silk kurta with jhumkas "
+                    "and bangles are trending this season.\n\nWeather:\nWarm and humid, so cotton "
+                    "and linen in breathable, lightweight fabrics work best.")
+        return "{}"
+
+    def _family(self, text: str) -> str:
+        lowered = text.lower()
+        for family in FAMILIES:
+            if family.lower() in lowered:
+                return family
+        return _pick(list(FAMILIES), lowered)
+
+    def _tags(self, description: str) -> Dict[str, str]:
+        return {
+            "color": self._family(description),
+            "style": _pick(STYLES, description, "style"),
+            "season": _pick(SEASONS, description, "season"),
+        }
+
+
+class FakeImageClient:
+    """Drop-in for genai.Client in the virtual try-on service.
+
+    Echoes the first input image back as the "generated" image. Besides the
+    sampled latency it charges payload size against a simulated upload
+    bandwidth, so smaller inputs show up as faster calls.
+    """
+
+    def __init__(self, latency: Optional[LatencyModel] = None,
+                 upload_bytes_per_second: Optional[float] = None):
+        self.latency = latency or LatencyModel()
+        self.upload_bytes_per_second = upload_bytes_per_second
+        self.calls = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self.models = self  # client.models.generate_content(...)
+
+    def generate_content(self, model: str, contents):
+        images = [p.inline_data for p in contents if getattr(p, "inline_data", None)]
+        payload = sum(len(img.data) for img in images)
+        with self._lock:
+            self.calls += 1
+            self.bytes_received += payload
+
+        delay = self.latency.sample()
+        if self.upload_bytes_per_second:
+            delay += payload / self.upload_bytes_per_second
+        time.sleep(delay)
+
+        data = images[0].data if images else b""
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=data, mime_type=images[0].mime_type if images else None))
+        candidate = SimpleNamespace(content=SimpleNamespace(parts=[part]), finish_reason=SimpleNamespace(name="STOP"))
+        return SimpleNamespace(candidates=[candidate])
+
+
+def use_fake_backend() -> bool:
+    return os.getenv("GENAI_BACKEND", "").lower() == "fake"
+
+
+def fake_model_from_env() -> FakeGenerativeModel:
+    spec = os.getenv("FAKE_GENAI_LATENCY", "constant:mean=0")
+    return FakeGenerativeModel(LatencyModel.parse(spec))
+
+
+def fake_image_client_from_env() -> FakeImageClient:
+    spec = os.getenv("FAKE_GENAI_LATENCY", "constant:mean=0")
+    mbps = float(os.getenv("FAKE_GENAI_UPLOAD_MBPS", "0"))
+    return FakeImageClient(LatencyModel.parse(spec), mbps * 125_000 if mbps > 0 else None)
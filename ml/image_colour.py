@@ -0,0 +1,187 @@
+# image_colour.py
+"""
+Local dominant-colour extraction from product and outfit images.
+
+Downsamples the image, masks out the background, clusters the remaining
+pixels with k-means in numpy and maps each cluster to a colour family from
+COLOR_DICT. No network calls, so it can backfill a whole image directory.
+
+Usage:
+    python image_colour.py path/to/images --output image_colours.jsonl --workers 4
+"""
+
+import os
+import json
+import argparse
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from colour_space import family_palette, rgb_to_hex, rgb_to_lab
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+_PALETTE, _PALETTE_LAB = family_palette()
+
+
+# ==========================
+# Pixel preparation
+# ==========================
+def load_pixels(image: Union[str, bytes, Image.Image], max_side: int = 128) -> Tuple[np.ndarray, np.ndarray]:
+    """Return a downsampled (H, W, 3) RGB array and an (H, W) foreground mask."""
+    if isinstance(image, bytes):
+        image = Image.open(BytesIO(image))
+    elif isinstance(image, str):
+        image = Image.open(image)
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_side, max_side))
+
+    rgba = np.asarray(image.convert("RGBA"))
+    rgb = rgba[..., :3].astype(np.float32)
+    opaque = rgba[..., 3] >= 128
+    return rgb, opaque
+
+
+def background_mask(rgb: np.ndarray, opaque: np.ndarray, tolerance: float = 30.0) -> np.ndarray:
+    """True for foreground pixels.
+
+    The background colour is estimated as the median of the image border,
+    which matches the plain studio backdrops of catalog photos.
+    """
+    border = np.concatenate([rgb[0], rgb[-1], rgb[:, 0], rgb[:, -1]])
+    background = np.median(border, axis=0)
+    distance = np.linalg.norm(rgb - background, axis=-1)
+    mask = opaque & (distance > tolerance)
+    # Too little left means the subject fills the frame; keep everything
+    if mask.sum() < 0.05 * mask.size:
+        mask = opaque if opaque.any() else np.ones_like(opaque)
+    return mask
+
+
+# ==========================
+# K-means
+# ==========================
+def kmeans(pixels: np.ndarray, k: int = 4, iterations: int = 20,
+           seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized k-means with k-means++ seeding; returns (centers, counts)."""
+    rng = np.random.default_rng(seed)
+    pixels = np.asarray(pixels, dtype=np.float64)
+    k = min(k, len(pixels))
+    sq_norms = np.einsum("ij,ij->i", pixels, pixels)
+
+    centers = np.empty((k, pixels.shape[1]), dtype=pixels.dtype)
+    centers[0] = pixels[rng.integers(len(pixels))]
+    closest = np.sum((pixels - centers[0]) ** 2, axis=1)
+    for i in range(1, k):
+        total = closest.sum()
+        idx = rng.choice(len(pixels), p=closest / total) if total > 0 else rng.integers(len(pixels))
+        centers[i] = pixels[idx]
+        closest = np.minimum(closest, np.sum((pixels - centers[i]) ** 2, axis=1))
+
+    labels = np.zeros(len(pixels), dtype=np.int64)
+    for _ in range(iterations):
+        dist = sq_norms[:, None] - 2 * pixels @ centers.T + np.einsum("ij,ij->i", centers, centers)
+        new_labels = dist.argmin(axis=1)
+        counts = np.bincount(new_labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, new_labels, pixels)
+        nonempty = counts > 0
+        centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    return centers, np.bincount(labels, minlength=k)
+
+
+# ==========================
+# Colour extraction
+# ==========================
+def nearest_family(rgb: np.ndarray) -> List[Tuple[str, str]]:
+    """Map (N, 3) RGB colours to the closest COLOR_DICT (family, hex) by ΔE76."""
+    lab = rgb_to_lab(rgb)
+    dist = np.linalg.norm(lab[:, None, :] - _PALETTE_LAB[None, :, :], axis=-1)
+    return [_PALETTE[i] for i in dist.argmin(axis=1)]
+
+
+def extract_colors(image: Union[str, bytes, Image.Image], k: int = 4,
+                   max_side: int = 128) -> List[Dict[str, object]]:
+    """Dominant colours of an image, largest share first.
+
+    Each entry has the COLOR_DICT family and hex plus the measured cluster
+    colour and its share of foreground pixels.
+    """
+    if k < 1:
+        raise ValueError(f"clusters must be at least 1, got {k}")
+    rgb, opaque = load_pixels(image, max_side=max_side)
+    pixels = rgb[background_mask(rgb, opaque)]
+    centers, counts = kmeans(pixels, k=k)
+
+    order = np.argsort(counts)[::-1]
+    families = nearest_family(centers[order])
+    results = []
+    for (family, hex_code), idx in zip(families, order):
+        if counts[idx] == 0:
+            continue
+        results.append({
+            "family": family,
+            "hex": hex_code,
+            "pixel_hex": rgb_to_hex(centers[idx]),
+            "share": round(float(counts[idx]) / len(pixels), 4),
+        })
+    return results
+
+
+def dominant_color(image: Union[str, bytes, Image.Image], k: int = 4) -> Tuple[str, str]:
+    """Image counterpart of map_color: (family, hex) of the largest cluster."""
+    colors = extract_colors(image, k=k)
+    if not colors:
+        return ("Unknown", "#808080")
+    return (colors[0]["family"], colors[0]["hex"])
+
+
+# ==========================
+# Batch mode
+# ==========================
+def _tag_file(args: Tuple[str, int]) -> Dict[str, object]:
+    path, k = args
+    try:
+        colors = extract_colors(path, k=k)
+        family, hex_code = (colors[0]["family"], colors[0]["hex"]) if colors else ("Unknown", "#808080")
+        return {"file": path, "family": family, "hex": hex_code, "colors": colors}
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+
+def iter_images(directory: str):
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                yield os.path.join(root, name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract dominant colours from a directory of images.")
+    parser.add_argument("directory")
+    parser.add_argument("--output", default="image_colours.jsonl")
+    parser.add_argument("--clusters", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+    if args.clusters < 1:
+        parser.error("--clusters must be at least 1")
+
+    count = 0
+    with open(args.output, "w", encoding="utf-8") as f, \
+            ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = ((path, args.clusters) for path in iter_images(args.directory))
+        for result in pool.map(_tag_file, jobs, chunksize=16):
+            f.write(json.dumps(result) + "\n")
+            count += 1
+    print(f"[INFO] Tagged {count} images -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# instrumentation.py
+"""
+Lightweight metrics for the ML services: timing spans, histograms, counters
+and gauges, exposed in Prometheus text format.
+
+    from instrumentation import instrument_app, span, CATALOG_SIZE
+
+    instrument_app(app, "recommendations")      # /metrics + per-route timing
+    with span("mongo_fetch"):
+        products = list(collection.find({}))
+
+Spans feed ml_stage_duration_seconds{service,stage}. Inside a request they are
+also collected for a Server-Timing response header, which is added when the
+client sends "X-Timing: 1" or METRICS_TIMING_HEADER=1 is set. Each
+observation costs two perf_counter() calls, a bisect and one lock.
+"""
+
+import os
+import time
+import threading
+import contextvars
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TIMING_HEADER = os.getenv("METRICS_TIMING_HEADER", "0") == "1"
+
+_default_service = "ml"
+_service: contextvars.ContextVar = contextvars.ContextVar("metrics_service", default=None)
+_request_spans: contextvars.ContextVar = contextvars.ContextVar("metrics_request_spans", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+# ==========================
+# Metric types
+# ==========================
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Set directly, or computed at scrape time by a callback returning a number or {label tuple: value}."""
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=(), callback: Optional[Callable] = None):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        if self.callback is not None:
+            try:
+                produced = self.callback()
+            except Exception as e:
+                print(f"[WARN] Gauge {self.name} callback failed: {e}")
+                produced = {}
+            values.update(produced if isinstance(produced, dict) else {(): produced})
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            # Modules may be reloaded (benchmarks do); keep the first instance
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labelnames=()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=(), callback=None) -> Gauge:
+        gauge = self._register(Gauge(name, help, labelnames, callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for m in metrics for line in m.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram("ml_stage_duration_seconds", "Time spent per processing stage",
+                                   ("service", "stage"))
+REQUEST_SECONDS = REGISTRY.histogram("ml_http_request_duration_seconds", "HTTP request latency",
+                                     ("service", "route", "method", "status"))
+CACHE_EVENTS = REGISTRY.counter("ml_cache_events_total", "Cache lookups by outcome", ("service", "cache", "result"))
+CATALOG_SIZE = REGISTRY.gauge("ml_catalog_size", "Products loaded into memory", ("service",))
+
+_lru_caches: Dict[Tuple[str, str], Callable] = {}
+
+
+def _lru_stats():
+    values = {}
+    for (service, cache), fn in list(_lru_caches.items()):
+        info = fn.cache_info()
+        for stat in ("hits", "misses", "currsize", "maxsize"):
+            value = getattr(info, stat)
+            if value is not None:
+                values[(service, cache, stat)] = value
+    return values
+
+
+LRU_CACHE = REGISTRY.gauge("ml_lru_cache", "functools.lru_cache statistics, read at scrape time",
+                           ("service", "cache", "stat"), callback=_lru_stats)
+
+
+# ==========================
+# Spans
+# ==========================
+@contextmanager
+def span(stage: str, service: Optional[str] = None):
+    """Time a block into ml_stage_duration_seconds (and the request's Server-Timing list)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, service=service or _current_service(), stage=stage)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((stage, elapsed))
+
+
+def timed(stage: str, service: Optional[str] = None):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage, service):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def cache_event(cache: str, hit: bool, service: Optional[str] = None) -> None:
+    CACHE_EVENTS.inc(service=service or _current_service(), cache=cache, result="hit" if hit else "miss")
+
+
+def watch_lru(cache: str, fn: Callable, service: Optional[str] = None) -> None:
+    """Expose an lru_cache-wrapped function's cache_info() under ml_lru_cache."""
+    _lru_caches[(service or _current_service(), cache)] = fn
+
+
+def _current_service() -> str:
+    return _service.get() or _default_service
+
+
+def set_service(service: str) -> None:
+    """Default service label for spans outside requests (startup loading, worker threads)."""
+    global _default_service
+    _default_service = service
+
+
+# ==========================
+# Flask integration
+# ==========================
+def instrument_app(app, service: str, metrics_path: str = "/metrics"):
+    from flask import Response, g, request
+
+    set_service(service)
+
+    @app.before_request
+    def _start_timer():
+        _service.set(service)
+        g._metrics_start = time.perf_counter()
+        g._metrics_spans = []
+        _request_spans.set(g._metrics_spans)
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("_metrics_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        if route != metrics_path:
+            REQUEST_SECONDS.observe(elapsed, service=service, route=route,
+                                    method=request.method, status=response.status_code)
+        if TIMING_HEADER or request.headers.get("X-Timing") == "1":
+            parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in g.pop("_metrics_spans", [])]
+            parts.append(f"total;dur={elapsed * 1000:.1f}")
+            response.headers["Server-Timing"] = ", ".join(parts)
+        _request_spans.set(None)
+        return response
+
+    @app.route(metrics_path, methods=["GET"])
+    def _metrics():
+        return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+    return app
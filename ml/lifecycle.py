@@ -0,0 +1,179 @@
+# lifecycle.py
+"""
+Startup phases for the ML services: cheap import, background warmup and
+liveness/readiness probes.
+
+Modules keep torch, sentence_transformers, spaCy, the Gemini SDK and MongoDB
+out of import time and do that work in a loader function instead:
+
+    warmup = Warmup("recommendations", _load)   # _load() fills module state
+    add_health_routes(app, warmup)              # /healthz, /readyz
+    warmup.start_from_env()
+
+    def handler():
+        warmup.ensure()                         # no-op once ready
+
+WARMUP_MODE picks when the loader runs:
+
+    background  in a daemon thread started at import (default); /readyz
+                answers 503 until it finishes, requests that arrive
+                earlier wait for it
+    lazy        on the first call to ensure(), e.g. for tests and tooling
+                that import a module without serving it
+    eager       during import, as before
+
+A failed warmup is retried in the background with exponential backoff
+(WARMUP_RETRY_SECONDS doubling up to WARMUP_RETRY_MAX_SECONDS), at most
+WARMUP_RETRIES times. Once retries run out /healthz answers 503 as well,
+so the orchestrator restarts the process.
+"""
+
+import os
+import time
+import threading
+import traceback
+from typing import Callable, Dict, Optional
+
+WARMUP_MODE = os.getenv("WARMUP_MODE", "background").lower()
+WARMUP_RETRIES = int(os.getenv("WARMUP_RETRIES", "5"))
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+WARMUP_RETRY_MAX_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", "300"))
+
+
+class NotReady(RuntimeError):
+    """Warmup failed, so the service cannot answer."""
+
+
+class Warmup:
+    """Runs a loader once, in the background or on first use, retrying it if it fails."""
+
+    def __init__(self, service: str, loader: Callable[[], None]):
+        self.service = service
+        self.loader = loader
+        self.state = "pending"  # pending -> loading -> ready | failed (-> loading on retry)
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+        self.attempts = 0
+        self.retry_at: Optional[float] = None  # time.time() of the next retry while failed
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def gave_up(self) -> bool:
+        """Failed with no retry left; only a restart can recover."""
+        return self.state == "failed" and self.retry_at is None
+
+    def start_from_env(self, mode: Optional[str] = None) -> "Warmup":
+        mode = (mode or WARMUP_MODE).lower()
+        if mode == "eager":
+            self.ensure()
+        elif mode == "background":
+            self.start()
+        elif mode != "lazy":
+            raise ValueError(f"Unknown WARMUP_MODE {mode!r}")
+        return self
+
+    def start(self) -> "Warmup":
+        with self._lock:
+            if self.state != "pending":
+                return self
+            self.state = "loading"
+        self._thread = threading.Thread(target=self._run, name=f"{self.service}-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def ensure(self, timeout: Optional[float] = None) -> None:
+        """Block until loaded, running the loader in this thread if nobody started it."""
+        if self.state == "ready":
+            return
+        with self._lock:
+            run_here = self.state == "pending"
+            if run_here:
+                self.state = "loading"
+        if run_here:
+            self._run()
+        elif not self._done.wait(timeout):
+            raise NotReady(f"{self.service} is still warming up")
+        if self.state != "ready":
+            raise NotReady(f"{self.service} warmup failed: {self.error}")
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        self.attempts += 1
+        delay = None
+        try:
+            self.loader()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            if self.attempts <= WARMUP_RETRIES:
+                delay = min(WARMUP_RETRY_SECONDS * 2 ** (self.attempts - 1), WARMUP_RETRY_MAX_SECONDS)
+                self.retry_at = time.time() + delay
+            else:
+                self.retry_at = None
+            self.state = "failed"
+            retry = f"retrying in {delay:.1f} s" if delay is not None else "giving up"
+            print(f"[WARN] {self.service} warmup failed (attempt {self.attempts}, {retry}): {self.error}")
+            traceback.print_exc()
+        else:
+            self.state = "ready"
+            self.error = self.retry_at = None
+            print(f"[INFO] {self.service} ready in {time.perf_counter() - start:.2f} s")
+        finally:
+            self.seconds = time.perf_counter() - start
+            self._done.set()
+
+        if delay is not None:
+            # Retries always run in the background, also when the first attempt ran in ensure()
+            threading.Thread(target=self._retry, args=(delay,), name=f"{self.service}-warmup-retry",
+                             daemon=True).start()
+
+    def _retry(self, delay: float) -> None:
+        time.sleep(delay)
+        with self._lock:
+            if self.state != "failed":
+                return
+            self.state = "loading"
+            self._done.clear()
+        self._run()
+
+    def status(self) -> Dict[str, object]:
+        status = {"service": self.service, "state": self.state}
+        if self.seconds is not None:
+            status["warmup_seconds"] = round(self.seconds, 3)
+        if self.error:
+            status["error"] = self.error
+            status["attempts"] = self.attempts
+        if self.state == "failed" and self.retry_at is not None:
+            status["retry_in_seconds"] = round(max(self.retry_at - time.time(), 0.0), 1)
+        return status
+
+
+# ==========================
+# Flask integration
+# ==========================
+def add_health_routes(app, warmup: Warmup):
+    """/healthz answers until warmup has given up; /readyz only once warmup succeeded."""
+    from flask import jsonify
+
+    @app.route("/healthz", methods=["GET"])
+    def _healthz():
+        if warmup.gave_up:
+            return jsonify({"status": "failed", **warmup.status()}), 503
+        return jsonify({"status": "ok", "service": warmup.service})
+
+    @app.route("/readyz", methods=["GET"])
+    def _readyz():
+        return jsonify(warmup.status()), 200 if warmup.ready else 503
+
+    @app.errorhandler(NotReady)
+    def _not_ready(e):
+        response = jsonify({"error": str(e), **warmup.status()})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+
+    return app
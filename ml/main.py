@@ -3,38 +3,53 @@
 import os
 import re
 import math
+import threading
 import pandas as pd
 import numpy as np
-import torch
-from sentence_transformers import SentenceTransformer, util
-from pymongo import MongoClient
-import google.generativeai as genai
-from flask import Flask, request, jsonify
+from flask import Flask, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+from fake_genai import use_fake_backend, fake_model_from_env
+from embeddings import load_encoder, top_k
+from instrumentation import instrument_app, span, set_service, CATALOG_SIZE
+from lifecycle import Warmup, add_health_routes
+from serialization import json_response, project, requested_fields
+from near_duplicates import NearDuplicateIndex, first_per_cluster
+
+SERVICE = "recommendations"
+set_service(SERVICE)
+
 # ======================
-# Environment and Gemini
+# Environment
 # ======================
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
 # ======================
 # MongoDB setup
 # ======================
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-DB_NAME = "myntra-clone"
+DB_NAME = os.getenv("MONGO_DB", "myntra-clone")
 COLLECTION_NAME = "products"
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
-collection = db[COLLECTION_NAME]
+# Near-duplicates (re-listings, colour variants) share one embedding row when collapsed
+COLLAPSE_NEAR_DUPLICATES = os.getenv("COLLAPSE_NEAR_DUPLICATES", "true").lower() == "true"
+
+# Filled in by _load() during warmup (see lifecycle.py)
+collection = None
+df = None
+model = None
+descriptions = None
+description_embeddings = None
+near_duplicates = None
+index_rows = None  # df row behind each embedding row
 
 # ======================
 # Load products from MongoDB
 # ======================
 def load_products():
-    products = list(collection.find({}))
+    with span("mongo_fetch"):
+        products = list(collection.find({}))
     df = pd.DataFrame(products)
 
     if "_id" in df.columns:
@@ -58,20 +73,41 @@ def load_products():
 
     return df
 
-df = load_products()
-
 # ======================
-# Load semantic search model
+# Load catalog and semantic search model
 # ======================
-model = SentenceTransformer('all-MiniLM-L6-v2')
-descriptions = df['product_description'].astype(str).tolist()
-description_embeddings = model.encode(descriptions, convert_to_tensor=True)
+def _load():
+    global collection, df, model, descriptions, description_embeddings, near_duplicates, index_rows
+    from pymongo import MongoClient
+
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    df = load_products().reset_index(drop=True)
+    CATALOG_SIZE.set(len(df), service=SERVICE)
+
+    near_duplicates = NearDuplicateIndex()
+    with span("near_duplicates"):
+        texts = (df['title'].astype(str) + " " + df['product_description'].astype(str)).tolist()
+        for row, text in enumerate(texts):
+            near_duplicates.add(row, text)
+    index_rows = near_duplicates.representatives() if COLLAPSE_NEAR_DUPLICATES else list(range(len(df)))
+    print(f"[INFO] Indexing {len(index_rows)} of {len(df)} products after near-duplicate collapsing")
+
+    model = load_encoder('all-MiniLM-L6-v2', service=SERVICE)
+    descriptions = df['product_description'].iloc[index_rows].astype(str).tolist()
+    with span("encode_catalog"):
+        description_embeddings = model.encode(descriptions, normalize_embeddings=True)
+
+    if not use_fake_backend():
+        _gemini_model()
+
+
+warmup = Warmup(SERVICE, _load)
 
 # ======================
 # Gemini API call
 # ======================
-def get_gemini_fashion_weather(city: str) -> str:
-    prompt = f"""
+def _fashion_weather_prompt(city: str) -> str:
+    return f"""
     Provide insights for festive fashion and weather in {city}.
     Structure the response in two sections exactly:
 
@@ -81,8 +117,34 @@ def get_gemini_fashion_weather(city: str) -> str:
     Weather:
     (Write about the current weather conditions and suitable fabrics to wear currently presently.)
     """
-    gem_model = genai.GenerativeModel("gemini-1.5-flash")
-    response = gem_model.generate_content(prompt)
+
+
+_gemini = None
+_gemini_lock = threading.Lock()
+
+
+def _gemini_model():
+    global _gemini
+    if use_fake_backend():
+        return fake_model_from_env()
+    if _gemini is None:
+        with _gemini_lock:
+            if _gemini is None:
+                import google.generativeai as genai
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                _gemini = genai.GenerativeModel("gemini-1.5-flash")
+    return _gemini
+
+
+def get_gemini_fashion_weather(city: str) -> str:
+    with span("llm_call"):
+        response = _gemini_model().generate_content(_fashion_weather_prompt(city))
+    return response.text.strip() if response and response.text else ""
+
+
+async def get_gemini_fashion_weather_async(city: str) -> str:
+    with span("llm_call"):
+        response = await _gemini_model().generate_content_async(_fashion_weather_prompt(city))
     return response.text.strip() if response and response.text else ""
 
 # ======================
@@ -92,26 +154,36 @@ def recommend_products_from_keywords(keywords, top_n=50):
     if not keywords:
         return []
 
+    warmup.ensure()
+
     query_text = " ".join(keywords)
-    query_embedding = model.encode(query_text, convert_to_tensor=True)
-    cos_scores = util.cos_sim(query_embedding, description_embeddings)[0]
-    top_results = torch.topk(cos_scores, k=min(top_n, len(descriptions)))
+    with span("encode_query"):
+        query_embedding = model.encode(query_text, normalize_embeddings=True)
+    with span("similarity_scan"):
+        # Uncollapsed, over-fetch so that dropping clones still leaves top_n
+        k = top_n if COLLAPSE_NEAR_DUPLICATES else top_n * 3
+        top_results = top_k(query_embedding, description_embeddings, k)
+
+    # At most one product per near-duplicate cluster
+    rows = [index_rows[i] for i in top_results.tolist()]
+    rows = [rows[i] for i in first_per_cluster(near_duplicates, rows, limit=top_n)]
 
     products = []
-    for idx in top_results.indices:
-        idx = int(idx)
-        product = df.iloc[idx].to_dict()
-
-        # Convert NumPy / Pandas types to native Python types
-        for k, v in product.items():
-            if isinstance(v, (np.integer, np.floating)):
-                product[k] = v.item()
-            elif isinstance(v, (pd.Timestamp, pd.Timedelta)):
-                product[k] = str(v)
-            elif isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
-                product[k] = None
-
-        products.append(product)
+    with span("assemble"):
+        for idx in rows:
+            product = df.iloc[idx].to_dict()
+            product["variant_count"] = near_duplicates.cluster_size(idx) - 1
+
+            # Convert NumPy / Pandas types to native Python types
+            for k, v in product.items():
+                if isinstance(v, (np.integer, np.floating)):
+                    product[k] = v.item()
+                elif isinstance(v, (pd.Timestamp, pd.Timedelta)):
+                    product[k] = str(v)
+                elif isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
+                    product[k] = None
+
+            products.append(product)
     return products
 
 # ======================
@@ -131,6 +203,8 @@ weather_keywords = ["cotton", "linen", "georgette", "chiffon", "lightweight", "b
 # ======================
 app = Flask(__name__)
 CORS(app)
+instrument_app(app, SERVICE)
+add_health_routes(app, warmup)
 
 # ----------------------
 # Clean JSON utility
@@ -159,17 +233,29 @@ def get_recommendations():
 
     # Gemini response
     gemini_text = get_gemini_fashion_weather(city)
+    result = build_recommendations(city, gemini_text)
+
+    # ?fields=title,url,final_price trims each product; NumPy/NaN are handled by the encoder
+    fields = requested_fields(request, data)
+    for key in ("festive_products", "weather_products"):
+        result[key] = project(result[key], fields)
+    return json_response(result)
+
+
+def build_recommendations(city: str, gemini_text: str) -> dict:
+    """Keyword extraction and semantic search over a Gemini fashion/weather answer."""
     sections = re.split(r'Weather:', gemini_text, flags=re.IGNORECASE)
     fashion_text = sections[0].replace("Festive Fashion:", "").strip()
     weather_text = sections[1].strip() if len(sections) > 1 else ""
 
     # Extract keywords
-    keywords_found = [kw for kw in fashion_keywords if re.search(r'\b' + kw + r's?\b', fashion_text, re.IGNORECASE)]
-    colors_found = [color for color in colors if re.search(r'\b' + color + r'\b', fashion_text, re.IGNORECASE)]
-    accessories_found = [acc for acc in accessories if re.search(r'\b' + acc + r's?\b', fashion_text, re.IGNORECASE)]
-    search_keywords = list(set(keywords_found + colors_found + accessories_found))
+    with span("keyword_extract"):
+        keywords_found = [kw for kw in fashion_keywords if re.search(r'\b' + kw + r's?\b', fashion_text, re.IGNORECASE)]
+        colors_found = [color for color in colors if re.search(r'\b' + color + r'\b', fashion_text, re.IGNORECASE)]
+        accessories_found = [acc for acc in accessories if re.search(r'\b' + acc + r's?\b', fashion_text, re.IGNORECASE)]
+        search_keywords = list(set(keywords_found + colors_found + accessories_found))
 
-    weather_found = [wk for wk in weather_keywords if re.search(r'\b' + wk + r's?\b', weather_text, re.IGNORECASE)]
+        weather_found = [wk for wk in weather_keywords if re.search(r'\b' + wk + r's?\b', weather_text, re.IGNORECASE)]
 
     # Semantic search returning full product info
     festive_products = recommend_products_from_keywords(search_keywords, top_n=50)
@@ -178,13 +264,16 @@ def get_recommendations():
     # Clean data for JSON
     # response_data = clean_json()
 
-    return jsonify({
+    return {
         "city": city,
         "festive_products": festive_products,
         "weather_products": weather_products,
         "fashion_text": fashion_text,
         "weather_text": weather_text
-    })
+    }
+
+# Last, so an eager warmup sees every function above
+warmup.start_from_env()
 
 # ======================
 # Run Flask
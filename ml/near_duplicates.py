@@ -0,0 +1,224 @@
+# near_duplicates.py
+"""
+Near-duplicate product detection with MinHash signatures and LSH banding.
+
+Re-listed products and colour variants have near-identical titles and
+descriptions. Exact drop_duplicates() keeps them, so they bloat the
+embedding matrix and fill result lists with clones. Each product is
+reduced to word shingles, hashed into a MinHash signature and bucketed by
+LSH band. A product joins a cluster when its signature agrees with the
+cluster representative's on at least `threshold` of the positions (an
+estimate of the Jaccard similarity of their shingle sets); otherwise it
+starts a cluster and represents it:
+
+    index = NearDuplicateIndex()
+    for i, text in enumerate(texts):        # incremental: add as products arrive
+        index.add(i, text)
+    index.cluster_of(7)                     # representative key of row 7
+    index.representatives()                 # one key per cluster
+
+Signatures use NumPy when available and plain integers otherwise; both
+give identical values. `python near_duplicates.py` reports how much the
+product catalog CSV shrinks.
+"""
+
+import os
+import re
+import hashlib
+import random
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+PRIME = 4294967311  # first prime above 2**32; a*x + b stays below 2**64
+THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    tokens = TOKEN_RE.findall(str(text).lower())
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return list({" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)})
+
+
+def _hash32(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little")
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash-LSH clustering; keys are row positions, ids, anything hashable."""
+
+    def __init__(self, threshold: float = THRESHOLD, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, 2 ** 31) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, 2 ** 32) for _ in range(num_perm)]
+        if np is not None:
+            self._a_np = np.array(self._a, dtype=np.uint64)
+            self._b_np = np.array(self._b, dtype=np.uint64)
+
+        self.keys: List[Hashable] = []
+        self._position: Dict[Hashable, int] = {}
+        self._signatures: List[Tuple[int, ...]] = []
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._cluster: List[int] = []  # position of each product's representative
+        self._sizes: Dict[int, int] = {}
+
+    # ----------------------
+    # Signatures
+    # ----------------------
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = [_hash32(s) for s in shingles(text, self.shingle_size)]
+        if not hashes:
+            return (PRIME,) * self.num_perm
+        if np is not None:
+            x = np.array(hashes, dtype=np.uint64)[:, None]
+            return tuple(((x * self._a_np + self._b_np) % np.uint64(PRIME)).min(axis=0).tolist())
+        return tuple(min((a * x + b) % PRIME for x in hashes) for a, b in zip(self._a, self._b))
+
+    def similarity(self, first: Hashable, second: Hashable) -> float:
+        """Estimated Jaccard similarity of two added keys."""
+        a, b = self._signatures[self._position[first]], self._signatures[self._position[second]]
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    # ----------------------
+    # Clustering
+    # ----------------------
+    def add(self, key: Hashable, text: str) -> Hashable:
+        """Add one product and return the representative key of its cluster.
+
+        A product joins the cluster whose representative it is most similar
+        to, if that similarity reaches the threshold. Comparing against the
+        representative, not any member, keeps chains of small differences
+        (brand, then fit, then colour) from merging unrelated products.
+        """
+        if key in self._position:
+            return self.cluster_of(key)
+        signature = self.signature(text)
+        i = len(self.keys)
+        needed = self.threshold * self.num_perm
+
+        best, best_agree, checked = i, -1, set()
+        for band in range(self.bands):
+            for j in self._buckets.get((band, signature[band * self.rows:(band + 1) * self.rows]), ()):
+                rep = self._cluster[j]
+                if rep in checked:
+                    continue
+                checked.add(rep)
+                agree = sum(x == y for x, y in zip(signature, self._signatures[rep]))
+                if agree >= needed and agree > best_agree:
+                    best, best_agree = rep, agree
+
+        self.keys.append(key)
+        self._position[key] = i
+        self._signatures.append(signature)
+        self._cluster.append(best)
+        self._sizes[best] = self._sizes.get(best, 0) + 1
+        for band in range(self.bands):
+            self._buckets.setdefault((band, signature[band * self.rows:(band + 1) * self.rows]), []).append(i)
+        return self.keys[best]
+
+    def add_many(self, items: Iterable[Tuple[Hashable, str]]) -> "NearDuplicateIndex":
+        for key, text in items:
+            self.add(key, text)
+        return self
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._position
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def cluster_of(self, key: Hashable) -> Hashable:
+        return self.keys[self._cluster[self._position[key]]]
+
+    def cluster_size(self, key: Hashable) -> int:
+        return self._sizes[self._cluster[self._position[key]]]
+
+    def representatives(self) -> List[Hashable]:
+        """One key per cluster, in the order products were added."""
+        return [key for i, key in enumerate(self.keys) if self._cluster[i] == i]
+
+    def clusters(self, min_size: int = 1) -> Dict[Hashable, List[Hashable]]:
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for i, key in enumerate(self.keys):
+            groups.setdefault(self.keys[self._cluster[i]], []).append(key)
+        return {rep: members for rep, members in groups.items() if len(members) >= min_size}
+
+
+def first_per_cluster(index: NearDuplicateIndex, keys: Iterable[Hashable],
+                      limit: Optional[int] = None) -> List[int]:
+    """Positions in keys of the first occurrence of each cluster (all keys must be added)."""
+    seen, positions = set(), []
+    for pos, key in enumerate(keys):
+        cluster = index.cluster_of(key)
+        if cluster not in seen:
+            seen.add(cluster)
+            positions.append(pos)
+            if limit is not None and len(positions) >= limit:
+                break
+    return positions
+
+
+# ==========================
+# Index size reduction on the catalog CSV
+# ==========================
+def main(argv=None):
+    import csv
+    import time
+    import argparse
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Near-duplicate clusters in the product catalog CSV.")
+    parser.add_argument("--catalog", default=os.path.join(here, "..", "Myntra_hackerramp", "myntra_products_catalog.csv"))
+    parser.add_argument("--title", default="ProductName")
+    parser.add_argument("--description", default="Description")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--examples", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=384, help="embedding width for the memory estimate")
+    args = parser.parse_args(argv)
+
+    with open(args.catalog, newline="", encoding="utf-8") as f:
+        rows = [(r[args.title], r[args.description]) for r in csv.DictReader(f)]
+    exact = len(set(rows))
+
+    index = NearDuplicateIndex(threshold=args.threshold)
+    t0 = time.perf_counter()
+    for i, (title, description) in enumerate(rows):
+        index.add(i, f"{title} {description}")
+    seconds = time.perf_counter() - t0
+
+    kept = len(index.representatives())
+    clusters = index.clusters(min_size=2)
+
+    def mb(n):
+        return n * args.dim * 4 / 2 ** 20
+
+    print(f"{len(rows)} products, {exact} after exact title+description dedup")
+    print(f"{kept} after near-duplicate collapsing at {args.threshold:.2f} "
+          f"({1 - kept / len(rows):.1%} smaller), {len(clusters)} clusters with variants")
+    print(f"embedding matrix: {mb(len(rows)):.1f} MB -> {mb(kept):.1f} MB (float32, dim {args.dim})")
+    print(f"signatures + LSH: {seconds:.2f} s ({seconds / len(rows) * 1e6:.0f} us/product, "
+          f"numpy={'yes' if np is not None else 'no'})")
+
+    largest = sorted(clusters.values(), key=len, reverse=True)[:args.examples]
+    for members in largest:
+        print(f"\n{len(members)} variants, e.g.")
+        for key in members[:3]:
+            print(f"  {rows[key][0][:90]}")
+
+
+if __name__ == "__main__":
+    main()
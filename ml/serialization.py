@@ -0,0 +1,199 @@
+# serialization.py
+"""
+JSON responses for the product-list routes: field projection, a fast
+encoder and negotiated compression.
+
+    fields = requested_fields(request, data)    # ?fields=title,url,price
+    result["products"] = project(products, fields)
+    return json_response(result)
+
+Encoding uses orjson when it is installed. orjson writes NumPy arrays and
+scalars natively, writes NaN/Infinity as null, and falls back to _default()
+for ObjectId and pandas timestamps, so clean_json() is not needed on this
+path. Without orjson the stdlib encoder is used, after the same cleanup.
+
+Bodies of at least COMPRESS_MIN_BYTES are compressed with br (when the
+brotli package is installed) or gzip, whichever the client lists in
+Accept-Encoding with the higher q-value.
+"""
+
+import os
+import gzip
+import json
+import math
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from instrumentation import span
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+
+# ==========================
+# Projection
+# ==========================
+def requested_fields(request, data: Optional[dict] = None) -> Optional[List[str]]:
+    """fields= from the query string ("a,b,c") or a JSON body ("a,b,c" or a list); None means all."""
+    fields = request.args.get("fields")
+    if fields is None and isinstance(data, dict):
+        fields = data.get("fields")
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    fields = [str(f).strip() for f in fields if str(f).strip()]
+    return fields or None
+
+
+def project(records: Iterable[dict], fields: Optional[List[str]]) -> List[dict]:
+    if not fields:
+        return list(records)
+    return [{f: r[f] for f in fields if f in r} for r in records]
+
+
+# ==========================
+# Encoding
+# ==========================
+def _default(obj):
+    if hasattr(obj, "item"):  # NumPy scalars orjson does not cover (e.g. float16)
+        return obj.item()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)  # ObjectId, pandas Timestamp/Timedelta, datetime
+
+
+def _clean(obj):
+    if isinstance(obj, dict):
+        return {k: _clean(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_clean(v) for v in obj]
+    if hasattr(obj, "item") and not isinstance(obj, (str, bytes)):
+        obj = obj.item()
+    if isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
+        return None
+    return obj
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_clean(obj), default=_default, separators=(",", ":")).encode()
+
+
+# ==========================
+# Compression
+# ==========================
+def _accepted(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted(accept_encoding or "")
+    wildcard = accepted.get("*", 0.0)
+    options = [("br", accepted.get("br", wildcard))] if brotli is not None else []
+    options.append(("gzip", accepted.get("gzip", wildcard)))
+    name, q = max(options, key=lambda o: o[1])  # ties keep br, listed first
+    return name if q > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+# ==========================
+# Flask response
+# ==========================
+def json_response(obj, status: int = 200):
+    from flask import Response, request
+
+    with span("serialize"):
+        body = dumps(obj)
+    response = Response(body, status=status, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding and len(body) >= COMPRESS_MIN_BYTES:
+        with span("compress"):
+            response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+# ==========================
+# Payload size and encode time
+# ==========================
+def _products(n: int) -> List[dict]:
+    import random
+    import importlib.util
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location("synthetic_data",
+                                                  os.path.join(here, "..", "Myntra_hackerramp", "data.py"))
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    rng = random.Random(7)
+    products = [generator.make_product(rng, i) for i in range(n)]
+    for i, p in enumerate(products):
+        p["_id"] = f"{i:024x}"
+        p["price"] = float("nan") if i % 10 == 0 else float(i)
+    return products
+
+
+def main(argv=None):
+    import time
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serialized size and time of a /recommendations-sized product list.")
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--fields", default="_id,title,url,final_price,initial_price,images")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    products = _products(args.products)
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        for _ in range(args.repeats):
+            out = fn()
+        return out, (time.perf_counter() - t0) / args.repeats * 1000
+
+    print(f"{args.products} products, orjson={'yes' if orjson else 'no'}, brotli={'yes' if brotli else 'no'}")
+    print(f"{'payload':>10} {'encoder':>16} {'bytes':>9} {'encode ms':>10} {'gzip bytes':>11} {'gzip ms':>8} {'br bytes':>9} {'br ms':>7}")
+    for label, payload in (("full", products), ("projected", project(products, args.fields.split(",")))):
+        encoders = [("json+clean_json", lambda: json.dumps(_clean({"results": payload}), default=_default).encode())]
+        if orjson is not None:
+            encoders.append(("orjson", lambda: dumps({"results": payload})))
+        for name, fn in encoders:
+            body, encode_ms = timed(fn)
+            gz, gz_ms = timed(lambda: compress(body, "gzip"))
+            br, br_ms = timed(lambda: compress(body, "br")) if brotli is not None else (b"", 0.0)
+            br_bytes = len(br) if brotli is not None else "-"
+            print(f"{label:>10} {name:>16} {len(body):>9} {encode_ms:>10.3f} {len(gz):>11} {gz_ms:>8.3f} {br_bytes:>9} {br_ms:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,54 @@
+import os
 from flask import Flask, jsonify, request
 import pandas as pd
-from pymongo import MongoClient
 import re
 
+from instrumentation import instrument_app, span, set_service, CATALOG_SIZE
+from lifecycle import Warmup, add_health_routes
+
+SERVICE = "trends"
+set_service(SERVICE)
 app = Flask(__name__)
+instrument_app(app, SERVICE)
+
+# Filled in by _load() during warmup (see lifecycle.py)
+df = None
+
+
+def _load():
+    global df
+    from pymongo import MongoClient
 
-# ================== Step 1: Connect to MongoDB ==================
-client = MongoClient("mongodb://localhost:27017/")   # Update if using Atlas
-db = client["myntra-clone"]   # database name
-collection = db["products"]   # collection name
+    # ================== Step 1: Connect to MongoDB ==================
+    client = MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017/"))   # Update if using Atlas
+    db = client[os.getenv("MONGO_DB", "myntra-clone")]   # database name
+    collection = db["products"]   # collection name
 
-# Fetch data from MongoDB into DataFrame (keep _id)
-cursor = collection.find({})
-df = pd.DataFrame(list(cursor))
+    # Fetch data from MongoDB into DataFrame (keep _id)
+    with span("mongo_fetch"):
+        products = pd.DataFrame(list(collection.find({})))
 
-# ✅ Convert ObjectId to string
-if "_id" in df.columns:
-    df["_id"] = df["_id"].astype(str)
+    # ✅ Convert ObjectId to string
+    if "_id" in products.columns:
+        products["_id"] = products["_id"].astype(str)
 
-# ✅ Drop duplicates safely using stable identifiers
-if not df.empty:
-    df = df.drop_duplicates(subset=["title", "url"])
+    # ✅ Drop duplicates safely using stable identifiers
+    if not products.empty:
+        products = products.drop_duplicates(subset=["title", "url"])
 
-# Drop rows missing essential fields
-df = df.dropna(subset=['title', 'initial_price', 'final_price', 'product_description', 'url'])
+    # Drop rows missing essential fields
+    products = products.dropna(subset=['title', 'initial_price', 'final_price', 'product_description', 'url'])
 
-# Clean numeric columns
-df['price'] = pd.to_numeric(df['final_price'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
-df['mrp'] = pd.to_numeric(df['initial_price'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
-df['discount'] = pd.to_numeric(df['discount'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
+    # Clean numeric columns
+    products['price'] = pd.to_numeric(products['final_price'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
+    products['mrp'] = pd.to_numeric(products['initial_price'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
+    products['discount'] = pd.to_numeric(products['discount'].astype(str).str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
+    CATALOG_SIZE.set(len(products), service=SERVICE)
+    df = products
+
+
+warmup = Warmup(SERVICE, _load)
+add_health_routes(app, warmup)
 
 # ================== Step 2: Trending Logic ==================
 def get_trending_products(top_n=10):
@@ -36,10 +56,12 @@ def get_trending_products(top_n=10):
     Simple heuristic: Trending = highest discount first,
     then lowest price (if tie).
     """
+    warmup.ensure()
     if df.empty:
         return []
 
-    df_ranked = df.sort_values(by=['discount', 'price'], ascending=[False, True])
+    with span("ranking"):
+        df_ranked = df.sort_values(by=['discount', 'price'], ascending=[False, True])
     top_products = df_ranked.head(top_n).copy()
 
     # Add a dummy "score" since this is not similarity based
@@ -60,10 +82,13 @@ def get_trending_products(top_n=10):
 def trending():
     top_n = int(request.args.get("n", 40))  # default 10 results
     results = get_trending_products(top_n)
-    return jsonify({
-        "count": len(results),
-        "results": results
-    })
+    with span("serialize"):
+        return jsonify({
+            "count": len(results),
+            "results": results
+        })
+
+warmup.start_from_env()
 
 # ================== Step 4: Run ==================
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+# tryon_cache.py
+"""
+Content-addressed cache for virtual try-on results.
+
+A result is keyed by the hashes of the person and outfit image bytes plus
+the body parameters and angle, so a shopper re-requesting the same look is
+served from the managed blob store. Concurrent identical requests share one model call.
+"""
+
+import json
+import hashlib
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from blob_store import BlobStore
+
+
+def make_key(person_bytes: bytes, outfit_bytes: bytes, body_type, body_weight,
+             body_height, angle: str) -> str:
+    """SHA-256 over the image hashes and normalised generation parameters."""
+    payload = json.dumps({
+        "person": hashlib.sha256(person_bytes).hexdigest(),
+        "outfit": hashlib.sha256(outfit_bytes).hexdigest(),
+        "body_type": (body_type or "").strip().lower(),
+        "body_weight": (body_weight or "").strip().lower(),
+        "body_height": (body_height or "").strip().lower(),
+        "angle": (angle or "FRONT").strip().upper(),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class TryOnCache:
+    """Results in a BlobStore keyed by make_key, with single-flight generation."""
+
+    def __init__(self, store: BlobStore):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Flight] = {}
+
+    def path(self, key: str) -> Optional[str]:
+        return self.store.path(key)
+
+    def contains(self, key: str) -> bool:
+        return self.store.contains(key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.store.get(key)
+
+    def put(self, key: str, data: bytes) -> None:
+        self.store.put(data, key=key)
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> Tuple[bytes, bool]:
+        """Return (data, hit). Only one caller per key runs compute; the rest wait for it."""
+        data = self.get(key)
+        if data is not None:
+            with self._lock:
+                self.hits += 1
+            return data, True
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                self.hits += 1
+            return flight.result, True
+
+        try:
+            # Another leader may have finished between our disk check and taking the flight
+            data = self.get(key)
+            hit = data is not None
+            if not hit:
+                data = compute()
+                self.put(key, data)
+            flight.result = data
+            with self._lock:
+                if hit:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            return data, hit
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            flight.event.set()
+            with self._lock:
+                self._inflight.pop(key, None)
@@ -0,0 +1,148 @@
+# tryon_jobs.py
+"""
+In-memory job queue for virtual try-on generation.
+
+Submitting returns a job id right away; a bounded pool of worker threads
+runs the jobs and clients poll or stream the status. When the queue is full
+submit raises QueueFull so the route can answer 503 instead of piling up.
+"""
+
+import time
+import uuid
+import queue
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+TERMINAL = ("done", "failed")
+
+
+class QueueFull(Exception):
+    """The job queue is at capacity."""
+
+
+class Job:
+    def __init__(self, payload: Any):
+        self.id = uuid.uuid4().hex
+        self.payload = payload
+        self.status = "queued"
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Bounded FIFO of jobs processed by `workers` threads calling `handler(payload)`."""
+
+    def __init__(self, handler: Callable[[Any], Any], workers: int = 4,
+                 max_queue: int = 64, max_retained: int = 1000):
+        self.handler = handler
+        self.max_retained = max_retained
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=max_queue)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._changed = threading.Condition()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._workers = [
+            threading.Thread(target=self._work, name=f"tryon-job-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._workers:
+            t.start()
+
+    # ----------------------
+    # Client side
+    # ----------------------
+    def submit(self, payload: Any) -> Job:
+        job = Job(payload)
+        with self._changed:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFull(f"{self._queue.maxsize} jobs already queued")
+            self._jobs[job.id] = job
+            self._evict_finished()
+        return job
+
+    def complete(self, payload: Any, result: Any) -> Job:
+        """Register a job that is already finished, e.g. a cache hit, without queueing it."""
+        job = Job(payload)
+        job.status, job.result = "done", result
+        job.started_at = job.finished_at = job.created_at
+        with self._changed:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def wait_for_change(self, job: Job, last_status: str, timeout: float) -> str:
+        """Block until the job leaves last_status or timeout passes; return its status."""
+        with self._changed:
+            self._changed.wait_for(lambda: job.status != last_status, timeout=timeout)
+            return job.status
+
+    def stats(self) -> Dict[str, int]:
+        with self._changed:
+            running = sum(1 for j in self._jobs.values() if j.status == "running")
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "running": running,
+            "workers": len(self._workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    # ----------------------
+    # Worker side
+    # ----------------------
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            self._set(job, "running", started_at=time.time())
+            try:
+                result = self.handler(job.payload)
+            except Exception as e:
+                self._set(job, "failed", error=str(e), finished_at=time.time())
+            else:
+                self._set(job, "done", result=result, finished_at=time.time())
+            finally:
+                job.payload = None  # drop the uploaded images once processed
+                self._queue.task_done()
+
+    def _set(self, job: Job, status: str, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(job, name, value)
+            job.status = status
+            if status == "done":
+                self.completed += 1
+            elif status == "failed":
+                self.failed += 1
+            self._changed.notify_all()
+
+    def _evict_finished(self):
+        # Caller holds the lock; oldest finished jobs go first
+        excess = len(self._jobs) - self.max_retained
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.status in TERMINAL][:excess]:
+            del self._jobs[job_id]
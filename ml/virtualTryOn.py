@@ -1,27 +1,76 @@
 # app.py
 import os
-from flask import Flask, request, jsonify, send_file
-from PIL import Image
+import re
+import json
+import zipfile
+import threading
+from flask import Flask, Response, request, jsonify, send_file
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+
+from fake_genai import use_fake_backend, fake_image_client_from_env
+from blob_store import BlobStore
+from tryon_cache import TryOnCache, make_key
+from tryon_jobs import JobQueue, QueueFull, TERMINAL
+from instrumentation import REGISTRY, instrument_app, span, cache_event
+from lifecycle import Warmup, add_health_routes
 
 # Load API key
 load_dotenv()
 API_KEY = os.getenv("GEMINI_API_KEY")
-if not API_KEY:
+if not use_fake_backend() and not API_KEY:
     raise ValueError("GEMINI_API_KEY not found in .env") # Corrected variable name in error message
 
-client = genai.Client(api_key=API_KEY)
+# The google-genai SDK is imported by the warmup, not at import time
+client = None
+types = None
+
+
+def _load():
+    global client, types
+    from google import genai
+    from google.genai import types as genai_types
+
+    types = genai_types
+    client = fake_image_client_from_env() if use_fake_backend() else genai.Client(api_key=API_KEY)
+
+
+SERVICE = "virtual_tryon"
 app = Flask(__name__)
+instrument_app(app, SERVICE)
+warmup = Warmup(SERVICE, _load)
+add_health_routes(app, warmup)
+
+# Directories (uploads are only written when persistence is enabled)
+PERSIST_UPLOADS = os.getenv("TRYON_PERSIST_UPLOADS", "false").lower() == "true"
 
-# Directories
 UPLOAD_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "uploads"))
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+OUTPUT_DIR = os.getenv("TRYON_CACHE_DIR", os.path.abspath(os.path.join(os.path.dirname(__file__), "outputs")))
 
-OUTPUT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "outputs"))
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Both directories are size-capped blob stores with TTL + LRU eviction and a janitor thread
+MB = 1024 * 1024
+upload_store = BlobStore(
+    UPLOAD_DIR,
+    max_bytes=int(os.getenv("TRYON_UPLOAD_MAX_MB", "512")) * MB,
+    ttl_seconds=float(os.getenv("TRYON_UPLOAD_TTL_HOURS", "24")) * 3600,
+).start_janitor()
+output_store = BlobStore(
+    OUTPUT_DIR,
+    max_bytes=int(os.getenv("TRYON_OUTPUT_MAX_MB", "2048")) * MB,
+    ttl_seconds=float(os.getenv("TRYON_OUTPUT_TTL_HOURS", "168")) * 3600,
+).start_janitor()
+tryon_cache = TryOnCache(output_store)
+
+# Input preprocessing: orientation fix, metadata strip, downscale, re-encode
+PREPROCESS = os.getenv("TRYON_PREPROCESS", "true").lower() == "true"
+MAX_EDGE = int(os.getenv("TRYON_MAX_EDGE", "1024"))
+ENCODE_FORMAT = os.getenv("TRYON_ENCODE_FORMAT", "WEBP").upper()
+ENCODE_QUALITY = int(os.getenv("TRYON_ENCODE_QUALITY", "85"))
+preprocess_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("TRYON_PREPROCESS_WORKERS", "4")), thread_name_prefix="tryon-preprocess"
+)
 
 BASE_PROMPT = """
 TASK: Generate a photorealistic image of a person wearing the garment.
@@ -44,83 +93,527 @@ INSTRUCTIONS:
 - Output: clean, high-resolution PNG, studio-style, no text or watermarks.
 """
 
-@app.route("/generate", methods=["POST"])
-def generate():
-    try:
-        # Get form data
-        body_type = request.form.get("body_type")
-        body_weight = request.form.get("body_weight")
-        body_height = request.form.get("body_height")
-        angle = request.form.get("angle", "FRONT")
-        product_id = request.form.get("product_id", "NA")
-
-        # Validate person image
-        if "person_image" not in request.files:
-            return jsonify({"error": "Person image is required"}), 400
-        person_file = request.files["person_image"]
-        person_path = os.path.join(UPLOAD_DIR, person_file.filename)
-        person_file.save(person_path)
-
-        # Validate outfit image(s)
-        outfit_files = [
-            f for key, f in request.files.items() if key.startswith("outfit_image_")
-        ]
-        if not outfit_files:
-            return jsonify({"error": "At least one outfit image is required"}), 400
-
-        outfit_file = outfit_files[0]  # For now, just take first
-        outfit_path = os.path.join(UPLOAD_DIR, outfit_file.filename)
-        outfit_file.save(outfit_path)
-
-        # Build prompt text
-        prompt_text = BASE_PROMPT.format(
-            body_type=body_type,
-            body_weight=body_weight,
-            body_height=body_height,
-            angle_instructions=f"Show a clear {angle.upper()} view."
-        )
+MIME_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/heic": ".heic",
+}
+
+
+def sniff_mime(data: bytes):
+    """Detect the image type from magic bytes; None if it is not a supported image."""
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[4:8] == b"ftyp" and data[8:12] in (b"heic", b"heix", b"mif1", b"msf1"):
+        return "image/heic"
+    return None
+
+
+def save_upload(data: bytes) -> str:
+    """Keep an upload in the upload store under its content hash."""
+    return upload_store.put(data, ext=MIME_EXTENSIONS.get(sniff_mime(data), ""))
+
+
+def preprocess_image(data: bytes, max_edge: int = None, fmt: str = None, quality: int = None) -> bytes:
+    """Apply EXIF orientation, drop metadata, cap the longest edge and re-encode."""
+    max_edge = max_edge or MAX_EDGE
+    fmt = fmt or ENCODE_FORMAT
+    quality = quality or ENCODE_QUALITY
+
+    with span("preprocess", SERVICE):
+        image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha and fmt != "JPEG" else "RGB")
+
+        out = BytesIO()
+        # Saving without exif=/icc_profile= drops the source metadata
+        image.save(out, format=fmt, quality=quality, **({"method": 4} if fmt == "WEBP" else {"optimize": True}))
+        return out.getvalue()
+
+
+class PreparedImage:
+    """An upload that is preprocessed once, on first use, and then shared."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._prepared = None
+        self._lock = threading.Lock()
+
+    def get(self) -> bytes:
+        with self._lock:
+            if self._prepared is None:
+                self._prepared = self._prepare()
+            return self._prepared
+
+    def _prepare(self) -> bytes:
+        if not PREPROCESS:
+            return self.data
+        try:
+            return preprocess_image(self.data)
+        except Exception as e:
+            # Formats PIL cannot decode (e.g. HEIC without a plugin) go to the model untouched
+            print(f"[WARN] Preprocessing skipped: {e}")
+            return self.data
+
+
+def preprocess_pair(person: PreparedImage, outfit: PreparedImage):
+    """Preprocess both inputs concurrently on the preprocessing pool."""
+    person_future = preprocess_pool.submit(person.get)
+    outfit_future = preprocess_pool.submit(outfit.get)
+    return person_future.result(), outfit_future.result()
+
 
-        # Convert files and prompt to Gemini Parts
-        with open(person_path, "rb") as f:
-            # Correct: Pass data and mime_type as keyword arguments
-            person_part = types.Part.from_bytes(data=f.read(), mime_type="image/jpeg")
-        with open(outfit_path, "rb") as f:
-            # Correct: Pass data and mime_type as keyword arguments
-            outfit_part = types.Part.from_bytes(data=f.read(), mime_type="image/png")
-        
-        # CORRECTED: Pass ONLY the string variable 'prompt_text'
-        prompt_part = types.Part.from_text(prompt_text)
-
-        # Call Gemini API
+class GenerationError(Exception):
+    """The model answered without an image."""
+
+
+def generate_tryon_image(person_bytes, outfit_bytes, body_type, body_weight, body_height, angle):
+    """Call the image model once and return the generated image bytes."""
+    warmup.ensure()
+    # Build prompt text
+    prompt_text = BASE_PROMPT.format(
+        body_type=body_type,
+        body_weight=body_weight,
+        body_height=body_height,
+        angle_instructions=f"Show a clear {angle.upper()} view."
+    )
+
+    # Convert files and prompt to Gemini Parts
+    person_part = types.Part.from_bytes(data=person_bytes, mime_type=sniff_mime(person_bytes) or "image/jpeg")
+    outfit_part = types.Part.from_bytes(data=outfit_bytes, mime_type=sniff_mime(outfit_bytes) or "image/png")
+    prompt_part = types.Part.from_text(text=prompt_text)
+
+    # Call Gemini API
+    with span("model_call", SERVICE):
         result = client.models.generate_content(
-            model="gemini-2.5-flash-image-preview", 
+            model="gemini-2.5-flash-image-preview",
             contents=[person_part, outfit_part, prompt_part]
         )
 
-        # Extract generated image
-        image_bytes = None
-        if result.candidates and result.candidates[0].content.parts:
-            for part in result.candidates[0].content.parts:
-                if getattr(part, "inline_data", None):
-                    image_bytes = part.inline_data.data
-                    break
+    # Extract generated image
+    if result.candidates and result.candidates[0].content.parts:
+        for part in result.candidates[0].content.parts:
+            if getattr(part, "inline_data", None):
+                return part.inline_data.data
+
+    rejection_reason = "No image returned."
+    if result.candidates and result.candidates[0].finish_reason.name != "STOP":
+        rejection_reason = f"Generation failed: {result.candidates[0].finish_reason.name}"
+    raise GenerationError(rejection_reason)
+
+
+class InvalidRequest(Exception):
+    """The try-on form is missing or has unusable fields."""
+
+
+def _read_upload(file, name: str) -> bytes:
+    data = file.read()
+    if sniff_mime(data) is None:
+        raise InvalidRequest(f"{name} image must be JPEG, PNG, WebP or HEIC")
+    if PERSIST_UPLOADS:
+        save_upload(data)
+    return data
+
+
+def _read_tryon_uploads(files):
+    """Validate the uploads; returns the person bytes and every outfit's bytes."""
+    # Validate person image
+    if "person_image" not in files:
+        raise InvalidRequest("Person image is required")
+    person_bytes = _read_upload(files["person_image"], "Person")
+
+    # Validate outfit image(s), in outfit_image_0, outfit_image_1, ... order
+    outfit_fields = sorted(
+        (key for key in files if key.startswith("outfit_image_")),
+        key=lambda k: (len(k), k),
+    )
+    if not outfit_fields:
+        raise InvalidRequest("At least one outfit image is required")
+    return person_bytes, [(key, files[key]) for key in outfit_fields]
+
+
+def make_tryon_request(form, person: PreparedImage, outfit: PreparedImage, angle: str) -> dict:
+    body_type = form.get("body_type")
+    body_weight = form.get("body_weight")
+    body_height = form.get("body_height")
+    return {
+        "person": person,
+        "outfit": outfit,
+        "body_type": body_type,
+        "body_weight": body_weight,
+        "body_height": body_height,
+        "angle": angle,
+        "product_id": form.get("product_id", "NA"),
+        "key": make_key(person.data, outfit.data, body_type, body_weight, body_height, angle),
+    }
 
-        if not image_bytes:
-            rejection_reason = "No image returned."
-            if result.candidates and result.candidates[0].finish_reason.name != "STOP":
-                 rejection_reason = f"Generation failed: {result.candidates[0].finish_reason.name}"
-            return jsonify({"error": rejection_reason}), 500
 
-        # Save output
-        output_filename = f"generated_{product_id}_{angle}.png"
-        output_path = os.path.join(OUTPUT_DIR, output_filename)
-        Image.open(BytesIO(image_bytes)).save(output_path)
+def parse_tryon_form(form, files) -> dict:
+    """Read the try-on form fields and upload bytes into a plain dict."""
+    person_bytes, outfits = _read_tryon_uploads(files)
+    _, outfit_file = outfits[0]  # For now, just take first
+    outfit_bytes = _read_upload(outfit_file, "Outfit")
+    return make_tryon_request(
+        form, PreparedImage(person_bytes), PreparedImage(outfit_bytes), form.get("angle", "FRONT")
+    )
 
-        return send_file(output_path, mimetype="image/png")
+
+def run_tryon(req: dict):
+    """Generate (or fetch from cache) one try-on image; returns (bytes, hit)."""
+    # Identical inputs are served from the cache; concurrent duplicates share one call
+    image_bytes, hit = tryon_cache.get_or_compute(req["key"], lambda: generate_tryon_image(
+        *preprocess_pair(req["person"], req["outfit"]),
+        req["body_type"], req["body_weight"], req["body_height"], req["angle"]
+    ))
+    cache_event("tryon_output", hit, SERVICE)
+    if not hit:
+        # Smaller variants are rendered off the request path; when that backlog is
+        # full they are skipped and variant_path() renders them on first request
+        if variant_slots.acquire(blocking=False):
+            variant_pool.submit(store_variants, req["key"], image_bytes)
+    return image_bytes, hit
+
+
+# ==========================
+# Result variants
+# ==========================
+# name -> (max edge or None for full size, WebP quality)
+VARIANTS = {
+    "webp": (None, 85),
+    "medium": (768, 80),
+    "thumb": (256, 75),
+}
+RESULT_MAX_AGE = 365 * 24 * 3600  # results are content-addressed, so never change
+
+# A pool of its own, so variant rendering never queues ahead of request preprocessing
+VARIANT_WORKERS = int(os.getenv("TRYON_VARIANT_WORKERS", "2"))
+variant_pool = ThreadPoolExecutor(max_workers=VARIANT_WORKERS, thread_name_prefix="tryon-variants")
+variant_slots = threading.BoundedSemaphore(VARIANT_WORKERS + int(os.getenv("TRYON_VARIANT_BACKLOG", "16")))
+
+
+def render_variant(data: bytes, variant: str) -> bytes:
+    max_edge, quality = VARIANTS[variant]
+    image = Image.open(BytesIO(data))
+    if max_edge:
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    out = BytesIO()
+    image.save(out, format="WEBP", quality=quality, method=4)
+    return out.getvalue()
+
+
+def store_variants(key: str, data: bytes) -> None:
+    try:
+        for variant in VARIANTS:
+            try:
+                output_store.put(render_variant(data, variant), key=f"{key}-{variant}")
+            except Exception as e:
+                print(f"[WARN] Could not render {variant} variant of {key}: {e}")
+    finally:
+        variant_slots.release()
+
+
+def variant_path(key: str, variant: str):
+    """(path, variant) of a stored result, rendering the variant on demand if it is missing.
+
+    When the variant cannot be rendered the original is served instead, so the
+    returned variant says which one the path holds.
+    """
+    if variant == "original":
+        return tryon_cache.path(key), variant
+    path = output_store.path(f"{key}-{variant}")
+    if path:
+        return path, variant
+    data = tryon_cache.get(key)
+    if data is None:
+        return None, variant
+    try:
+        output_store.put(render_variant(data, variant), key=f"{key}-{variant}")
+    except Exception as e:
+        print(f"[WARN] Could not render {variant} variant of {key}, serving the original: {e}")
+        return tryon_cache.path(key), "original"
+    return output_store.path(f"{key}-{variant}"), variant
+
+
+def choose_variant() -> str:
+    """?variant=thumb|medium|full and ?format=webp|original, else the Accept header."""
+    variant = request.args.get("variant", "full")
+    if variant in ("medium", "thumb"):
+        return variant
+    fmt = request.args.get("format")
+    if fmt == "original":
+        return "original"
+    if fmt == "webp" or "image/webp" in request.headers.get("Accept", ""):
+        return "webp"
+    return "original"
+
+
+def send_cached_result(key: str):
+    """Serve a stored result variant with a strong ETag, If-None-Match and Range support."""
+    variant = choose_variant()
+    path, variant = variant_path(key, variant)
+    if path is None:
+        return jsonify({"error": "Result has expired, please generate it again"}), 410
+
+    try:
+        with open(path, "rb") as f:
+            mimetype = sniff_mime(f.read(16)) or "image/png"
+        # conditional=True answers 304 for a matching If-None-Match and 206 for Range
+        response = send_file(path, mimetype=mimetype, etag=f"{key}-{variant}",
+                             conditional=True, max_age=RESULT_MAX_AGE)
+    except FileNotFoundError:
+        return jsonify({"error": "Result has expired, please generate it again"}), 410
+    response.cache_control.immutable = True
+    response.vary.add("Accept")
+    response.headers["X-Result-URL"] = f"/results/{key}"
+    return response
+
+
+@app.route("/generate", methods=["POST"])
+def generate():
+    try:
+        try:
+            req = parse_tryon_form(request.form, request.files)
+        except InvalidRequest as e:
+            return jsonify({"error": str(e)}), 400
+
+        try:
+            image_bytes, hit = run_tryon(req)
+        except GenerationError as e:
+            return jsonify({"error": str(e)}), 500
+
+        # Model bytes go out as-is unless a smaller variant was asked for
+        response = send_cached_result(req["key"])
+        if isinstance(response, tuple):
+            # Already evicted (tiny store cap); fall back to the bytes in hand
+            response = send_file(BytesIO(image_bytes), mimetype=sniff_mime(image_bytes) or "image/png")
+        response.headers["X-Cache"] = "HIT" if hit else "MISS"
+        return response
 
     except Exception as e:
         print("ERROR:", str(e))
         return jsonify({"error": str(e)}), 500
 
+
+# ==========================
+# Batch API
+# ==========================
+BATCH_PARALLELISM = int(os.getenv("TRYON_BATCH_PARALLELISM", "4"))
+MAX_BATCH_ITEMS = int(os.getenv("TRYON_MAX_BATCH_ITEMS", "12"))
+batch_pool = ThreadPoolExecutor(max_workers=BATCH_PARALLELISM, thread_name_prefix="tryon-batch")
+
+
+def parse_batch_form(form, files) -> list:
+    """One request per distinct (outfit, angle); all of them share one preprocessed person image."""
+    person_bytes, outfits = _read_tryon_uploads(files)
+    person = PreparedImage(person_bytes)
+    # Repeated angles (FRONT,FRONT) and identical outfit uploads would render the same image twice
+    angles = list(dict.fromkeys(
+        a.strip().upper() for a in form.get("angles", form.get("angle", "FRONT")).split(",") if a.strip()
+    ))
+    if not angles:
+        raise InvalidRequest("At least one angle is required")
+
+    unique_outfits, seen = [], set()
+    for field, outfit_file in outfits:
+        data = _read_upload(outfit_file, "Outfit")
+        if data not in seen:
+            seen.add(data)
+            unique_outfits.append((field, data))
+    if len(unique_outfits) * len(angles) > MAX_BATCH_ITEMS:
+        raise InvalidRequest(f"A batch can have at most {MAX_BATCH_ITEMS} outfit/angle combinations")
+
+    items = []
+    for field, outfit_bytes in unique_outfits:
+        outfit = PreparedImage(outfit_bytes)
+        for angle in angles:
+            req = make_tryon_request(form, person, outfit, angle)
+            req["outfit_field"] = field
+            items.append(req)
+    return items
+
+
+@app.route("/generate_batch", methods=["POST"])
+def generate_batch():
+    """Every outfit x angle at once: a zip by default, or per-item jobs with ?mode=jobs."""
+    try:
+        items = parse_batch_form(request.form, request.files)
+    except InvalidRequest as e:
+        return jsonify({"error": str(e)}), 400
+
+    if request.args.get("mode") == "jobs":
+        results, accepted = [], 0
+        for req in items:
+            entry = {"outfit": req["outfit_field"], "angle": req["angle"]}
+            if tryon_cache.contains(req["key"]):
+                job = job_queue.complete(None, {"key": req["key"], "cache": "HIT"})
+            else:
+                try:
+                    job = job_queue.submit(req)
+                except QueueFull as e:
+                    results.append({**entry, "error": f"Try-on queue is full: {e}"})
+                    continue
+            accepted += 1
+            results.append({**entry, **_job_links(job)})
+        response = jsonify({"items": results})
+        if not accepted:
+            response.headers["Retry-After"] = "5"
+            return response, 503
+        return response, 202
+
+    futures = [batch_pool.submit(run_tryon, req) for req in items]
+    manifest = []
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
+        for req, future in zip(items, futures):
+            entry = {"outfit": req["outfit_field"], "angle": req["angle"]}
+            try:
+                image_bytes, hit = future.result()
+            except Exception as e:
+                manifest.append({**entry, "error": str(e)})
+                continue
+            ext = MIME_EXTENSIONS.get(sniff_mime(image_bytes), ".png")
+            name = f"{req['outfit_field']}_{req['angle']}{ext}"
+            # Images are already compressed, so they are stored as-is
+            zf.writestr(name, image_bytes)
+            manifest.append({**entry, "file": name, "cache": "HIT" if hit else "MISS"})
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+    archive.seek(0)
+    return send_file(archive, mimetype="application/zip", as_attachment=True,
+                     download_name="tryon_batch.zip")
+
+
+# ==========================
+# Job API
+# ==========================
+def _run_job(req: dict) -> dict:
+    _, hit = run_tryon(req)
+    return {"key": req["key"], "cache": "HIT" if hit else "MISS"}
+
+
+job_queue = JobQueue(
+    _run_job,
+    workers=int(os.getenv("TRYON_JOB_WORKERS", "4")),
+    max_queue=int(os.getenv("TRYON_JOB_QUEUE_SIZE", "32")),
+)
+
+
+# Queue depth and disk usage are read when /metrics is scraped
+REGISTRY.gauge("ml_tryon_jobs", "Try-on job queue state", ("service", "state"),
+               callback=lambda: {(SERVICE, k): v for k, v in job_queue.stats().items()})
+REGISTRY.gauge("ml_tryon_store", "Upload/output blob store usage and eviction counters", ("service", "store", "stat"),
+               callback=lambda: {(SERVICE, name, k): v
+                                 for name, store in (("uploads", upload_store), ("outputs", output_store))
+                                 for k, v in store.metrics().items() if isinstance(v, (int, float))})
+
+
+def _job_links(job) -> dict:
+    return {
+        **job.to_dict(),
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+        "result_url": f"/jobs/{job.id}/result",
+    }
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """Queue a try-on generation; answers 202 with the job id, or 503 when full."""
+    try:
+        req = parse_tryon_form(request.form, request.files)
+    except InvalidRequest as e:
+        return jsonify({"error": str(e)}), 400
+
+    if tryon_cache.contains(req["key"]):
+        job = job_queue.complete(None, {"key": req["key"], "cache": "HIT"})
+        return jsonify(_job_links(job)), 200
+
+    try:
+        job = job_queue.submit(req)
+    except QueueFull as e:
+        response = jsonify({"error": f"Try-on queue is full: {e}"})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+    return jsonify(_job_links(job)), 202
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(_job_links(job))
+
+
+@app.route("/jobs/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    """Server-sent events with the job status until it finishes."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+
+    def stream():
+        status = None
+        while True:
+            if status is not None:
+                job_queue.wait_for_change(job, status, timeout=15)
+            if job.status == status:
+                yield ": keep-alive\n\n"
+                continue
+            status = job.status
+            yield f"event: status\ndata: {json.dumps(_job_links(job))}\n\n"
+            if status in TERMINAL:
+                return
+
+    return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.route("/jobs/<job_id>/result", methods=["GET"])
+def job_result(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    if job.status == "failed":
+        return jsonify({"error": job.error}), 500
+    if job.status != "done":
+        return jsonify(_job_links(job)), 202
+
+    response = send_cached_result(job.result["key"])
+    if isinstance(response, tuple):
+        return response
+    response.headers["X-Cache"] = job.result["cache"]
+    return response
+
+
+@app.route("/results/<key>", methods=["GET"])
+def result(key):
+    """A stored result by its content key, e.g. for gallery thumbnails (?variant=thumb)."""
+    if not re.fullmatch(r"[0-9a-f]{64}", key):
+        return jsonify({"error": "Unknown result"}), 404
+    return send_cached_result(key)
+
+
+@app.route("/jobs/stats", methods=["GET"])
+def job_stats():
+    return jsonify(job_queue.stats())
+
+
+@app.route("/storage/metrics", methods=["GET"])
+def storage_metrics():
+    """Disk usage and eviction counters for the upload and output stores."""
+    return jsonify({
+        "uploads": upload_store.metrics(),
+        "outputs": output_store.metrics(),
+        "cache": {"hits": tryon_cache.hits, "misses": tryon_cache.misses},
+    })
+
+warmup.start_from_env()
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=6090, debug=True)
\ No newline at end of file